@@ -13,6 +13,7 @@
 ################################################################
 
 import json
+import threading
 from functools import partial
 from pathlib import Path
 from typing import Literal
@@ -42,12 +43,14 @@ from . import (
 from . import ankimorphs_globals as am_globals
 from . import (
     browser_utils,
+    cache_registry,
+    db_connections,
     debug_utils,
     message_box_utils,
+    morph_status_snapshot,
     name_file_utils,
     reviewing_utils,
     tags_and_queue_utils,
-    text_preprocessing,
     toolbar_stats,
 )
 from .ankimorphs_config import AnkiMorphsConfig, AnkiMorphsConfigFilter
@@ -57,7 +60,12 @@ from .extra_settings.ankimorphs_extra_settings import AnkiMorphsExtraSettings
 from .generators.generators_window import GeneratorWindow
 from .highlighting.highlight_just_in_time import highlight_morphs_jit
 from .known_morphs_exporter import KnownMorphsExporterDialog
-from .morphemizers import spacy_wrapper
+from .morphemizers import (
+    jieba_wrapper,
+    mecab_wrapper,
+    morphemizer_utils,
+    spacy_wrapper,
+)
 from .progression.progression_window import ProgressionWindow
 from .recalc import recalc_main
 from .settings import settings_dialog
@@ -90,9 +98,9 @@ def main() -> None:
     gui_hooks.profile_did_open.append(init_tool_menu_and_actions)
     gui_hooks.profile_did_open.append(init_browser_menus_and_actions)
     gui_hooks.profile_did_open.append(replace_card_reviewer)
-    gui_hooks.profile_did_open.append(text_preprocessing.update_translation_table)
     gui_hooks.profile_did_open.append(spacy_wrapper.maybe_delete_spacy_venv)
     gui_hooks.profile_did_open.append(maybe_show_version_warning_wrapper)
+    gui_hooks.profile_did_open.append(start_morphemizer_warm_up)
 
     gui_hooks.sync_will_start.append(recalc_on_sync)
 
@@ -183,7 +191,7 @@ def reset_startup_sync_variable() -> None:
 
 def init_db() -> None:
     with AnkiMorphsDB() as am_db:
-        am_db.create_all_tables()
+        am_db.migrate()
 
 
 def create_am_directories_and_files() -> None:
@@ -271,7 +279,9 @@ def init_tool_menu_and_actions() -> None:
 
     if am_globals.DEV_MODE:
         test_action = create_test_action()
+        cache_stats_action = create_cache_stats_action()
         am_tool_menu.addAction(test_action)
+        am_tool_menu.addAction(cache_stats_action)
 
 
 def init_browser_menus_and_actions() -> None:
@@ -358,6 +368,41 @@ def replace_card_reviewer() -> None:
     )
 
 
+def start_morphemizer_warm_up() -> None:
+    # Loading spaCy models, the jieba dictionary, and starting mecab can take
+    # several seconds, which would otherwise be paid by the first recalc or
+    # the first highlighted card. We use a separate thread instead of
+    # mw.taskman.run_in_background because its executor is shared with Anki
+    # (e.g. the add-on update check).
+    am_config = AnkiMorphsConfig()
+    if not am_config.warm_up_morphemizers:
+        return
+
+    descriptions: set[str] = {
+        config_filter.morphemizer_description
+        for config_filter in am_config.get_config_filters()
+        if config_filter.read or config_filter.modify
+    }
+    if not descriptions:
+        return
+
+    threading.Thread(
+        target=_warm_up_morphemizers_on_thread,
+        args=(descriptions,),
+        name="ankimorphs_warm_up",
+        daemon=True,
+    ).start()
+
+
+def _warm_up_morphemizers_on_thread(descriptions: set[str]) -> None:
+    try:
+        morphemizer_utils.warm_up_morphemizers(descriptions)
+    finally:
+        # the thread exits, so a connection opened by a morphemizer
+        # would stay open until the profile is closed
+        db_connections.close_thread_connections()
+
+
 def maybe_show_version_warning_wrapper() -> None:
     assert mw is not None
     assert mw.pm is not None
@@ -482,6 +527,11 @@ def cleanup_profile_session() -> None:
     _updated_seen_morphs_for_profile = False
     AnkiMorphsDB.drop_seen_morphs_table()
     AnkiMorphsExtraSettings().save_current_ankimorphs_version()
+    cache_registry.clear_caches(cache_registry.ClearOn.PROFILE_CHANGE)
+    morph_status_snapshot.clear_snapshot()
+    mecab_wrapper.terminate_workers()
+    jieba_wrapper.terminate_workers()
+    db_connections.close_all_connections()
 
 
 def reset_am_tags() -> None:
@@ -684,6 +734,21 @@ def create_test_action() -> QAction:
     return action
 
 
+def create_cache_stats_action() -> QAction:
+    action = QAction("&Cache Stats", mw)
+    action.triggered.connect(show_cache_stats)
+    return action
+
+
+def show_cache_stats() -> None:
+    assert mw is not None
+    message_box_utils.show_info_box(
+        title="AnkiMorphs Cache Stats",
+        body=cache_registry.get_all_cache_stats_html(),
+        parent=mw,
+    )
+
+
 def test_function() -> None:
     # To activate this dev function in Anki:
     # 1. In ankimorphs_globals.py set 'DEV_MODE = True'
@@ -96,10 +96,14 @@ class RawConfigKeys:
     RECALC_DUE_OFFSET = "recalc_due_offset"
     RECALC_NUMBER_OF_MORPHS_TO_OFFSET = "recalc_number_of_morphs_to_offset"
     RECALC_MOVE_NEW_CARDS_TO_THE_END = "recalc_move_new_cards_to_the_end"
+    RECALC_STABLE_DUE_ORDER = "recalc_stable_due_order"
     READ_KNOWN_MORPHS_FOLDER = "read_known_morphs_folder"
+    SPACY_BATCH_SIZE = "spacy_batch_size"
+    SPACY_N_PROCESS = "spacy_n_process"
     USE_STABILITY_FOR_KNOWN_THRESHOLD = "use_stability_for_known_threshold"
     TOOLBAR_STATS_USE_KNOWN = "toolbar_stats_use_known"
     TOOLBAR_STATS_USE_SEEN = "toolbar_stats_use_seen"
+    WARM_UP_MORPHEMIZERS = "warm_up_morphemizers"
     EXTRA_FIELDS_DISPLAY_INFLECTIONS = "extra_fields_display_inflections"
     EXTRA_FIELDS_DISPLAY_LEMMAS = "extra_fields_display_lemmas"
     TAG_FRESH = "tag_fresh"
@@ -374,6 +378,16 @@ class AnkiMorphsConfig:  # pylint:disable=too-many-instance-attributes, too-many
                 expected_type=bool,
                 use_default=is_default,
             )
+            self.spacy_batch_size: int = self._get_config_item(
+                key=RawConfigKeys.SPACY_BATCH_SIZE,
+                expected_type=int,
+                use_default=is_default,
+            )
+            self.spacy_n_process: int = self._get_config_item(
+                key=RawConfigKeys.SPACY_N_PROCESS,
+                expected_type=int,
+                use_default=is_default,
+            )
             self.use_stability_for_known_threshold: bool = self._get_config_item(
                 key=RawConfigKeys.USE_STABILITY_FOR_KNOWN_THRESHOLD,
                 expected_type=bool,
@@ -389,6 +403,11 @@ class AnkiMorphsConfig:  # pylint:disable=too-many-instance-attributes, too-many
                 expected_type=bool,
                 use_default=is_default,
             )
+            self.warm_up_morphemizers: bool = self._get_config_item(
+                key=RawConfigKeys.WARM_UP_MORPHEMIZERS,
+                expected_type=bool,
+                use_default=is_default,
+            )
             self.extra_fields_display_inflections: bool = self._get_config_item(
                 key=RawConfigKeys.EXTRA_FIELDS_DISPLAY_INFLECTIONS,
                 expected_type=bool,
@@ -419,6 +438,11 @@ class AnkiMorphsConfig:  # pylint:disable=too-many-instance-attributes, too-many
                 expected_type=str,
                 use_default=is_default,
             )
+            self.recalc_stable_due_order: bool = self._get_config_item(
+                key=RawConfigKeys.RECALC_STABLE_DUE_ORDER,
+                expected_type=bool,
+                use_default=is_default,
+            )
             self.tag_fresh: str = self._get_config_item(
                 key=RawConfigKeys.TAG_FRESH, expected_type=str, use_default=is_default
             )
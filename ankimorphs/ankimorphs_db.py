@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-import functools
 import sqlite3
+import threading
 from collections import Counter
-from collections.abc import Sequence
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
@@ -13,12 +14,82 @@ from anki.models import NotetypeId
 from aqt import mw
 from aqt.operations import QueryOp
 
-from . import ankimorphs_globals
+from . import cache_registry, db_connections
 from .ankimorphs_config import AnkiMorphsConfig
-from .morpheme import Morpheme
+from .morpheme import Morpheme, get_interned_morph
 from .name_file_utils import get_names_from_file_as_morphs
 from .recalc.anki_data_utils import AnkiMorphsCardData
 
+# the priorities are derived from the cards selected by the note filters,
+# which are only stored in the db after a recalc
+_morph_priorities_cache = cache_registry.register_cache(
+    cache_registry.BoundedCache(
+        name="collection morph priorities",
+        max_bytes=256 * 1024 * 1024,
+        clear_on={
+            cache_registry.ClearOn.RECALC,
+            cache_registry.ClearOn.PROFILE_CHANGE,
+            cache_registry.ClearOn.SETTINGS_CHANGE,
+        },
+    )
+)
+
+# Cards can be answered (which adds their morphs to Seen_Morphs) while a
+# rebuild swaps in the new tables. The morphs that are already seen are
+# copied into the rebuilt db right before the swap, so the cards answered
+# during the copy and the swap are recorded here instead, and their morphs
+# are added to the swapped-in db afterward.
+_seen_morphs_lock = threading.Lock()
+_card_ids_seen_during_swap: list[int] | None = None
+
+
+################################################################
+#                          MIGRATIONS
+################################################################
+# The version of the schema is stored in the 'user_version' of the
+# db. When a new version of the add-on changes the schema, e.g. adds
+# a column or an index, a migration is appended to _MIGRATIONS, and
+# the existing dbs are migrated in place when the profile is opened
+# instead of having to wait for the next recalc to rebuild them.
+#
+# _MIGRATIONS[n] migrates a db from version n to version n+1, and it
+# runs in the same transaction as the version bump, so it has to use
+# the connection directly: the AnkiMorphsDB methods commit.
+#
+# Version 0 is the schema from before the versioning was added.
+################################################################
+
+
+def _add_card_morph_map_by_morph_index(con: sqlite3.Connection) -> None:
+    con.execute(
+        """
+            CREATE INDEX IF NOT EXISTS Card_Morph_Map_By_Morph
+            ON Card_Morph_Map (morph_lemma, morph_inflection, card_id)
+            """
+    )
+
+
+_MIGRATIONS: list[Callable[[sqlite3.Connection], None]] = [
+    _add_card_morph_map_by_morph_index,
+]
+
+SCHEMA_VERSION: int = len(_MIGRATIONS)
+
+
+# the number of nested 'with AnkiMorphsDB()' per connection, see AnkiMorphsDB.__exit__
+_with_depths = threading.local()
+
+
+def _get_with_depths() -> dict[sqlite3.Connection, int]:
+    depths: dict[sqlite3.Connection, int] | None = getattr(_with_depths, "depths", None)
+    if depths is None:
+        depths = _with_depths.depths = {}
+    return depths
+
+
+# older versions of sqlite allow at most 999 parameters per statement
+_MAX_IN_LIST_LENGTH = 512
+
 
 class AnkiMorphsDB:  # pylint:disable=too-many-public-methods
     # A card can have many morphs, morphs can be on many cards,
@@ -35,28 +106,88 @@ class AnkiMorphsDB:  # pylint:disable=too-many-public-methods
         if db_path is None:
             db_path = Path(mw.pm.profileFolder(), "ankimorphs.db")
 
-        self.con: sqlite3.Connection = sqlite3.connect(db_path)
+        self.db_path: Path = db_path
+        # shared by all the instances on the same thread, so it should not be closed
+        self.con: sqlite3.Connection = db_connections.get_connection(db_path)
 
     def __enter__(self) -> AnkiMorphsDB:
         """
         Creates a context manager
         """
+        depths: dict[sqlite3.Connection, int] = _get_with_depths()
+        depths[self.con] = depths.get(self.con, 0) + 1
         return self
 
     def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
         """
-        Closes the database connection when exiting the context.
         Commits if no exception occurred, else rolls back.
+        The connection stays open, see _ConnectionManager.
+
+        The instances on the same thread share their connection, and with it the
+        transaction, so a nested 'with AnkiMorphsDB()' leaves the commit or the
+        rollback to the outermost one. Otherwise it would commit the unfinished
+        work of the outer one, or roll it back if the nested one fails.
         """
-        if self.con:
-            if exc_type is None:
-                self.con.commit()
-            else:
-                print(f"exc_type: {exc_type}")
-                print(f"exc_value: {exc_value}")
-                print(f"traceback: {traceback}")
-                self.con.rollback()
-            self.con.close()
+        depths: dict[sqlite3.Connection, int] = _get_with_depths()
+        depth: int = depths.pop(self.con) - 1
+        if depth > 0:
+            depths[self.con] = depth
+            return
+
+        if exc_type is None:
+            self.con.commit()
+        else:
+            print(f"exc_type: {exc_type}")
+            print(f"exc_value: {exc_value}")
+            print(f"traceback: {traceback}")
+            self.con.rollback()
+
+    def migrate(self) -> None:
+        # Note: this function is executed when the profile is opened
+        version: int = self.get_schema_version()
+        has_cache: bool = (
+            self.con.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'Card_Morph_Map'"
+            ).fetchone()
+            is not None
+        )
+
+        if not has_cache or version > SCHEMA_VERSION:
+            # there is nothing to migrate, or the db was created by a newer
+            # version of the add-on, so the db is reset and the next recalc
+            # rebuilds it
+            self._reset_schema()
+            return
+
+        for next_version in range(version + 1, SCHEMA_VERSION + 1):
+            try:
+                with self.con:
+                    self.con.execute("BEGIN")
+                    _MIGRATIONS[next_version - 1](self.con)
+                    self.con.execute(f"PRAGMA user_version = {next_version}")
+            except sqlite3.OperationalError as error:
+                print(
+                    f"AnkiMorphs: migration to version {next_version} failed: {error}"
+                )
+                self._reset_schema()
+                return
+
+        # e.g. Seen_Morphs is dropped when the profile is closed
+        self.create_all_tables()
+
+    def get_schema_version(self) -> int:
+        version: int = self.con.execute("PRAGMA user_version").fetchone()[0]
+        return version
+
+    def _set_schema_version(self, version: int) -> None:
+        with self.con:
+            self.con.execute(f"PRAGMA user_version = {version}")
+
+    def _reset_schema(self) -> None:
+        self.drop_all_tables()
+        self.create_all_tables()
+        self.create_card_morph_map_indexes()
+        self._set_schema_version(SCHEMA_VERSION)
 
     def create_all_tables(self) -> None:
         self.create_morph_table()
@@ -95,6 +226,19 @@ class AnkiMorphsDB:  # pylint:disable=too-many-public-methods
                     """
             )
 
+    def create_card_morph_map_indexes(self) -> None:
+        # The primary key only helps lookups by card, this index is for the
+        # lookups by morph (browse same morphs, exporting known morphs, etc.).
+        # It includes the card_id so those queries never have to touch the
+        # table itself.
+        with self.con:
+            self.con.execute(
+                """
+                    CREATE INDEX IF NOT EXISTS Card_Morph_Map_By_Morph
+                    ON Card_Morph_Map (morph_lemma, morph_inflection, card_id)
+                    """
+            )
+
     def create_morph_table(self) -> None:
         with self.con:
             self.con.execute(
@@ -220,6 +364,13 @@ class AnkiMorphsDB:  # pylint:disable=too-many-public-methods
         return card_morphs
 
     def update_seen_morphs_today_single_card(self, card_id: int) -> None:
+        with _seen_morphs_lock:
+            if _card_ids_seen_during_swap is not None:
+                _card_ids_seen_during_swap.append(card_id)
+                return
+            self._insert_seen_morphs_of_card(card_id)
+
+    def _insert_seen_morphs_of_card(self, card_id: int) -> None:
         with self.con:
             self.con.execute(
                 """
@@ -306,37 +457,54 @@ class AnkiMorphsDB:  # pylint:disable=too-many-public-methods
         search_unknowns: bool = False,
         search_lemma_only: bool = False,
     ) -> set[CardId] | None:
-        # The "where_query_string" is a necessary hack to overcome the sqlite problem
-        # of not allowing variable length parameters
-
-        card_ids: set[CardId] = set()
         card_morphs: set[tuple[str, str]] | None = self.get_card_morphs(
             card_id, search_unknowns
         )
         if card_morphs is None:
             return None
 
+        # The morphs are put in a temp table that is joined with Card_Morph_Map,
+        # so the statements are the same for any number of morphs, i.e. they
+        # only have to be prepared once, and the text of the morphs is never
+        # part of the sql. The temp table only exists on this connection.
+        #
+        # 'CROSS JOIN' makes sqlite go through the few searched morphs and look
+        # them up in the Card_Morph_Map_By_Morph index, instead of the other way around.
         if search_lemma_only:
-            where_query_string = "WHERE" + "".join(
-                [f" (morph_lemma = '{morph[0]}') OR" for morph in card_morphs]
-            )
+            join_condition = "Card_Morph_Map.morph_lemma = Searched_Morphs.lemma"
+            card_morphs = {(lemma, lemma) for lemma, _ in card_morphs}
         else:
-            where_query_string = "WHERE" + "".join(
-                [
-                    f" (morph_lemma = '{morph[0]}' AND morph_inflection = '{morph[1]}') OR"
-                    for morph in card_morphs
-                ]
+            join_condition = (
+                "Card_Morph_Map.morph_lemma = Searched_Morphs.lemma"
+                " AND Card_Morph_Map.morph_inflection = Searched_Morphs.inflection"
             )
 
-        where_query_string = where_query_string[:-3]  # removes last ' OR'
+        card_ids: set[CardId] = set()
 
         with self.con:
-            raw_card_ids = self.con.execute(
+            self.con.execute(
                 """
-                SELECT DISTINCT card_id
-                FROM Card_Morph_Map
+                    CREATE TEMP TABLE IF NOT EXISTS Searched_Morphs
+                    (
+                        lemma TEXT,
+                        inflection TEXT,
+                        PRIMARY KEY (lemma, inflection)
+                    )
+                    """
+            )
+            self.con.execute("DELETE FROM temp.Searched_Morphs")
+            self.con.executemany(
+                "INSERT OR IGNORE INTO temp.Searched_Morphs VALUES (?, ?)",
+                card_morphs,
+            )
+
+            raw_card_ids = self.con.execute(
                 """
-                + where_query_string,
+                    SELECT DISTINCT Card_Morph_Map.card_id
+                    FROM temp.Searched_Morphs
+                    CROSS JOIN Card_Morph_Map ON
+                    """
+                + join_condition
             ).fetchall()
 
             for card_id_raw in raw_card_ids:
@@ -347,97 +515,63 @@ class AnkiMorphsDB:  # pylint:disable=too-many-public-methods
 
         return card_ids
 
-    def get_highest_inflection_learning_interval(self, morph: Morpheme) -> int | None:
-        with self.con:
-            highest_learning_interval = self.con.execute(
-                """
-                    SELECT highest_inflection_learning_interval
-                    FROM Morphs
-                    WHERE lemma = ? And inflection = ?
-                    """,
-                (morph.lemma, morph.inflection),
-            ).fetchone()
-
-            if highest_learning_interval is None:
-                return None
-
-            # un-tuple the result
-            highest_learning_interval = highest_learning_interval[0]
-            assert isinstance(highest_learning_interval, int)
-            return highest_learning_interval
-
-    def get_highest_lemma_learning_interval(self, morph: Morpheme) -> int | None:
-        with self.con:
-            highest_learning_interval = self.con.execute(
-                """
-                    SELECT highest_lemma_learning_interval
-                    FROM Morphs
-                    WHERE lemma = ?
-                    LIMIT 1
-                    """,
-                (morph.lemma,),
-            ).fetchone()
-
-            if highest_learning_interval is None:
-                return None
-
-            # un-tuple the result
-            highest_learning_interval = highest_learning_interval[0]
-            assert isinstance(highest_learning_interval, int)
-            return highest_learning_interval
-
-    def get_morph_inflections_learning_statuses(self) -> dict[str, str]:
-        morph_status_dict: dict[str, str] = {}
-        am_config = AnkiMorphsConfig()
-
-        with self.con:
-            card_morphs_raw = self.con.execute(
-                """
-                    SELECT lemma, inflection, highest_inflection_learning_interval
-                    FROM Morphs
-                    ORDER BY lemma, inflection
-                    """,
-            ).fetchall()
-
-            for row in card_morphs_raw:
-                key = row[0] + row[1]
-                interval = row[2]
-                if interval >= am_config.interval_for_known_morphs:
-                    learning_status = ankimorphs_globals.STATUS_KNOWN
-                elif interval > 0:
-                    learning_status = ankimorphs_globals.STATUS_LEARNING
-                else:
-                    learning_status = ankimorphs_globals.STATUS_UNKNOWN
-
-                morph_status_dict[key] = learning_status
-
-        return morph_status_dict
-
-    def get_morph_lemmas_learning_statuses(self) -> dict[str, str]:
-        morph_status_dict: dict[str, str] = {}
-        am_config = AnkiMorphsConfig()
-
-        with self.con:
-            card_morphs_raw = self.con.execute(
-                """
-                    SELECT DISTINCT lemma, highest_lemma_learning_interval
-                    FROM Morphs
-                    """,
-            ).fetchall()
-
-            for row in card_morphs_raw:
-                key = row[0]
-                interval = row[1]
-                if interval >= am_config.interval_for_known_morphs:
-                    learning_status = ankimorphs_globals.STATUS_KNOWN
-                elif interval > 0:
-                    learning_status = ankimorphs_globals.STATUS_LEARNING
-                else:
-                    learning_status = ankimorphs_globals.STATUS_UNKNOWN
-
-                morph_status_dict[key] = learning_status
-
-        return morph_status_dict
+    def get_highest_inflection_learning_intervals(
+        self, morphs: Iterable[Morpheme]
+    ) -> dict[tuple[str, str], int]:
+        # (lemma, inflection) -> interval, the morphs that are not in the db are left out
+        searched_morphs: set[tuple[str, str]] = {
+            (morph.lemma, morph.inflection) for morph in morphs
+        }
+        intervals: dict[tuple[str, str], int] = {}
+
+        for lemma, inflection, _, inflection_interval in self._get_morphs_with_lemmas(
+            {lemma for lemma, _ in searched_morphs}
+        ):
+            if (lemma, inflection) in searched_morphs:
+                intervals[(lemma, inflection)] = inflection_interval
+
+        return intervals
+
+    def get_highest_lemma_learning_intervals(
+        self, morphs: Iterable[Morpheme]
+    ) -> dict[str, int]:
+        # lemma -> interval, the morphs that are not in the db are left out
+        intervals: dict[str, int] = {}
+
+        # all the inflections of a lemma have the same lemma interval
+        for lemma, _, lemma_interval, _ in self._get_morphs_with_lemmas(
+            {morph.lemma for morph in morphs}
+        ):
+            intervals[lemma] = lemma_interval
+
+        return intervals
+
+    def _get_morphs_with_lemmas(
+        self, lemmas: set[str]
+    ) -> Iterator[tuple[str, str, int, int]]:
+        # Looking up all the lemmas with a few 'IN' queries is much faster than
+        # doing one query per morph, and the lemmas are the first column of the
+        # primary key, so the inflections can be filtered afterward.
+        #
+        # sqlite has a limit on the number of parameters, so the lemmas are
+        # queried in chunks. The last chunk is padded to a power of two by
+        # repeating a lemma, so only a handful of statements are ever prepared.
+        sorted_lemmas: list[str] = sorted(lemmas)
+
+        for start in range(0, len(sorted_lemmas), _MAX_IN_LIST_LENGTH):
+            chunk: list[str] = sorted_lemmas[start : start + _MAX_IN_LIST_LENGTH]
+            padded_length: int = 1 << (len(chunk) - 1).bit_length()
+            chunk += chunk[-1:] * (padded_length - len(chunk))
+
+            with self.con:
+                yield from self.con.execute(
+                    f"""
+                        SELECT lemma, inflection, highest_lemma_learning_interval, highest_inflection_learning_interval
+                        FROM Morphs
+                        WHERE lemma IN ({",".join("?" * len(chunk))})
+                        """,
+                    chunk,
+                ).fetchall()
 
     def get_card_morph_map_cache(self) -> dict[int, list[Morpheme]]:
         card_morph_map_cache: dict[int, list[Morpheme]] = {}
@@ -455,7 +589,9 @@ class AnkiMorphsDB:  # pylint:disable=too-many-public-methods
 
         for row in card_morph_map_cache_raw:
             card_id = row[0]
-            morph = Morpheme(
+            # the rows are sorted by morph and most morphs are on multiple cards,
+            # so interning saves a lot of memory on big collections
+            morph = get_interned_morph(
                 lemma=row[1],
                 inflection=row[2],
                 highest_lemma_learning_interval=row[3],
@@ -505,11 +641,17 @@ class AnkiMorphsDB:  # pylint:disable=too-many-public-methods
 
         return am_db_row_data_dict
 
-    # the cache needs to have a max size to maintain garbage collection
-    @functools.lru_cache(maxsize=131072)
     def get_morph_priorities_from_collection(
         self, only_lemma_priorities: bool
     ) -> dict[tuple[str, str], int]:
+        # the db path is used instead of 'self' to avoid keeping the connection alive
+        cache_key = (str(self.db_path), only_lemma_priorities)
+        cached_priorities: dict[tuple[str, str], int] | None = (
+            _morph_priorities_cache.get(cache_key)
+        )
+        if cached_priorities is not None:
+            return cached_priorities
+
         # Sorting the morphs (ORDER BY) is crucial to avoid bugs
         morphs_query = self.con.execute(
             """
@@ -542,6 +684,7 @@ class AnkiMorphsDB:  # pylint:disable=too-many-public-methods
             morph_priorities[key] = index
             # print(f"key: {key}, index: {index}")
 
+        _morph_priorities_cache.put(cache_key, morph_priorities)
         return morph_priorities
 
     def get_known_lemmas_with_count(
@@ -605,6 +748,75 @@ class AnkiMorphsDB:  # pylint:disable=too-many-public-methods
             self.con.execute("DROP TABLE IF EXISTS Card_Morph_Map;")
             self.con.execute("DROP TABLE IF EXISTS Seen_Morphs;")
 
+    def analyze(self) -> None:
+        # gives the query planner statistics about the rebuilt tables
+        with self.con:
+            self.con.execute("ANALYZE;")
+
+    @contextmanager
+    def rebuild(self) -> Iterator[AnkiMorphsDB]:
+        # The new tables are built in a side file, which then replaces the
+        # contents of this db in a single transaction with the sqlite backup
+        # api. Until then, the readers (highlighting, toolbar stats, skipping
+        # cards, etc.) keep seeing the old tables, and thanks to WAL they don't
+        # have to wait on the swap either. If the rebuild fails or is cancelled,
+        # this db is left untouched.
+        rebuild_db_path = self.db_path.with_name(
+            f"{self.db_path.stem}.rebuild{self.db_path.suffix}"
+        )
+        _remove_db_files(rebuild_db_path)  # left over from a crash
+
+        rebuild_db = AnkiMorphsDB(db_path=rebuild_db_path)
+        try:
+            # the side file is thrown away if anything goes wrong, so it doesn't
+            # need a journal, but it needs the same page size to be copied into
+            # a WAL db.
+            page_size: int = self.con.execute("PRAGMA page_size").fetchone()[0]
+            rebuild_db.con.execute("PRAGMA journal_mode = OFF")
+            rebuild_db.con.execute("PRAGMA synchronous = OFF")
+            rebuild_db.con.execute(f"PRAGMA page_size = {page_size}")
+            rebuild_db.con.execute("VACUUM")  # applies the page size
+
+            rebuild_db.create_all_tables()
+
+            yield rebuild_db
+
+            # the indexes are built after the bulk insert, which is much faster
+            # than updating them on every insert
+            rebuild_db.create_card_morph_map_indexes()
+            rebuild_db.analyze()
+            rebuild_db._set_schema_version(SCHEMA_VERSION)
+
+            # the morphs seen today are not part of the rebuild, so they are kept
+            self.create_seen_morph_table()
+            _start_recording_seen_cards()
+            try:
+                with rebuild_db.con:
+                    rebuild_db.con.executemany(
+                        "INSERT OR IGNORE INTO Seen_Morphs VALUES (?, ?)",
+                        self.con.execute("SELECT lemma, inflection FROM Seen_Morphs"),
+                    )
+
+                rebuild_db.con.backup(self.con)
+            finally:
+                self._insert_seen_morphs_of_recorded_cards()
+        finally:
+            db_connections.close_connection(rebuild_db_path)
+            _remove_db_files(rebuild_db_path)
+
+        # the whole db was just written to the WAL file, this moves it
+        # into the db file so the WAL file doesn't linger on disk
+        self.con.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+
+    def _insert_seen_morphs_of_recorded_cards(self) -> None:
+        global _card_ids_seen_during_swap
+
+        with _seen_morphs_lock:
+            assert _card_ids_seen_during_swap is not None
+            for card_id in _card_ids_seen_during_swap:
+                self._insert_seen_morphs_of_card(card_id)
+            _card_ids_seen_during_swap = None
+
     @staticmethod
     def drop_seen_morphs_table() -> None:
         am_db = AnkiMorphsDB()
@@ -657,7 +869,6 @@ class AnkiMorphsDB:  # pylint:disable=too-many-public-methods
                         """
                     + where_query_string
                 )
-        am_db.con.close()
 
         am_db.insert_names_to_seen_morphs()
 
@@ -702,7 +913,18 @@ class AnkiMorphsDB:  # pylint:disable=too-many-public-methods
                     """,
                 name_morphs,
             )
-        am_db.con.close()
+
+
+def _start_recording_seen_cards() -> None:
+    global _card_ids_seen_during_swap
+
+    with _seen_morphs_lock:
+        _card_ids_seen_during_swap = []
+
+
+def _remove_db_files(db_path: Path) -> None:
+    for suffix in ("", "-journal", "-wal", "-shm"):
+        Path(f"{db_path}{suffix}").unlink(missing_ok=True)
 
 
 def _on_success() -> None:
@@ -719,9 +941,10 @@ def _on_failure(error: Exception | sqlite3.OperationalError) -> None:
     mw.progress.finish()
 
     if isinstance(error, sqlite3.OperationalError):
-        # schema has been changed
+        # e.g. a table is missing, the migrations also recreate the missing tables
+        print(f"AnkiMorphs: failed to rebuild the seen morphs: {error}")
         with AnkiMorphsDB() as am_db:
-            am_db.drop_all_tables()
+            am_db.migrate()
         return
 
     raise error
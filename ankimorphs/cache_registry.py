@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import functools
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any, ParamSpec, TypeVar
+
+################################################################
+#                        CACHE REGISTRY
+################################################################
+# functools.lru_cache bounds the number of entries, not the
+# memory they use, and it never releases anything unless it is
+# cleared manually. It also keeps 'self' alive when used on
+# methods.
+#
+# The caches in this module are instead bounded by an (approximate)
+# byte budget, they evict the least recently used entries when the
+# budget is exceeded, and they register themselves so they can be
+# cleared together on certain events, e.g. after a recalc.
+################################################################
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+
+
+class ClearOn:
+    RECALC = "recalc"
+    PROFILE_CHANGE = "profile_change"
+    SETTINGS_CHANGE = "settings_change"
+
+
+class CacheStats:
+    __slots__ = (
+        "name",
+        "entries",
+        "size_in_bytes",
+        "max_bytes",
+        "hits",
+        "misses",
+        "evictions",
+    )
+
+    def __init__(  # pylint:disable=too-many-arguments
+        self,
+        name: str,
+        entries: int,
+        size_in_bytes: int,
+        max_bytes: int,
+        hits: int,
+        misses: int,
+        evictions: int,
+    ) -> None:
+        self.name = name
+        self.entries = entries
+        self.size_in_bytes = size_in_bytes
+        self.max_bytes = max_bytes
+        self.hits = hits
+        self.misses = misses
+        self.evictions = evictions
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+
+class BoundedCache:  # pylint:disable=too-many-instance-attributes
+    __slots__ = (
+        "name",
+        "max_bytes",
+        "clear_on",
+        "_get_size",
+        "_entries",
+        "_size_in_bytes",
+        "_hits",
+        "_misses",
+        "_evictions",
+        "_lock",
+        "_loading_locks",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        max_bytes: int,
+        clear_on: set[str],
+        get_size: Callable[[Any], int] | None = None,
+    ) -> None:
+        self.name = name
+        self.max_bytes = max_bytes
+        self.clear_on = clear_on
+        self._get_size: Callable[[Any], int] = (
+            get_size if get_size is not None else get_approximate_size
+        )
+        # key -> (value, size in bytes)
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._size_in_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        # recalc runs on a background thread while the highlighting
+        # runs on the main thread, so we need to synchronize access
+        self._lock = threading.Lock()
+        # key -> lock held by the thread that is loading the value of the key
+        self._loading_locks: dict[Hashable, threading.Lock] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return default
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = self._get_size(value)
+
+        with self._lock:
+            if key in self._entries:
+                self._size_in_bytes -= self._entries.pop(key)[1]
+
+            self._entries[key] = (value, size)
+            self._size_in_bytes += size
+
+            # the newest entry is always kept, even if it exceeds the budget
+            # by itself, otherwise it would have to be recomputed every time
+            while self._size_in_bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size_in_bytes -= evicted_size
+                self._evictions += 1
+
+    def get_or_load(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        # Only one thread loads a missing value, e.g. when the background
+        # warm-up and a recalc want the same spaCy model at the same time,
+        # the other threads wait for it instead of loading it again.
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            loading_lock = self._loading_locks.setdefault(key, threading.Lock())
+
+        try:
+            with loading_lock:
+                with self._lock:
+                    entry = self._entries.get(key)
+                if entry is not None:  # loaded while we were waiting
+                    return entry[0]
+
+                value = load()
+                self.put(key, value)
+                return value
+        finally:
+            with self._lock:
+                if self._loading_locks.get(key) is loading_lock:
+                    del self._loading_locks[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size_in_bytes = 0
+
+    def get_stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                name=self.name,
+                entries=len(self._entries),
+                size_in_bytes=self._size_in_bytes,
+                max_bytes=self.max_bytes,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+            )
+
+
+_registered_caches: dict[str, BoundedCache] = {}
+
+# distinguishes cached 'None' values from misses
+_MISSING = object()
+
+
+def register_cache(cache: BoundedCache) -> BoundedCache:
+    assert cache.name not in _registered_caches, cache.name
+    _registered_caches[cache.name] = cache
+    return cache
+
+
+def bounded_cache(
+    name: str,
+    max_bytes: int,
+    clear_on: set[str],
+    get_size: Callable[[Any], int] | None = None,
+) -> Callable[[Callable[_P, _R]], Callable[_P, _R]]:
+    # Drop-in replacement for functools.lru_cache on plain functions.
+    # The arguments have to be hashable, and unlike lru_cache this
+    # should not be used on methods since that would keep 'self' alive.
+    cache = register_cache(BoundedCache(name, max_bytes, clear_on, get_size))
+
+    def decorator(func: Callable[_P, _R]) -> Callable[_P, _R]:
+        @functools.wraps(func)
+        def wrapper(*args: _P.args, **kwargs: _P.kwargs) -> _R:
+            key: Hashable = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+            return cache.get_or_load(  # type: ignore[no-any-return]
+                key, lambda: func(*args, **kwargs)
+            )
+
+        return wrapper
+
+    return decorator
+
+
+def get_cache(name: str) -> BoundedCache:
+    return _registered_caches[name]
+
+
+def clear_caches(event: str) -> None:
+    for cache in _registered_caches.values():
+        if event in cache.clear_on:
+            cache.clear()
+
+
+def get_all_cache_stats() -> list[CacheStats]:
+    return [cache.get_stats() for cache in _registered_caches.values()]
+
+
+def get_all_cache_stats_html() -> str:
+    rows: str = ""
+    for stats in get_all_cache_stats():
+        rows += (
+            "<tr>"
+            f"<td>{stats.name}</td>"
+            f"<td>{stats.entries}</td>"
+            f"<td>{stats.size_in_bytes / 1_048_576:.2f} / {stats.max_bytes / 1_048_576:.0f} MB</td>"
+            f"<td>{stats.hits}</td>"
+            f"<td>{stats.misses}</td>"
+            f"<td>{stats.hit_rate():.1%}</td>"
+            f"<td>{stats.evictions}</td>"
+            "</tr>"
+        )
+    return (
+        "<table cellpadding='4'>"
+        "<tr><th>Cache</th><th>Entries</th><th>Size</th><th>Hits</th>"
+        "<th>Misses</th><th>Hit rate</th><th>Evictions</th></tr>"
+        f"{rows}"
+        "</table>"
+    )
+
+
+def get_approximate_size(value: Any) -> int:
+    # sys.getsizeof only measures the object itself, not the objects it refers
+    # to, so we recursively add the size of the contents of containers and
+    # objects with slots (e.g. Morpheme). Objects that are referenced multiple
+    # times are only counted once.
+    seen: set[int] = set()
+    size = 0
+    stack: list[Any] = [value]
+
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, "__slots__") and not isinstance(obj, type):
+            slots = obj.__slots__
+            if isinstance(slots, str):
+                slots = (slots,)
+            stack.extend(
+                getattr(obj, slot)
+                for slot in slots
+                if hasattr(obj, slot)  # slots can be unassigned
+            )
+
+    return size
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+
+################################################################
+#                    CONNECTION MANAGER
+################################################################
+# Opening a connection takes longer than most of the queries that
+# are done while reviewing (highlighting, seen morphs, toolbar
+# stats), and every new connection starts with an empty statement
+# cache, so the queries have to be prepared again every time.
+#
+# Instead, every thread keeps one connection per db file open, and
+# all the connections are closed when the profile is closed. The
+# connections are closed from the main thread, which is why
+# 'check_same_thread' is disabled; they are otherwise only used by
+# the thread that opened them.
+#
+# Short-lived threads (i.e. not the main thread or the thread pool
+# of QueryOp) have to call close_thread_connections before they
+# exit, otherwise their connections stay open until the profile is
+# closed.
+################################################################
+
+# the number of prepared statements sqlite3 keeps per connection
+_STATEMENT_CACHE_SIZE = 256
+
+################################################################
+#                      TUNING PROFILE
+################################################################
+# ankimorphs.db is rebuilt from scratch on every recalc, so it is
+# essentially a cache, and some durability can be traded for speed:
+#  - WAL lets the main thread read (highlighting, toolbar stats)
+#    while recalc writes on a background thread, and it needs
+#    fewer fsyncs per transaction.
+#  - synchronous=NORMAL is still safe from corruption in WAL mode,
+#    a power loss can only lose the last transactions.
+#  - the default page cache is only 2MB, which is smaller than the
+#    db of most collections.
+#  - mmap avoids copying the pages when reading.
+#
+# Some filesystems (e.g. network drives) can't do WAL. In that case
+# the journal mode stays the same, and synchronous stays FULL since
+# NORMAL is not safe with a rollback journal.
+################################################################
+
+# negative values are in KiB, this is a max, not an allocation
+_CACHE_SIZE_KIB = 64 * 1024
+_MMAP_SIZE = 256 * 1024 * 1024
+
+
+def _apply_tuning_profile(connection: sqlite3.Connection) -> None:
+    try:
+        journal_mode = connection.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+    except sqlite3.OperationalError:
+        # e.g. another process has the db locked
+        journal_mode = None
+
+    if journal_mode == "wal":
+        connection.execute("PRAGMA synchronous = NORMAL")
+
+    connection.execute(f"PRAGMA cache_size = {-_CACHE_SIZE_KIB}")
+    connection.execute(f"PRAGMA mmap_size = {_MMAP_SIZE}")
+    connection.execute("PRAGMA temp_store = MEMORY")
+
+
+class _ConnectionManager:
+    __slots__ = (
+        "_thread_local",
+        "_open_connections",
+        "_generation",
+        "_lock",
+    )
+
+    def __init__(self) -> None:
+        self._thread_local = threading.local()
+        self._open_connections: list[sqlite3.Connection] = []
+        # bumped when the connections are closed, so the threads
+        # know their connections are no longer usable
+        self._generation: int = 0
+        self._lock = threading.Lock()
+
+    def get_connection(self, db_path: Path) -> sqlite3.Connection:
+        thread_local = self._thread_local
+        if getattr(thread_local, "generation", None) != self._generation:
+            thread_local.generation = self._generation
+            thread_local.connections = {}
+
+        connections: dict[Path, sqlite3.Connection] = thread_local.connections
+        connection: sqlite3.Connection | None = connections.get(db_path)
+
+        if connection is None:
+            connection = sqlite3.connect(
+                db_path,
+                check_same_thread=False,
+                cached_statements=_STATEMENT_CACHE_SIZE,
+            )
+            _apply_tuning_profile(connection)
+            connections[db_path] = connection
+            with self._lock:
+                self._open_connections.append(connection)
+
+        return connection
+
+    def close_connection(self, db_path: Path) -> None:
+        # only closes the connection of the calling thread
+        connections: dict[Path, sqlite3.Connection] = getattr(
+            self._thread_local, "connections", {}
+        )
+        connection: sqlite3.Connection | None = connections.pop(db_path, None)
+        if connection is None:
+            return
+
+        with self._lock:
+            if connection in self._open_connections:
+                self._open_connections.remove(connection)
+
+        connection.close()
+
+    def close_thread_connections(self) -> None:
+        connections: dict[Path, sqlite3.Connection] = getattr(
+            self._thread_local, "connections", {}
+        )
+        for db_path in list(connections):
+            self.close_connection(db_path)
+
+    def close_all_connections(self) -> None:
+        with self._lock:
+            open_connections = self._open_connections
+            self._open_connections = []
+            self._generation += 1
+
+        for connection in open_connections:
+            connection.close()
+
+
+_connection_manager = _ConnectionManager()
+
+
+def get_connection(db_path: Path) -> sqlite3.Connection:
+    return _connection_manager.get_connection(db_path)
+
+
+def close_connection(db_path: Path) -> None:
+    _connection_manager.close_connection(db_path)
+
+
+def close_thread_connections() -> None:
+    _connection_manager.close_thread_connections()
+
+
+def close_all_connections() -> None:
+    # Note: this function is executed when the profile is closed
+    _connection_manager.close_all_connections()
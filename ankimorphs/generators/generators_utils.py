@@ -18,6 +18,7 @@ from .. import text_preprocessing
 from ..ankimorphs_config import AnkiMorphsConfig
 from ..ankimorphs_db import AnkiMorphsDB
 from ..exceptions import CancelledOperationException, UnicodeException
+from ..morph_status_snapshot import get_morph_status_snapshot
 from ..morpheme import Morpheme, MorphOccurrence
 from ..morphemizers import spacy_wrapper
 from ..morphemizers.morphemizer import Morphemizer
@@ -116,8 +117,13 @@ class PreprocessOptions:  # pylint:disable=too-many-instance-attributes
         self.custom_chars_to_ignore: str = ui.customCharactersLineEdit.text()
 
     def to_mock_am_config(self) -> AnkiMorphsConfig:
+        # the spaCy settings are not part of the generator
+        # options, so we use the ones from the settings dialog
+        am_config = AnkiMorphsConfig()
         return Mock(
             spec=AnkiMorphsConfig,
+            spacy_batch_size=am_config.spacy_batch_size,
+            spacy_n_process=am_config.spacy_n_process,
             preprocess_ignore_bracket_contents=self.filter_square_brackets,
             preprocess_ignore_round_bracket_contents=self.filter_round_brackets,
             preprocess_ignore_slim_round_bracket_contents=self.filter_slim_round_brackets,
@@ -135,37 +141,29 @@ def get_morph_stats_from_file(
     file_morphs: dict[str, MorphOccurrence],
 ) -> FileMorphsStats:
     file_morphs_stats = FileMorphsStats()
+    morph_occurrences = file_morphs.values()
     highest_learning_interval: int | None
+    morph_status_snapshot = get_morph_status_snapshot(am_db)
 
-    if am_config.evaluate_morph_inflection:
-        for morph_occurrence_object in file_morphs.values():
-            morph = morph_occurrence_object.morph
-            occurrence = morph_occurrence_object.occurrence
-            highest_learning_interval = am_db.get_highest_inflection_learning_interval(
-                morph
+    for morph_occurrence_object in morph_occurrences:
+        morph = morph_occurrence_object.morph
+        if am_config.evaluate_morph_inflection:
+            highest_learning_interval = morph_status_snapshot.get_inflection_interval(
+                morph.lemma, morph.inflection
             )
-
-            _update_file_morphs_stats(
-                file_morphs_stats=file_morphs_stats,
-                interval_for_known=am_config.interval_for_known_morphs,
-                morph=morph,
-                occurrence=occurrence,
-                highest_learning_interval=highest_learning_interval,
-            )
-    else:
-        for morph_occurrence_object in file_morphs.values():
-            morph = morph_occurrence_object.morph
-            occurrence = morph_occurrence_object.occurrence
-            highest_learning_interval = am_db.get_highest_lemma_learning_interval(morph)
-
-            _update_file_morphs_stats(
-                file_morphs_stats=file_morphs_stats,
-                interval_for_known=am_config.interval_for_known_morphs,
-                morph=morph,
-                occurrence=occurrence,
-                highest_learning_interval=highest_learning_interval,
+        else:
+            highest_learning_interval = morph_status_snapshot.get_lemma_interval(
+                morph.lemma
             )
 
+        _update_file_morphs_stats(
+            file_morphs_stats=file_morphs_stats,
+            interval_for_known=am_config.interval_for_known_morphs,
+            morph=morph,
+            occurrence=morph_occurrence_object.occurrence,
+            highest_learning_interval=highest_learning_interval,
+        )
+
     return file_morphs_stats
 
 
@@ -219,8 +217,6 @@ def generate_morph_occurrences_by_file(
     else:
         sorted_input_files = input_files
 
-    translation_table = str.maketrans("", "", preprocess_options.custom_chars_to_ignore)
-
     for input_file in sorted_input_files:
         if mw.progress.want_cancel():  # user clicked 'x' button
             raise CancelledOperationException
@@ -237,7 +233,6 @@ def generate_morph_occurrences_by_file(
                 preprocess_options=preprocess_options,
                 file_path=input_file,
                 morphemizer=_morphemizer,
-                translation_table=translation_table,
             )
         )
         morph_occurrences_by_file[input_file] = file_morph_occurrences
@@ -249,13 +244,13 @@ def create_file_morph_occurrences(
     preprocess_options: PreprocessOptions,
     file_path: Path,
     morphemizer: Morphemizer,
-    translation_table: dict[int, int | None],
 ) -> dict[str, MorphOccurrence]:
 
     raw_lines: list[str]
     filtered_lines: list[str] = []
     extension = file_path.suffix
     mock_am_config = preprocess_options.to_mock_am_config()
+    text_preprocessor = text_preprocessing.get_text_preprocessor(mock_am_config)
 
     if extension in extractors:
         raw_lines = extractors[extension](file_path)
@@ -265,11 +260,7 @@ def create_file_morph_occurrences(
     try:
         for line in raw_lines:
             # lower-case to avoid proper noun false-positives
-            filtered_line = text_preprocessing.get_processed_text(
-                am_config=mock_am_config,
-                text=line.strip().lower(),
-                translation_table=translation_table,
-            )
+            filtered_line = text_preprocessor.process(line.strip().lower())
             if filtered_line:
                 filtered_lines.append(filtered_line)
     except UnicodeDecodeError as exc:
@@ -287,9 +278,15 @@ def get_morph_occurrences(
     morphemizer: Morphemizer,
     all_lines: list[str],
 ) -> dict[str, MorphOccurrence]:
+    assert mw is not None
     morph_occurrences: dict[str, MorphOccurrence] = {}
 
-    for processed_morphs in morphemizer.get_processed_morphs(mock_am_config, all_lines):
+    # the lines are processed in chunks so large files can be cancelled midway
+    for _, processed_morphs in morphemizer.get_processed_morphs_in_chunks(
+        mock_am_config,
+        ((None, line) for line in all_lines),
+        should_cancel=mw.progress.want_cancel,
+    ):
         for morph in processed_morphs:
             key = morph.lemma + morph.inflection
             if key in morph_occurrences:
@@ -308,10 +305,9 @@ def _get_selected_morphemizer_and_nlp(
     _nlp = None  # spacy.Language
 
     if isinstance(_morphemizer, SpacyMorphemizer):
-        selected_index = morphemizer_combobox.currentIndex()
-        selected_text: str = morphemizer_combobox.itemText(selected_index)
-        spacy_model = selected_text.removeprefix("spaCy: ")
-        _nlp = spacy_wrapper.get_nlp(spacy_model)
+        _nlp = spacy_wrapper.get_nlp(
+            _morphemizer.spacy_model, lemma_only=_morphemizer.lemma_only
+        )
 
     return _morphemizer, _nlp
 
@@ -109,8 +109,6 @@ def _populate_tables_with_report(
         global_report_morph_stats=global_report_morph_stats,
     )
 
-    am_db.con.close()
-
 
 def _populate_numerical_table(  # pylint:disable=too-many-locals
     ui: Ui_GeneratorsWindow,
@@ -8,6 +8,7 @@ from aqt import mw
 
 from .. import ankimorphs_globals as am_globals
 from ..ankimorphs_db import AnkiMorphsDB
+from ..morph_status_snapshot import MorphStatusSnapshot, get_morph_status_snapshot
 from ..morpheme import MorphOccurrence
 from ..morphemizers.morphemizer import Morphemizer
 from ..ui.generators_window_ui import Ui_GeneratorsWindow
@@ -68,12 +69,7 @@ def write_out_study_plan(  # pylint:disable=too-many-locals
     Path(output_file).parent.mkdir(parents=True, exist_ok=True)
 
     morph_in_study_plan: dict[str, None] = {}  # we only care about lookup not the value
-    learning_status_of_morph: dict[str, str]
-
-    if selected_output_options.store_lemma_and_inflection:
-        learning_status_of_morph = am_db.get_morph_inflections_learning_statuses()
-    else:
-        learning_status_of_morph = am_db.get_morph_lemmas_learning_statuses()
+    morph_status_snapshot = get_morph_status_snapshot(am_db)
 
     with open(output_file, mode="w+", encoding="utf-8", newline="") as csvfile:
         morph_writer = csv.writer(csvfile)
@@ -123,8 +119,7 @@ def write_out_study_plan(  # pylint:disable=too-many-locals
                     selected_output_options=selected_output_options,
                     input_dir_root=input_dir_root,
                     file_path=file_path,
-                    learning_status_of_morph=learning_status_of_morph,
-                    morph_key=key,
+                    morph_status_snapshot=morph_status_snapshot,
                     morph_occurrence=morph_occurrence,
                 )
 
@@ -166,21 +161,26 @@ def _get_study_plan_row(  # pylint:disable=too-many-arguments
     selected_output_options: OutputOptions,
     input_dir_root: Path,
     file_path: Path,
-    learning_status_of_morph: dict[str, str],
-    morph_key: str,
+    morph_status_snapshot: MorphStatusSnapshot,
     morph_occurrence: MorphOccurrence,
 ) -> list[str]:
-    learning_status: str
+    morph = morph_occurrence.morph
+    learning_status: str | None
 
-    if morph_key not in learning_status_of_morph:
-        learning_status = "unknown"
+    if selected_output_options.store_lemma_and_inflection:
+        learning_status = morph_status_snapshot.get_inflection_status(
+            morph.lemma, morph.inflection
+        )
     else:
-        learning_status = learning_status_of_morph[morph_key]
+        learning_status = morph_status_snapshot.get_lemma_status(morph.lemma)
+
+    if learning_status is None:
+        learning_status = "unknown"
 
-    row = [morph_occurrence.morph.lemma]
+    row = [morph.lemma]
 
     if selected_output_options.store_lemma_and_inflection:
-        row.append(morph_occurrence.morph.inflection)
+        row.append(morph.inflection)
 
     row.append(learning_status)
 
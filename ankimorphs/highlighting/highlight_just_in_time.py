@@ -16,7 +16,7 @@ from ..highlighting.ruby_classes import (
     TextRuby,
 )
 from ..highlighting.text_highlighter import TextHighlighter
-from ..morpheme import Morpheme
+from ..morpheme import Morpheme, get_interned_morph
 from ..morphemizers import morphemizer_utils
 from ..morphemizers.morphemizer import (
     Morphemizer,
@@ -91,26 +91,46 @@ def _get_morph_meta_for_text(
     # data, we need to do some cleansing.
     clean_text = _dehtml(field_text, am_config, True)
 
-    # we only need to first item of the iterator since we only have one sentence,
-    morphs: list[Morpheme] = next(
-        morphemizer.get_processed_morphs(am_config, sentences=[clean_text])
+    morphs: list[Morpheme] = morphemizer.get_processed_morphs_for_highlighting(
+        am_config, clean_text
     )
 
     if not morphs:
         return []
 
+    # The morphs are shared with the morphemizer caches (and the recalc),
+    # so we return copies with the intervals set instead of modifying them
     with AnkiMorphsDB() as am_db:
-        for morph in morphs:
-            if am_config.evaluate_morph_inflection:
-                morph.highest_inflection_learning_interval = (
-                    am_db.get_highest_inflection_learning_interval(morph) or 0
+        if am_config.evaluate_morph_inflection:
+            inflection_intervals: dict[tuple[str, str], int] = (
+                am_db.get_highest_inflection_learning_intervals(morphs)
+            )
+            return [
+                get_interned_morph(
+                    lemma=morph.lemma,
+                    inflection=morph.inflection,
+                    part_of_speech=morph.part_of_speech,
+                    sub_part_of_speech=morph.sub_part_of_speech,
+                    highest_inflection_learning_interval=(
+                        inflection_intervals.get((morph.lemma, morph.inflection)) or 0
+                    ),
                 )
-            else:
-                morph.highest_lemma_learning_interval = (
-                    am_db.get_highest_lemma_learning_interval(morph) or 0
-                )
-
-    return morphs
+                for morph in morphs
+            ]
+
+        lemma_intervals: dict[str, int] = am_db.get_highest_lemma_learning_intervals(
+            morphs
+        )
+        return [
+            get_interned_morph(
+                lemma=morph.lemma,
+                inflection=morph.inflection,
+                part_of_speech=morph.part_of_speech,
+                sub_part_of_speech=morph.sub_part_of_speech,
+                highest_lemma_learning_interval=lemma_intervals.get(morph.lemma) or 0,
+            )
+            for morph in morphs
+        ]
 
 
 def _dehtml(
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import threading
+
+from . import ankimorphs_globals, db_connections
+from .ankimorphs_config import AnkiMorphsConfig
+from .ankimorphs_db import AnkiMorphsDB
+
+################################################################
+#                     MORPH STATUS SNAPSHOT
+################################################################
+# The progression window and the generators need the learning
+# status of a lot of morphs. Instead of each of them querying the
+# Morphs table (and reading the config) separately, they share one
+# read-only snapshot of the table.
+#
+# The snapshot is tagged with the version it was built from, and
+# the version is bumped whenever the Morphs table or the settings
+# the statuses depend on change. Building the snapshot reads the
+# entire Morphs table, so it is rebuilt on a background thread
+# (at the end of the recalc, or after the settings are saved) and
+# the readers keep using the previous snapshot until the new one
+# is ready. The JIT highlighting runs on the main thread, so it
+# queries only the morphs of the card instead.
+################################################################
+
+
+class MorphStatusSnapshot:
+    __slots__ = (
+        "version",
+        "interval_for_known_morphs",
+        "_inflection_intervals",
+        "_lemma_intervals",
+    )
+
+    def __init__(
+        self,
+        version: int,
+        interval_for_known_morphs: int,
+        inflection_intervals: dict[tuple[str, str], int],
+        lemma_intervals: dict[str, int],
+    ) -> None:
+        self.version = version
+        self.interval_for_known_morphs = interval_for_known_morphs
+        self._inflection_intervals = inflection_intervals
+        self._lemma_intervals = lemma_intervals
+
+    # The lookups return None for morphs that are not in the db
+
+    def get_inflection_interval(self, lemma: str, inflection: str) -> int | None:
+        return self._inflection_intervals.get((lemma, inflection))
+
+    def get_lemma_interval(self, lemma: str) -> int | None:
+        return self._lemma_intervals.get(lemma)
+
+    def get_inflection_status(self, lemma: str, inflection: str) -> str | None:
+        return self._get_status(self._inflection_intervals.get((lemma, inflection)))
+
+    def get_lemma_status(self, lemma: str) -> str | None:
+        return self._get_status(self._lemma_intervals.get(lemma))
+
+    def _get_status(self, interval: int | None) -> str | None:
+        if interval is None:
+            return None
+        if interval >= self.interval_for_known_morphs:
+            return ankimorphs_globals.STATUS_KNOWN
+        if interval > 0:
+            return ankimorphs_globals.STATUS_LEARNING
+        return ankimorphs_globals.STATUS_UNKNOWN
+
+
+_version: int = 0
+# The latest snapshot that has been built. While a rebuild is running it
+# is older than _version, and the readers keep using it until the rebuilt
+# one replaces it.
+_snapshot: MorphStatusSnapshot | None = None
+# snapshots built before the last clear_snapshot belong to another profile
+_oldest_valid_version: int = 0
+# the recalc and the generators run on background threads
+_lock = threading.Lock()
+# only one snapshot is built at a time
+_build_lock = threading.Lock()
+
+
+def _bump_version() -> int:
+    global _version
+
+    with _lock:
+        _version += 1
+        return _version
+
+
+def rebuild_snapshot(am_db: AnkiMorphsDB | None = None) -> None:
+    # Reads the whole Morphs table, so this should only be called from
+    # background threads, e.g. at the end of the recalc.
+    version: int = _bump_version()
+    with _build_lock:
+        _publish_snapshot(
+            _build_snapshot(version, am_db if am_db is not None else AnkiMorphsDB())
+        )
+
+
+def rebuild_snapshot_in_background() -> None:
+    # For the main thread, e.g. when the settings are saved. We use a
+    # separate thread for the same reason as the morphemizer warm-up.
+    threading.Thread(
+        target=_rebuild_snapshot_on_thread,
+        name="ankimorphs_morph_status_snapshot",
+        daemon=True,
+    ).start()
+
+
+def _rebuild_snapshot_on_thread() -> None:
+    try:
+        rebuild_snapshot()
+    finally:
+        # the thread exits, so its connection would stay open until the profile is closed
+        db_connections.close_thread_connections()
+
+
+def clear_snapshot() -> None:
+    # The snapshot belongs to the profile db, so the next profile (or test)
+    # has to build its own.
+    global _snapshot, _oldest_valid_version
+
+    version: int = _bump_version()
+    with _lock:
+        _oldest_valid_version = version
+        _snapshot = None
+
+
+def get_morph_status_snapshot(am_db: AnkiMorphsDB | None = None) -> MorphStatusSnapshot:
+    # The snapshot is never modified after it is built, so reading it doesn't
+    # need the lock. It is only built here if there isn't one at all yet;
+    # outdated snapshots are replaced by rebuild_snapshot.
+    snapshot: MorphStatusSnapshot | None = _snapshot
+    if snapshot is not None:
+        return snapshot
+
+    with _build_lock:
+        snapshot = _snapshot
+        if snapshot is None:
+            snapshot = _build_snapshot(
+                _version, am_db if am_db is not None else AnkiMorphsDB()
+            )
+            _publish_snapshot(snapshot)
+        return snapshot
+
+
+def _publish_snapshot(snapshot: MorphStatusSnapshot) -> None:
+    global _snapshot
+
+    with _lock:
+        if snapshot.version < _oldest_valid_version:
+            return
+        if _snapshot is None or snapshot.version > _snapshot.version:
+            _snapshot = snapshot
+
+
+def _build_snapshot(version: int, am_db: AnkiMorphsDB) -> MorphStatusSnapshot:
+    inflection_intervals: dict[tuple[str, str], int] = {}
+    lemma_intervals: dict[str, int] = {}
+
+    with am_db.con:
+        for lemma, inflection, lemma_interval, inflection_interval in am_db.con.execute(
+            """
+                SELECT lemma, inflection, highest_lemma_learning_interval, highest_inflection_learning_interval
+                FROM Morphs
+                """
+        ):
+            inflection_intervals[(lemma, inflection)] = inflection_interval
+            # all the inflections of a lemma have the same lemma interval
+            lemma_intervals[lemma] = lemma_interval
+
+    return MorphStatusSnapshot(
+        version=version,
+        interval_for_known_morphs=AnkiMorphsConfig().interval_for_known_morphs,
+        inflection_intervals=inflection_intervals,
+        lemma_intervals=lemma_intervals,
+    )
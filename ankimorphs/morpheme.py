@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-import functools
+import threading
+import weakref
+from typing import Any
 
 from . import ankimorphs_globals
 
@@ -13,6 +15,8 @@ class Morpheme:
         "sub_part_of_speech",
         "highest_lemma_learning_interval",
         "highest_inflection_learning_interval",
+        "_interned",  # only set on interned morphs, which can't be modified
+        "__weakref__",  # needed for interning
     )
 
     def __init__(  # pylint:disable=too-many-arguments
@@ -33,6 +37,8 @@ class Morpheme:
         """
         # mecab uses pos and sub_pos to determine proper nouns.
 
+        # set by get_interned_morph, see INTERNING below
+        self._interned: bool = False
         self.lemma: str = lemma  # dictionary form
         self.inflection: str = inflection  # surface lemma
         self.part_of_speech = part_of_speech  # determined by mecab tool. for example: u'動詞' or u'助動詞', u'形容詞'
@@ -44,6 +50,36 @@ class Morpheme:
             highest_inflection_learning_interval
         )
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        # _interned is not set yet when __init__ starts
+        if getattr(self, "_interned", False):
+            raise AttributeError(
+                f"interned morphs are shared and can't be modified, tried to set '{name}'"
+            )
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name: str) -> None:
+        if self._interned:
+            raise AttributeError(
+                f"interned morphs are shared and can't be modified, tried to delete '{name}'"
+            )
+        object.__delattr__(self, name)
+
+    def __reduce__(self) -> tuple[Any, tuple[Any, ...]]:
+        # Copies (e.g. copy.deepcopy) and pickles are made with the constructor,
+        # which makes the copy of an interned morph the interned morph itself.
+        return (
+            get_interned_morph if self._interned else Morpheme,
+            (
+                self.lemma,
+                self.inflection,
+                self.part_of_speech,
+                self.sub_part_of_speech,
+                self.highest_lemma_learning_interval,
+                self.highest_inflection_learning_interval,
+            ),
+        )
+
     def __eq__(self, other: object) -> bool:
         assert isinstance(other, Morpheme)
         return all(
@@ -59,8 +95,6 @@ class Morpheme:
     def is_proper_noun(self) -> bool:
         return self.sub_part_of_speech == "固有名詞" or self.part_of_speech == "PROPN"
 
-    # the cache needs to have a max size to maintain garbage collection
-    @functools.lru_cache(maxsize=131072)
     def get_learning_status(
         self,
         evaluate_inflection: bool,
@@ -81,6 +115,67 @@ class Morpheme:
         return ankimorphs_globals.STATUS_KNOWN
 
 
+################################################################
+#                          INTERNING
+################################################################
+# The same morph shows up on many cards and in many sentences,
+# so instead of creating a separate Morpheme instance every time
+# (with its own copies of the strings), identical morphs share
+# a single instance (flyweight pattern).
+#
+# The interned morphs are shared by the caches and the threads,
+# so modifying them raises an AttributeError. The learning
+# intervals are part of the key, i.e. a morph with intervals is a
+# different instance than the same morph without them. Use
+# get_interned_morph to get a copy with the intervals set instead
+# of setting them in place.
+#
+# The table only holds weak references, so the morphs are
+# garbage collected when they are no longer used elsewhere.
+################################################################
+
+_interned_morphs: weakref.WeakValueDictionary[
+    tuple[str, str, str, str, int | None, int | None], Morpheme
+] = weakref.WeakValueDictionary()
+# the morphemizers and the recalc intern morphs on different threads
+_interning_lock = threading.Lock()
+
+
+def get_interned_morph(  # pylint:disable=too-many-arguments
+    lemma: str,
+    inflection: str,
+    part_of_speech: str = "",
+    sub_part_of_speech: str = "",
+    highest_lemma_learning_interval: int | None = None,
+    highest_inflection_learning_interval: int | None = None,
+) -> Morpheme:
+    key = (
+        lemma,
+        inflection,
+        part_of_speech,
+        sub_part_of_speech,
+        highest_lemma_learning_interval,
+        highest_inflection_learning_interval,
+    )
+
+    with _interning_lock:
+        morph: Morpheme | None = _interned_morphs.get(key)
+
+        if morph is None:
+            morph = Morpheme(
+                lemma,
+                inflection,
+                part_of_speech,
+                sub_part_of_speech,
+                highest_lemma_learning_interval,
+                highest_inflection_learning_interval,
+            )
+            morph._interned = True  # pylint:disable=protected-access
+            _interned_morphs[key] = morph
+
+    return morph
+
+
 class MorphOccurrence:
     __slots__ = (
         "morph",
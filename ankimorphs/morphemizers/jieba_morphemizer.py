@@ -7,17 +7,41 @@ from . import jieba_wrapper
 
 class JiebaMorphemizer(Morphemizer):
     # Jieba Chinese text segmentation: https://github.com/fxsjy/jieba
-
-    def __init__(self) -> None:
-        super().__init__()
-        jieba_wrapper.import_jieba()
+    # jieba is imported lazily, see jieba_wrapper.import_jieba
 
     def init_successful(self) -> bool:
+        jieba_wrapper.import_jieba()
         return jieba_wrapper.successful_import
 
     def get_morphemes(self, sentences: list[str]) -> Iterator[list[Morpheme]]:
-        for sentence in sentences:
-            yield jieba_wrapper.get_morphemes_jieba(sentence)
+        jieba_wrapper.import_jieba()
+        if not jieba_wrapper.successful_import:
+            # the setup failed, the error was raised by the first call
+            for _ in sentences:
+                yield []
+            return
+
+        batch_size = jieba_wrapper.WORKER_BATCH_SIZE
+        batches: list[list[str]] = [
+            sentences[start : start + batch_size]
+            for start in range(0, len(sentences), batch_size)
+        ]
+        for batch_morphs in jieba_wrapper.get_morphemes_jieba_batches(batches):
+            yield from batch_morphs
+
+    def get_morphemes_for_highlighting(self, sentence: str) -> list[Morpheme]:
+        # segmented in this process, the workers are only worth it for large batches
+        jieba_wrapper.import_jieba()
+        if not jieba_wrapper.successful_import:
+            # the highlighting morphemizes every card, so it doesn't raise
+            return []
+        return jieba_wrapper.get_morphemes_jieba(sentence)
+
+    def get_chunk_size(self) -> int:
+        return jieba_wrapper.PREFERRED_CHUNK_SIZE
+
+    def warm_up(self) -> None:
+        jieba_wrapper.warm_up()
 
     def get_description(self) -> str:
         return "AnkiMorphs: Chinese"
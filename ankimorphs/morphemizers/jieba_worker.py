@@ -0,0 +1,48 @@
+################################################################
+#                        JIEBA WORKER
+################################################################
+# This file is executed as a script in a separate python process
+# by jieba_wrapper.py, so it must not import anything from
+# ankimorphs or aqt.
+#
+# Usage: python jieba_worker.py <addons folder> <posseg module> [dictionary cache file]
+#
+# Every line on stdin is a json list of sentences, and for every
+# line a json list containing the list of words of each sentence
+# is written to stdout.
+################################################################
+
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import sys
+
+
+def main() -> None:
+    addons_folder: str = sys.argv[1]
+    posseg_module_name: str = sys.argv[2]
+
+    sys.path.insert(0, addons_folder)
+    posseg = importlib.import_module(posseg_module_name)
+
+    if len(sys.argv) > 3:
+        # the cache is created by the main process, see jieba_wrapper._use_dictionary_cache
+        tokenizer = posseg.dt.tokenizer
+        tokenizer.tmp_dir, tokenizer.cache_file = os.path.split(sys.argv[3])
+
+    # json escapes all non-ascii characters by default,
+    # so the encoding of the pipes does not matter
+    for line in sys.stdin.buffer:
+        sentences: list[str] = json.loads(line)
+        words: list[list[str]] = [
+            [posseg_pair.word for posseg_pair in posseg.cut(sentence)]
+            for sentence in sentences
+        ]
+        sys.stdout.buffer.write(json.dumps(words).encode("ascii") + b"\n")
+        sys.stdout.buffer.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,46 @@
 from __future__ import annotations
 
-import functools
+import hashlib
 import importlib
 import importlib.util
+import json
+import os
+import re
+import subprocess
 import sys
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from types import ModuleType
+from typing import Any
 
-from ..morpheme import Morpheme
+from aqt import mw
+from aqt.package import venv_binary
+
+from .. import cache_registry
+from ..morpheme import Morpheme, get_interned_morph
+from .mecab_wrapper import get_windows_startup_info
+from .worker_pool import WorkerPool
 
 posseg: ModuleType | None = None
 successful_import: bool = False
 
+# import_jieba is called lazily from whichever thread uses jieba first
+_import_lock = threading.Lock()
+_import_done: bool = False
+
+# the command that starts jieba_worker.py, None if there is no python executable
+_worker_cmd: list[str] | None = None
+
+_morphemes_cache = cache_registry.register_cache(
+    cache_registry.BoundedCache(
+        name="jieba morphemes",
+        max_bytes=64 * 1024 * 1024,
+        clear_on={cache_registry.ClearOn.PROFILE_CHANGE},
+    )
+)
+
 ################################################################################
 # This section about cjk_ideographs is based on zhon/hanzi.py in:
 # https://github.com/tsroten/zhon
@@ -33,47 +63,313 @@ if sys.maxunicode > 0xFFFF:
 ################################################################################
 
 
+# Checking every character against the list of ranges in python is slow,
+# a character class does the same check in C.
+_cjk_only_regex = re.compile(
+    "["
+    + "".join(f"{chr(start)}-{chr(end)}" for start, end in cjk_ideograph_unicode_ranges)
+    + "]*"
+)
+
+
+class _JiebaWorker:
+    """
+    A python subprocess running jieba_worker.py. A worker must only be used by one
+    thread at a time, otherwise the interactions get interleaved on the pipes.
+    """
+
+    __slots__ = ("process",)
+
+    def __init__(self) -> None:
+        self.process: subprocess.Popen[bytes] = _spawn_worker_process()
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def terminate(self) -> None:
+        if self.is_alive():
+            self.process.kill()
+        self.process.wait()
+
+
+################################################################
+#                         WORKER POOL
+################################################################
+# posseg.cut is pure python, so threads would just take turns
+# holding the GIL. Large batches (recalc and the generators) are
+# instead segmented by jieba in separate processes. Starting a
+# worker means loading the jieba dictionary, which takes about
+# a second, so small batches are segmented in this process.
+################################################################
+NUM_WORKERS: int = max(1, min(4, (os.cpu_count() or 2) - 1))
+_pool: WorkerPool[_JiebaWorker] = WorkerPool(
+    max_size=NUM_WORKERS, create_worker=_JiebaWorker
+)
+
+# the number of sentences sent to a worker per interaction
+WORKER_BATCH_SIZE = 1000
+_MIN_SENTENCES_FOR_WORKERS = 2 * WORKER_BATCH_SIZE
+
+# large enough for the workers to be used, and for all of them to get a batch
+PREFERRED_CHUNK_SIZE = max(_MIN_SENTENCES_FOR_WORKERS, NUM_WORKERS * WORKER_BATCH_SIZE)
+
+# the number of times an interaction is retried with a new worker if it dies
+_MAX_RETRIES = 1
+
+################################################################
+#                      DICTIONARY CACHE
+################################################################
+# Jieba builds a prefix dictionary from its dictionary file the
+# first time it segments something, which takes about a second.
+# By default it caches the result in the temp folder, which the
+# OS can clean up, and it never checks if the cache of the
+# default dictionary is out of date. We instead store the cache
+# in the profile folder, named after the checksum of the
+# dictionary, so a new dictionary (e.g. after an update of the
+# jieba add-on) gets a new cache. The workers use the same cache.
+################################################################
+_DICTIONARY_CACHE_PREFIX = "ankimorphs_jieba_"
+
+
+def _get_jieba_addon_package() -> str | None:
+    # find_spec only looks for the package, it does not import it
+    for package in ["1857311956", "ankimorphs_chinese_jieba"]:
+        if importlib.util.find_spec(package):
+            return package
+    return None
+
+
+def is_installed() -> bool:
+    return _get_jieba_addon_package() is not None
+
+
 def import_jieba() -> None:
-    global posseg, successful_import
+    # importing jieba is only done the first time it's actually used
+    global _import_done
+
+    if _import_done:
+        return
+
+    with _import_lock:
+        if _import_done:
+            return
+        try:
+            _import_jieba()
+        finally:
+            _import_done = True
 
-    if importlib.util.find_spec("1857311956"):
-        posseg = importlib.import_module("1857311956.jieba.posseg")
-    elif importlib.util.find_spec("ankimorphs_chinese_jieba"):
-        posseg = importlib.import_module("ankimorphs_chinese_jieba.jieba.posseg")
-    else:
+
+def _import_jieba() -> None:
+    global posseg, successful_import, _worker_cmd
+
+    jieba_addon_package: str | None = _get_jieba_addon_package()
+    if jieba_addon_package is None:
         return
 
+    posseg = importlib.import_module(f"{jieba_addon_package}.jieba.posseg")
+
+    dictionary_cache_path: Path | None = None
+    if mw is not None and mw.pm is not None:
+        jieba_module = sys.modules[f"{jieba_addon_package}.jieba"]
+        dictionary_cache_path = _use_dictionary_cache(
+            tokenizer=jieba_module.dt, cache_folder=Path(mw.pm.profileFolder())
+        )
+
+    python_path: str | None = _get_python_path()
+    if python_path is not None:
+        # the jieba add-on is imported by its package name, so the folder
+        # containing that package has to be on the path of the workers
+        jieba_addon_module = sys.modules[jieba_addon_package]
+        assert jieba_addon_module.__file__ is not None
+        addons_folder = os.path.dirname(os.path.dirname(jieba_addon_module.__file__))
+        worker_script = os.path.join(os.path.dirname(__file__), "jieba_worker.py")
+        _worker_cmd = [python_path, worker_script, addons_folder, posseg.__name__]
+        if dictionary_cache_path is not None:
+            _worker_cmd.append(str(dictionary_cache_path))
+
     successful_import = True
 
 
-# the cache needs to have a max size to maintain garbage collection
-@functools.lru_cache(maxsize=131072)
+def _use_dictionary_cache(tokenizer: Any, cache_folder: Path) -> Path:
+    # tokenizer: jieba.Tokenizer, has to be called before it is initialized
+    with tokenizer.get_dict_file() as dict_file:
+        checksum: str = hashlib.sha256(dict_file.read()).hexdigest()[:16]
+
+    cache_file_name = f"{_DICTIONARY_CACHE_PREFIX}{checksum}.cache"
+
+    # caches of previous dictionaries will never be used again
+    for cache_file in cache_folder.glob(f"{_DICTIONARY_CACHE_PREFIX}*.cache"):
+        if cache_file.name != cache_file_name:
+            cache_file.unlink(missing_ok=True)
+
+    tokenizer.tmp_dir = str(cache_folder)
+    tokenizer.cache_file = cache_file_name
+    return Path(cache_folder, cache_file_name)
+
+
+def _get_python_path() -> str | None:
+    # In the packaged versions of Anki sys.executable is the Anki binary,
+    # so we use the python binary of the launcher instead. When Anki is
+    # run from source (and in the tests) sys.executable is python itself.
+    python_path: str | None = venv_binary("python")
+    if python_path is not None and os.path.isfile(python_path):
+        return python_path
+    if os.path.basename(sys.executable).lower().startswith("python"):
+        return sys.executable
+    return None
+
+
+def warm_up() -> None:
+    # jieba builds its dictionary the first time something is segmented
+    import_jieba()
+    assert posseg is not None
+    for _ in posseg.cut("中文"):
+        pass
+
+
+def terminate_workers() -> None:
+    _pool.terminate_idle_workers()
+
+
+def _spawn_worker_process() -> subprocess.Popen[bytes]:
+    assert _worker_cmd is not None
+    return subprocess.Popen(
+        _worker_cmd,
+        startupinfo=get_windows_startup_info(),
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,  # jieba logs the dictionary loading to stderr
+    )
+
+
 def get_morphemes_jieba(expression: str) -> list[Morpheme]:
+    cached_morphs: list[Morpheme] | None = _morphemes_cache.get(expression)
+    if cached_morphs is not None:
+        return cached_morphs
+
     assert posseg is not None
-    _morphs: list[Morpheme] = []
 
     # The "posseg.cut" function returns "Pair" instances:
     #   Pair.word
     #   Pair.flag  # part of speech
-    for posseg_pair in posseg.cut(expression):
-        if text_contains_only_cjk_ranges(_text=posseg_pair.word) is False:
+    morphs = _get_morphemes_from_words(
+        [posseg_pair.word for posseg_pair in posseg.cut(expression)]
+    )
+    _morphemes_cache.put(expression, morphs)
+    return morphs
+
+
+def get_morphemes_jieba_batch(expressions: list[str]) -> list[list[Morpheme]]:
+    """
+    Same as get_morphemes_jieba, but all the expressions that are not cached are
+    segmented by a worker process in one go. Duplicates are only segmented once.
+    """
+    morphs_by_expression: dict[str, list[Morpheme]] = {}
+    uncached_expressions: list[str] = []
+
+    for expression in expressions:
+        if expression in morphs_by_expression:
             continue
+        cached_morphs: list[Morpheme] | None = _morphemes_cache.get(expression)
+        if cached_morphs is None:
+            # placeholder, also marks the expression as seen
+            morphs_by_expression[expression] = []
+            uncached_expressions.append(expression)
+        else:
+            morphs_by_expression[expression] = cached_morphs
 
-        # chinese does not have inflections, so we use the lemma for both
-        _morphs.append(Morpheme(lemma=posseg_pair.word, inflection=posseg_pair.word))
+    if uncached_expressions:
+        words_list: list[list[str]] | None = _interact(uncached_expressions)
 
-    return _morphs
+        if words_list is None:
+            # the workers are not available, so we fall back to this process
+            for expression in uncached_expressions:
+                morphs_by_expression[expression] = get_morphemes_jieba(expression)
+        else:
+            for expression, words in zip(uncached_expressions, words_list):
+                morphs = _get_morphemes_from_words(words)
+                _morphemes_cache.put(expression, morphs)
+                morphs_by_expression[expression] = morphs
 
+    return [morphs_by_expression[expression] for expression in expressions]
 
-def char_found_in_cjk_ranges(_char: str) -> bool:
-    for start, end in cjk_ideograph_unicode_ranges:
-        if start <= ord(_char) <= end:
-            return True
-    return False
+
+def get_morphemes_jieba_batches(
+    batches: list[list[str]],
+) -> Iterator[list[list[Morpheme]]]:
+    """
+    Spreads the batches across the workers, the results are yielded in the same order as the batches.
+    """
+    if _worker_cmd is None or sum(map(len, batches)) < _MIN_SENTENCES_FOR_WORKERS:
+        for batch in batches:
+            yield [get_morphemes_jieba(expression) for expression in batch]
+        return
+
+    executor = ThreadPoolExecutor(max_workers=NUM_WORKERS, thread_name_prefix="jieba")
+    try:
+        yield from executor.map(get_morphemes_jieba_batch, batches)
+    finally:
+        # the consumer can stop early, e.g. when recalc is cancelled
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _interact(expressions: list[str]) -> list[list[str]] | None:
+    # returns None if the workers are not available
+    if _worker_cmd is None:
+        return None
+
+    # json escapes all non-ascii characters by default, so the encoding
+    # of the pipes does not matter and lone surrogates survive the trip
+    request: bytes = json.dumps(expressions).encode("ascii") + b"\n"
+
+    for _ in range(_MAX_RETRIES + 1):
+        with _pool.checkout() as worker:
+            words_list = _interact_with_worker(worker, request, len(expressions))
+        if words_list is not None:
+            return words_list
+
+    return None
+
+
+def _interact_with_worker(
+    worker: _JiebaWorker, request: bytes, num_expressions: int
+) -> list[list[str]] | None:
+    # returns None if the worker has died
+    assert worker.process.stdin is not None
+    assert worker.process.stdout is not None
+
+    # The worker reads the whole line before it starts writing,
+    # so the pipes cannot deadlock.
+    try:
+        worker.process.stdin.write(request)
+        worker.process.stdin.flush()
+    except OSError:
+        worker.terminate()
+        return None
+
+    response: bytes = worker.process.stdout.readline()
+
+    try:
+        words_list: list[list[str]] = json.loads(response)
+    except ValueError:  # EOF or garbage
+        worker.terminate()
+        return None
+
+    if len(words_list) != num_expressions:
+        worker.terminate()
+        return None
+
+    return words_list
+
+
+def _get_morphemes_from_words(words: list[str]) -> list[Morpheme]:
+    # chinese does not have inflections, so we use the lemma for both
+    return [
+        get_interned_morph(lemma=word, inflection=word)
+        for word in words
+        if text_contains_only_cjk_ranges(_text=word)
+    ]
 
 
 def text_contains_only_cjk_ranges(_text: str) -> bool:
-    for char in _text:
-        if not char_found_in_cjk_ranges(char):
-            return False
-    return True
+    return _cjk_only_regex.fullmatch(_text) is not None
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import heapq
+import re
+import threading
+import time
+from collections.abc import Callable
+from typing import TypeVar
+
+################################################################
+#                      LONG TEXT GUARD
+################################################################
+# Fields with pasted articles, subtitles files, etc. can be tens of
+# thousands of characters long, which stalls MeCab and makes spaCy
+# allocate huge docs. Texts longer than MAX_TEXT_LENGTH are therefore
+# split into pieces that are morphemized separately, and the morphs of
+# the pieces are merged afterward.
+#
+# The texts are split on the first kind of boundary that produces
+# pieces that are short enough: sentences, then clauses, then
+# whitespace. Languages that don't use any of those are cut at
+# MAX_TEXT_LENGTH as a last resort.
+################################################################
+
+MAX_TEXT_LENGTH = 2000
+
+# the split happens after the punctuation, so it stays with its sentence/clause
+_BOUNDARY_REGEXES: list[re.Pattern[str]] = [
+    re.compile(r"(?<=[.!?。！？…\n])"),
+    re.compile(r"(?<=[,;:，、；：])"),
+    re.compile(r"(?<=\s)"),
+]
+
+# how many of the slowest texts are kept for the report
+_NUM_SLOWEST_TEXTS = 5
+_PREVIEW_LENGTH = 40
+
+_T = TypeVar("_T")
+
+
+def is_too_long(text: str) -> bool:
+    return len(text) > MAX_TEXT_LENGTH
+
+
+def split_long_text(text: str, max_length: int = MAX_TEXT_LENGTH) -> list[str]:
+    return _split(text, max_length, boundary_index=0)
+
+
+def _split(text: str, max_length: int, boundary_index: int) -> list[str]:
+    if len(text) <= max_length:
+        return [text]
+
+    if boundary_index >= len(_BOUNDARY_REGEXES):
+        return [
+            text[start : start + max_length]
+            for start in range(0, len(text), max_length)
+        ]
+
+    pieces: list[str] = []
+    current_piece: str = ""
+
+    # adjacent parts are merged back together as long as they fit,
+    # so the morphemizer gets as much context as possible
+    for part in _BOUNDARY_REGEXES[boundary_index].split(text):
+        if len(current_piece) + len(part) <= max_length:
+            current_piece += part
+            continue
+
+        if current_piece:
+            pieces.append(current_piece)
+            current_piece = ""
+
+        if len(part) <= max_length:
+            current_piece = part
+        else:
+            # the last piece might still have room for the next parts
+            *full_pieces, current_piece = _split(part, max_length, boundary_index + 1)
+            pieces.extend(full_pieces)
+
+    if current_piece:
+        pieces.append(current_piece)
+
+    return pieces
+
+
+def morphemize_long_text(
+    text: str, morphemize: Callable[[list[str]], list[_T]]
+) -> list[_T]:
+    # 'morphemize' gets all the pieces at once so the morphemizer can batch
+    # them, and it returns the merged morphs of the pieces.
+    start_time: float = time.perf_counter()
+    result: list[_T] = morphemize(split_long_text(text))
+    _slowest_texts.add(time.perf_counter() - start_time, text)
+    return result
+
+
+class _SlowestTexts:
+    __slots__ = (
+        "_lock",
+        "_heap",
+        "_num_texts",
+    )
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # min-heap of (duration, length, preview), so the fastest is popped first
+        self._heap: list[tuple[float, int, str]] = []
+        self._num_texts: int = 0
+
+    def add(self, duration: float, text: str) -> None:
+        entry = (duration, len(text), text[:_PREVIEW_LENGTH].replace("\n", " "))
+        with self._lock:
+            self._num_texts += 1
+            if len(self._heap) < _NUM_SLOWEST_TEXTS:
+                heapq.heappush(self._heap, entry)
+            else:
+                heapq.heappushpop(self._heap, entry)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._heap = []
+            self._num_texts = 0
+
+    def get_report(self) -> list[str]:
+        with self._lock:
+            if self._num_texts == 0:
+                return []
+            report: list[str] = [
+                f"Long texts split before morphemizing: {self._num_texts}"
+            ]
+            for duration, length, preview in sorted(self._heap, reverse=True):
+                report.append(f"  {duration:.3f}s, {length} characters: '{preview}...'")
+            return report
+
+
+_slowest_texts = _SlowestTexts()
+
+
+def reset_slowest_texts() -> None:
+    _slowest_texts.reset()
+
+
+def get_slowest_texts_report() -> list[str]:
+    return _slowest_texts.get_report()
@@ -7,22 +7,50 @@ from . import mecab_wrapper
 
 space_char_regex = re.compile(" ")
 
+# the number of sentences sent to a mecab worker per write
+_BATCH_SIZE = 256
+
 
 class MecabMorphemizer(Morphemizer):
-    def __init__(self) -> None:
-        super().__init__()
-        mecab_wrapper.setup_mecab()
+    # mecab is set up lazily, see mecab_wrapper.setup_mecab
 
     def init_successful(self) -> bool:
+        mecab_wrapper.setup_mecab()
         return mecab_wrapper.successful_import
 
     def get_morphemes(self, sentences: list[str]) -> Iterator[list[Morpheme]]:
-        for sentence in sentences:
-            # Remove simple spaces that could be added by other add-ons because
-            # they can lead to parsing errors.
-            if space_char_regex.search(sentence):
-                sentence = space_char_regex.sub("", sentence)
-            yield mecab_wrapper.get_morphemes_mecab(sentence)
+        mecab_wrapper.setup_mecab()
+        if not mecab_wrapper.successful_import:
+            # the setup failed, the error was raised by the first call
+            for _ in sentences:
+                yield []
+            return
+
+        # Remove simple spaces that could be added by other add-ons because
+        # they can lead to parsing errors.
+        sentences = [space_char_regex.sub("", sentence) for sentence in sentences]
+
+        batches: list[list[str]] = [
+            sentences[start : start + _BATCH_SIZE]
+            for start in range(0, len(sentences), _BATCH_SIZE)
+        ]
+        for batch_morphs in mecab_wrapper.get_morphemes_mecab_batches(batches):
+            yield from batch_morphs
+
+    def get_morphemes_for_highlighting(self, sentence: str) -> list[Morpheme]:
+        # uses the worker reserved for the highlighting, see mecab_wrapper
+        mecab_wrapper.setup_mecab()
+        if not mecab_wrapper.successful_import:
+            # the highlighting morphemizes every card, so it doesn't raise
+            return []
+        return mecab_wrapper.get_morphemes_mecab(space_char_regex.sub("", sentence))
+
+    def get_chunk_size(self) -> int:
+        # enough batches to keep all the workers busy
+        return _BATCH_SIZE * mecab_wrapper.NUM_BATCH_WORKERS * 4
+
+    def warm_up(self) -> None:
+        mecab_wrapper.warm_up()
 
     def get_description(self) -> str:
         return "AnkiMorphs: Japanese"
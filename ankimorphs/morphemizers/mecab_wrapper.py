@@ -1,15 +1,20 @@
 from __future__ import annotations
 
-import functools
 import importlib
 import importlib.util
+import os
 import re
 import subprocess
 import sys
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from types import ModuleType
 from typing import IO, Any
 
-from ..morpheme import Morpheme
+from .. import cache_registry
+from ..morpheme import Morpheme, get_interned_morph
+from .worker_pool import WorkerPool
 
 _MECAB_NODE_IPADIC_PARTS = ["%f[6]", "%m", "%f[7]", "%f[0]", "%f[1]"]
 _MECAB_NODE_LENGTH_IPADIC = len(_MECAB_NODE_IPADIC_PARTS)
@@ -29,16 +34,107 @@ _mecab_encoding: str | None = None
 _mecab_complete_cmd: str | None = None  # pylint: disable=invalid-name
 _mecab_base_cmd: list[str] | None = None
 _mecab_windows_startupinfo: Any | None = None
+# MeCab splits lines that don't fit in its input buffer (8192 bytes by default),
+# and writes an EOS for every piece, which would shift the outputs of a batch.
+# The buffer is therefore enlarged, and longer expressions are cut to fit in it
+# (the characters of the mecab dictionary encodings are at most 4 bytes long).
+_INPUT_BUFFER_SIZE = 256 * 1024
+_MAX_EXPRESSION_LENGTH = _INPUT_BUFFER_SIZE // 4 - 16
+
 _mecab_args = [
     "--node-format={}\r".format("\t".join(_MECAB_NODE_IPADIC_PARTS)),
     "--eos-format=\n",
     "--unk-format=",
+    f"--input-buffer-size={_INPUT_BUFFER_SIZE}",
 ]
 
 successful_import: bool = False
 
+# setup_mecab is called lazily from whichever thread uses mecab first
+_setup_lock = threading.Lock()
+_setup_done: bool = False
+
+_morphemes_cache = cache_registry.register_cache(
+    cache_registry.BoundedCache(
+        name="mecab morphemes",
+        max_bytes=64 * 1024 * 1024,
+        clear_on={cache_registry.ClearOn.PROFILE_CHANGE},
+    )
+)
+
+
+class _MecabWorker:
+    """
+    A single mecab subprocess. A worker must only be used by one thread at a time,
+    otherwise the interactions get interleaved on the pipes.
+    """
+
+    __slots__ = ("process",)
+
+    def __init__(self) -> None:
+        assert _mecab_base_cmd is not None
+        self.process: subprocess.Popen[bytes] = _spawn_cmd(
+            _mecab_base_cmd + _mecab_args, _mecab_windows_startupinfo
+        )
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def terminate(self) -> None:
+        if self.is_alive():
+            self.process.kill()
+        self.process.wait()
+
+
+################################################################
+#                         WORKER POOLS
+################################################################
+# Highlighting (single sentences on the main thread) has its own
+# worker so it never has to wait for recalc or the generators,
+# which spread their batches across the batch workers.
+################################################################
+NUM_BATCH_WORKERS: int = max(1, min(4, (os.cpu_count() or 2) - 1))
+_highlighting_pool: WorkerPool[_MecabWorker] = WorkerPool(
+    max_size=1, create_worker=_MecabWorker
+)
+_batch_pool: WorkerPool[_MecabWorker] = WorkerPool(
+    max_size=NUM_BATCH_WORKERS, create_worker=_MecabWorker
+)
+
+# the number of times an interaction is retried with a new worker if mecab dies
+_MAX_RETRIES = 1
+
+
+def _get_mecab_addon_package() -> str | None:
+    # find_spec only looks for the package, it does not import it
+    for package in ["1974309724", "ankimorphs_japanese_mecab"]:
+        if importlib.util.find_spec(package):
+            return package
+    return None
+
+
+def is_installed() -> bool:
+    return _get_mecab_addon_package() is not None
+
 
 def setup_mecab() -> None:
+    # Setting up mecab imports the mecab add-on and runs 'mecab -D', so it
+    # is only done the first time mecab is actually used.
+    global _setup_done
+
+    if _setup_done:
+        return
+
+    with _setup_lock:
+        if _setup_done:
+            return
+        try:
+            _setup_mecab()
+        finally:
+            _setup_done = True
+
+
+def _setup_mecab() -> None:
     global successful_import
     global _mecab_windows_startupinfo
     global _mecab_encoding
@@ -47,15 +143,13 @@ def setup_mecab() -> None:
     # startup_info has the type: subprocess.STARTUPINFO, but that type
     # is only available on Windows, so we can't use type annotations here
     _mecab_windows_startupinfo = get_windows_startup_info()
-    reading: ModuleType
 
-    if importlib.util.find_spec("1974309724"):
-        reading = importlib.import_module("1974309724.reading")
-    elif importlib.util.find_spec("ankimorphs_japanese_mecab"):
-        reading = importlib.import_module("ankimorphs_japanese_mecab.reading")
-    else:
+    mecab_addon_package: str | None = _get_mecab_addon_package()
+    if mecab_addon_package is None:
         return
 
+    reading: ModuleType = importlib.import_module(f"{mecab_addon_package}.reading")
+
     _mecab = reading.MecabController()
     _mecab.setup()
 
@@ -81,13 +175,16 @@ def get_windows_startup_info() -> Any:
     return startup_info
 
 
-@functools.cache
-def _spawn_mecab() -> subprocess.Popen[bytes]:
-    """
-    MeCab reads expressions from stdin at runtime, so only one instance is needed, hence the functools.cache.
-    """
-    assert _mecab_base_cmd is not None
-    return _spawn_cmd(_mecab_base_cmd + _mecab_args, _mecab_windows_startupinfo)
+def warm_up() -> None:
+    # spawns the highlighting worker, mecab loads its dictionary on startup
+    setup_mecab()
+    with _highlighting_pool.checkout():
+        pass
+
+
+def terminate_workers() -> None:
+    _highlighting_pool.terminate_idle_workers()
+    _batch_pool.terminate_idle_workers()
 
 
 def _get_subprocess_dump(sub_cmd: list[str]) -> bytes:
@@ -110,24 +207,81 @@ def _spawn_cmd(cmd: list[str], _startupinfo: Any) -> subprocess.Popen[bytes]:
         startupinfo=_startupinfo,
         stdin=subprocess.PIPE,
         stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
+        # the results of a batch are split by counting the EOS lines on stdout,
+        # so a warning on stderr must not end up there
+        stderr=subprocess.DEVNULL,
     )
 
 
-# the cache needs to have a max size to maintain garbage collection
-@functools.lru_cache(maxsize=131072)
 def get_morphemes_mecab(expression: str) -> list[Morpheme]:
+    cached_morphs: list[Morpheme] | None = _morphemes_cache.get(expression)
+    if cached_morphs is not None:
+        return cached_morphs
+
+    morphs = _get_morphemes_from_output(_interact(_prepare_expression(expression)))
+    _morphemes_cache.put(expression, morphs)
+    return morphs
+
+
+def get_morphemes_mecab_batch(expressions: list[str]) -> list[list[Morpheme]]:
+    """
+    Same as get_morphemes_mecab, but all the expressions that are not cached are sent
+    to mecab in one go, which avoids having to wait for a round-trip per expression.
+    """
+    morphs_by_index: dict[int, list[Morpheme]] = {}
+    uncached_indices: list[int] = []
+
+    for index, expression in enumerate(expressions):
+        cached_morphs: list[Morpheme] | None = _morphemes_cache.get(expression)
+        if cached_morphs is None:
+            uncached_indices.append(index)
+        else:
+            morphs_by_index[index] = cached_morphs
+
+    if uncached_indices:
+        outputs: list[str] = _interact_batch(
+            [_prepare_expression(expressions[index]) for index in uncached_indices]
+        )
+        for index, output in zip(uncached_indices, outputs):
+            morphs = _get_morphemes_from_output(output)
+            _morphemes_cache.put(expressions[index], morphs)
+            morphs_by_index[index] = morphs
+
+    return [morphs_by_index[index] for index in range(len(expressions))]
+
+
+def get_morphemes_mecab_batches(
+    batches: list[list[str]],
+) -> Iterator[list[list[Morpheme]]]:
+    """
+    Spreads the batches across the batch workers, the results are yielded in the same order as the batches.
+    """
+    executor = ThreadPoolExecutor(
+        max_workers=NUM_BATCH_WORKERS, thread_name_prefix="mecab"
+    )
+    try:
+        yield from executor.map(get_morphemes_mecab_batch, batches)
+    finally:
+        # the consumer can stop early, e.g. when recalc is cancelled
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _prepare_expression(expression: str) -> str:
+    # Remove Unicode control codes before sending to MeCab. This also removes
+    # newlines, which guarantees that every expression produces one line of output.
+    #
     # HACK: mecab sometimes does not produce the right morphs if there are no extra characters in the expression,
     # so we just add a whitespace and a japanese punctuation mark "。" at the end to prevent the problem.
-    expression += " 。"
+    #
+    # The texts that go through get_processed_morphs are much shorter than the input
+    # buffer (see long_text_guard.py), but the other callers are not.
+    return _control_chars_re.sub("", expression)[:_MAX_EXPRESSION_LENGTH] + " 。"
 
-    # Remove Unicode control codes before sending to MeCab.
-    expression = _control_chars_re.sub("", expression)
 
-    mecab_morphs: list[str] = _interact(expression).split("\r")
+def _get_morphemes_from_output(mecab_output: str) -> list[Morpheme]:
     actual_morphs: list[Morpheme] = []
 
-    for morph_string in mecab_morphs:
+    for morph_string in mecab_output.split("\r"):
         morph: Morpheme | None = _get_morpheme(morph_string.split("\t"))
         if morph is not None:
             actual_morphs.append(morph)
@@ -148,7 +302,7 @@ def _get_morpheme(morph_string_parts: list[str]) -> Morpheme | None:
     lemma = morph_string_parts[0].strip()
     inflection = morph_string_parts[1].strip()
 
-    return Morpheme(lemma, inflection)
+    return get_interned_morph(lemma, inflection)
 
 
 def _interact(string_expression: str) -> str:  # Str -> IO Str
@@ -156,25 +310,113 @@ def _interact(string_expression: str) -> str:  # Str -> IO Str
     "interacts" with 'mecab' command: writes expression to stdin of 'mecab' process and gets all the morpheme
     info from its stdout.
     """
-    mecab_process: subprocess.Popen[bytes] = _spawn_mecab()
-
-    assert mecab_process.stdin is not None
-    assert mecab_process.stdout is not None
     assert _mecab_encoding is not None
 
     bytes_expression = string_expression.encode(_mecab_encoding, errors="ignore")
+    output_lines: list[bytes] | None = None
+
+    for _ in range(_MAX_RETRIES + 1):
+        with _highlighting_pool.checkout() as worker:
+            output_lines = _interact_with_worker(worker, bytes_expression)
+        if output_lines is not None:
+            break
+
+    if output_lines is None:
+        return ""
+
+    return "".join(str(line.rstrip(b"\r\n"), _mecab_encoding) for line in output_lines)
 
-    # The line terminator is always b'\n' for binary files: https://docs.python.org/3/library/io.html#io.IOBase
-    mecab_process.stdin.write(bytes_expression + b"\n")
 
-    # The buffer will be written out to the underlying RawIOBase object when flush() is called
-    mecab_process.stdin.flush()
-    mecab_process.stdout.flush()
+def _interact_with_worker(
+    worker: _MecabWorker, bytes_expression: bytes
+) -> list[bytes] | None:
+    # returns None if mecab has died
+    assert worker.process.stdin is not None
+    assert worker.process.stdout is not None
+
+    try:
+        # The line terminator is always b'\n' for binary files: https://docs.python.org/3/library/io.html#io.IOBase
+        worker.process.stdin.write(bytes_expression + b"\n")
+
+        # The buffer will be written out to the underlying RawIOBase object when flush() is called
+        worker.process.stdin.flush()
+    except OSError:
+        return None
 
-    entire_output: str = ""
     lines_to_read = len(bytes_expression.split(b"\n"))
+    output_lines: list[bytes] = worker.process.stdout.readlines(lines_to_read)
+
+    if not output_lines:  # EOF
+        return None
+
+    return output_lines
+
+
+def _interact_batch(string_expressions: list[str]) -> list[str]:
+    """
+    Batched version of _interact: writes all the expressions to stdin at once and splits the output on the
+    EOS markers. The eos-format is '\\n' and the nodes end with '\\r', so each expression produces exactly
+    one line of output, in the same order as the input.
+    """
+    assert _mecab_encoding is not None
+
+    bytes_expressions: bytes = b"".join(
+        expression.encode(_mecab_encoding, errors="ignore") + b"\n"
+        for expression in string_expressions
+    )
+    output_lines: list[bytes] | None = None
+
+    for _ in range(_MAX_RETRIES + 1):
+        with _batch_pool.checkout() as worker:
+            output_lines = _interact_batch_with_worker(
+                worker, bytes_expressions, len(string_expressions)
+            )
+        if output_lines is not None:
+            break
+
+    if output_lines is None:
+        return [""] * len(string_expressions)
+
+    return [str(line.rstrip(b"\r\n"), _mecab_encoding) for line in output_lines]
+
+
+def _interact_batch_with_worker(
+    worker: _MecabWorker, bytes_expressions: bytes, num_expressions: int
+) -> list[bytes] | None:
+    # returns None if mecab has died
+    assert worker.process.stdin is not None
+    assert worker.process.stdout is not None
+
+    # MeCab starts producing output before it has read all the input, so if we wrote
+    # everything before reading, both pipe buffers could fill up and deadlock. Writing
+    # on a separate thread keeps MeCab busy while we read the output.
+    writer_thread = threading.Thread(
+        target=_write_to_stdin,
+        args=(worker.process.stdin, bytes_expressions),
+        daemon=True,
+    )
+    writer_thread.start()
+
+    output_lines: list[bytes] = []
+    for _ in range(num_expressions):
+        line = worker.process.stdout.readline()
+        if not line:  # EOF
+            break
+        output_lines.append(line)
+
+    writer_thread.join()
+
+    if len(output_lines) != num_expressions:
+        worker.terminate()
+        return None
+
+    return output_lines
 
-    for line in mecab_process.stdout.readlines(lines_to_read):
-        entire_output += str(line.rstrip(b"\r\n"), _mecab_encoding)
 
-    return entire_output
+def _write_to_stdin(stdin: IO[bytes], data: bytes) -> None:
+    try:
+        stdin.write(data)
+        stdin.flush()
+    except OSError:
+        # mecab has died, the reader will get an EOF
+        pass
@@ -1,11 +1,20 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from collections.abc import Iterator
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+from typing import TypeVar
 
 from .. import text_preprocessing
 from ..ankimorphs_config import AnkiMorphsConfig
+from ..exceptions import CancelledOperationException
 from ..morpheme import Morpheme
+from . import long_text_guard
+
+_Key = TypeVar("_Key")
+
+# the number of texts a morphemizer gets at a time, unless it prefers something else
+DEFAULT_CHUNK_SIZE = 1000
 
 
 class Morphemizer(ABC):
@@ -24,17 +33,117 @@ class Morphemizer(ABC):
     def get_processed_morphs(
         self, am_config: AnkiMorphsConfig, sentences: list[str]
     ) -> Iterator[list[Morpheme]]:
-        for morphs in self.get_morphemes(sentences):
+        return self._get_processed_morphs(am_config, sentences, self.get_morphemes)
+
+    def get_processed_morphs_for_highlighting(
+        self, am_config: AnkiMorphsConfig, sentence: str
+    ) -> list[Morpheme]:
+        # The highlighting morphemizes one text at a time on the main thread, so it
+        # goes through get_morphemes_for_highlighting instead of get_morphemes.
+        return next(
+            self._get_processed_morphs(
+                am_config, [sentence], self._get_morphemes_for_highlighting
+            )
+        )
+
+    def _get_processed_morphs(
+        self,
+        am_config: AnkiMorphsConfig,
+        sentences: list[str],
+        get_morphemes: Callable[[list[str]], Iterator[list[Morpheme]]],
+    ) -> Iterator[list[Morpheme]]:
+        # very long sentences are morphemized on their own in pieces, see long_text_guard.py
+        short_sentences_morphs: Iterator[list[Morpheme]] = get_morphemes(
+            [
+                sentence
+                for sentence in sentences
+                if not long_text_guard.is_too_long(sentence)
+            ]
+        )
+        for sentence in sentences:
+            if long_text_guard.is_too_long(sentence):
+                morphs = long_text_guard.morphemize_long_text(
+                    sentence,
+                    lambda pieces: [
+                        morph for morphs in get_morphemes(pieces) for morph in morphs
+                    ],
+                )
+            else:
+                morphs = next(short_sentences_morphs, [])
             if am_config.preprocess_ignore_names_morphemizer:
                 morphs = self.remove_names_morphemizer(morphs)
             if am_config.preprocess_ignore_names_textfile:
                 morphs = text_preprocessing.remove_names_textfile(morphs)
             yield morphs
 
+    def get_processed_morphs_by_key(
+        self, am_config: AnkiMorphsConfig, keys_and_sentences: list[tuple[_Key, str]]
+    ) -> Iterator[tuple[_Key, list[Morpheme]]]:
+        # Same as get_processed_morphs, but the morphs are yielded together with
+        # the key of their sentence (e.g. a card id).
+        sentences: list[str] = [sentence for _, sentence in keys_and_sentences]
+        for (key, _), morphs in zip(
+            keys_and_sentences, self.get_processed_morphs(am_config, sentences)
+        ):
+            yield key, morphs
+
+    def get_chunk_size(self) -> int:
+        # The number of texts the backend works best with at a time,
+        # i.e. large enough to make use of its batching.
+        return DEFAULT_CHUNK_SIZE
+
+    def get_processed_morphs_in_chunks(
+        self,
+        am_config: AnkiMorphsConfig,
+        keys_and_texts: Iterable[tuple[_Key, str]],
+        on_progress: Callable[[int], None] | None = None,
+        should_cancel: Callable[[], bool] | None = None,
+    ) -> Iterator[tuple[_Key, list[Morpheme]]]:
+        # Streams the texts through the morphemizer one chunk at a time, so only
+        # one chunk has to be in memory, and the texts can be generated lazily.
+        # 'on_progress' gets the number of texts processed so far after every
+        # chunk, and 'should_cancel' is checked before every chunk.
+        keys_and_texts_iterator = iter(keys_and_texts)
+        chunk_size = self.get_chunk_size()
+        num_processed = 0
+
+        while True:
+            if should_cancel is not None and should_cancel():
+                raise CancelledOperationException
+
+            chunk: list[tuple[_Key, str]] = list(
+                islice(keys_and_texts_iterator, chunk_size)
+            )
+            if not chunk:
+                break
+
+            yield from self.get_processed_morphs_by_key(am_config, chunk)
+
+            num_processed += len(chunk)
+            if on_progress is not None:
+                on_progress(num_processed)
+
     @abstractmethod
     def get_morphemes(self, sentences: list[str]) -> Iterator[list[Morpheme]]:
         pass
 
+    def get_morphemes_for_highlighting(self, sentence: str) -> list[Morpheme]:
+        # Morphemizers that batch the sentences of recalc and the generators
+        # override this to keep the highlighting off their batch workers.
+        return next(self.get_morphemes([sentence]), [])
+
+    def _get_morphemes_for_highlighting(
+        self, sentences: list[str]
+    ) -> Iterator[list[Morpheme]]:
+        for sentence in sentences:
+            yield self.get_morphemes_for_highlighting(sentence)
+
+    def warm_up(self) -> None:
+        # Loads whatever the morphemizer loads lazily on first use (models,
+        # dictionaries, processes), so the first recalc or highlighted card
+        # doesn't have to wait for it. Called from a background thread.
+        pass
+
     @staticmethod
     def remove_names_morphemizer(morphs: list[Morpheme]) -> list[Morpheme]:
         return [morph for morph in morphs if not morph.is_proper_noun()]
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from ..morphemizers import spacy_wrapper
+import threading
+
+from ..morphemizers import jieba_wrapper, mecab_wrapper, spacy_wrapper
 from ..morphemizers.jieba_morphemizer import JiebaMorphemizer
 from ..morphemizers.mecab_morphemizer import MecabMorphemizer
 from ..morphemizers.morphemizer import Morphemizer
@@ -10,35 +12,62 @@ from ..morphemizers.spacy_morphemizer import SpacyMorphemizer
 available_morphemizers: list[Morphemizer] | None = None
 morphemizers_by_description: dict[str, Morphemizer] = {}
 
+# the morphemizers can be requested by the warm-up thread and the main thread at the same time
+_lock = threading.Lock()
+
 
 def get_all_morphemizers() -> list[Morphemizer]:
     global available_morphemizers
 
-    if available_morphemizers is None:
-        # the space morphemizer is always included since it's pure python
-        available_morphemizers = [
-            SimpleSpaceMorphemizer(),
-        ]
+    with _lock:
+        if available_morphemizers is None:
+            available_morphemizers = _create_available_morphemizers()
+
+            # update the 'names to morphemizers' dict while we are at it
+            for morphemizer in available_morphemizers:
+                morphemizers_by_description[morphemizer.get_description()] = morphemizer
+
+        return available_morphemizers
 
-        _mecab = MecabMorphemizer()
-        if _mecab.init_successful():
-            available_morphemizers.append(_mecab)
 
-        _jieba = JiebaMorphemizer()
-        if _jieba.init_successful():
-            available_morphemizers.append(_jieba)
+def _create_available_morphemizers() -> list[Morphemizer]:
+    # This only checks which morphemizers are installed, without importing
+    # or starting anything, since it's needed just to list the morphemizers
+    # in the settings. The backends are initialized the first time they
+    # are actually used.
 
-        spacy_wrapper.load_spacy_modules()
-        for spacy_model in spacy_wrapper.get_installed_models():
-            available_morphemizers.append(SpacyMorphemizer(spacy_model))
+    # the space morphemizer is always included since it's pure python
+    morphemizers: list[Morphemizer] = [
+        SimpleSpaceMorphemizer(),
+    ]
 
-        # update the 'names to morphemizers' dict while we are at it
-        for morphemizer in available_morphemizers:
-            morphemizers_by_description[morphemizer.get_description()] = morphemizer
+    if mecab_wrapper.is_installed():
+        morphemizers.append(MecabMorphemizer())
 
-    return available_morphemizers
+    if jieba_wrapper.is_installed():
+        morphemizers.append(JiebaMorphemizer())
+
+    for spacy_model in spacy_wrapper.get_installed_models():
+        morphemizers.append(SpacyMorphemizer(spacy_model))
+        if spacy_wrapper.supports_lemma_only(spacy_model):
+            morphemizers.append(SpacyMorphemizer(spacy_model, lemma_only=True))
+
+    return morphemizers
 
 
 def get_morphemizer_by_description(description: str) -> Morphemizer | None:
     get_all_morphemizers()
     return morphemizers_by_description.get(description, None)
+
+
+def warm_up_morphemizers(descriptions: set[str]) -> None:
+    for description in descriptions:
+        morphemizer = get_morphemizer_by_description(description)
+        if morphemizer is None:
+            continue
+        try:
+            morphemizer.warm_up()
+        except Exception:  # pylint:disable=broad-exception-caught
+            # this is only an optimization, the same error will
+            # show up again when the morphemizer is actually used
+            pass
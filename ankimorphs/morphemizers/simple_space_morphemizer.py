@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from collections.abc import Iterator
 
-from ..morpheme import Morpheme
+from ..morpheme import Morpheme, get_interned_morph
 from ..morphemizers.morphemizer import Morphemizer
 
 
@@ -17,7 +17,9 @@ class SimpleSpaceMorphemizer(Morphemizer):
     def get_morphemes(self, sentences: list[str]) -> Iterator[list[Morpheme]]:
         for element in sentences:
             word_list = [word.lower() for word in element.split()]
-            yield [Morpheme(lemma=word, inflection=word) for word in word_list]
+            yield [
+                get_interned_morph(lemma=word, inflection=word) for word in word_list
+            ]
 
     def get_description(self) -> str:
         return "AnkiMorphs: Simple Space Splitter"
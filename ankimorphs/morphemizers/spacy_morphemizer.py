@@ -1,61 +1,194 @@
 import re
-from collections.abc import Iterator
-from typing import Any
+from collections.abc import Callable, Iterable, Iterator, Sized
+from functools import partial
+from itertools import chain, islice
+from typing import Any, TypeVar
 
 from .. import text_preprocessing
 from ..ankimorphs_config import AnkiMorphsConfig
-from ..morpheme import Morpheme
-from ..morphemizers import spacy_wrapper
+from ..exceptions import CancelledOperationException
+from ..morpheme import Morpheme, get_interned_morph
+from ..morphemizers import long_text_guard, spacy_wrapper
 from ..morphemizers.morphemizer import Morphemizer
 
+_Key = TypeVar("_Key")
+
+# the token attributes we get from 'Doc.to_array', in this order
+_TOKEN_ATTRIBUTES = ["POS", "LEMMA", "ORTH", "LIKE_NUM"]
+
 # matches strings/words entirely made up of punctuation and symbols
 punctuation_and_symbols = re.compile(r"^[\W_]+$", re.UNICODE)
 
 
 class SpacyMorphemizer(Morphemizer):
-    def __init__(self, spacy_model: str):
+    def __init__(self, spacy_model: str, lemma_only: bool = False):
         super().__init__()
         self.spacy_model: str = spacy_model
+        # lemma only morphemizers skip the neural components, see spacy_wrapper.get_nlp
+        self.lemma_only: bool = lemma_only
         # part of speech tags: https://universaldependencies.org/u/pos/
         self.excluded_pos = {"X", "SPACE", "SYM", "PUNCT"}
 
     def get_processed_morphs(
         self, am_config: AnkiMorphsConfig, sentences: list[str]
     ) -> Iterator[list[Morpheme]]:
+        for _, morphs in self.get_processed_morphs_in_chunks(
+            am_config, [(None, sentence) for sentence in sentences]
+        ):
+            yield morphs
 
-        # creating nlp objects is very expensive so we do it lazily here (cached)
-        nlp: Any = spacy_wrapper.get_nlp(self.spacy_model)
-
-        for doc in nlp.pipe(sentences):
-            morphs: list[Morpheme] = []
-
-            # doc: spacy.tokens.Doc
-            for w in doc:
-
-                if w.pos_ in self.excluded_pos:
-                    continue
-
-                if am_config.preprocess_ignore_names_morphemizer and w.pos_ == "PROPN":
-                    continue
-
-                if am_config.preprocess_ignore_numbers and w.pos_ == "NUM":
-                    continue
-
-                # spaCy can miscategorize text, so we include this as a failsafe.
-                if punctuation_and_symbols.match(w.text):
-                    continue
+    def get_processed_morphs_for_highlighting(
+        self, am_config: AnkiMorphsConfig, sentence: str
+    ) -> list[Morpheme]:
+        return next(self.get_processed_morphs(am_config, [sentence]))
+
+    def get_processed_morphs_by_key(
+        self, am_config: AnkiMorphsConfig, keys_and_sentences: list[tuple[_Key, str]]
+    ) -> Iterator[tuple[_Key, list[Morpheme]]]:
+        yield from self.get_processed_morphs_in_chunks(am_config, keys_and_sentences)
+
+    def get_processed_morphs_in_chunks(  # pylint:disable=too-many-locals
+        self,
+        am_config: AnkiMorphsConfig,
+        keys_and_texts: Iterable[tuple[_Key, str]],
+        on_progress: Callable[[int], None] | None = None,
+        should_cancel: Callable[[], bool] | None = None,
+    ) -> Iterator[tuple[_Key, list[Morpheme]]]:
+        # nlp.pipe already streams the texts in batches, and calling it once per
+        # chunk would restart its processes every time, so all the texts go
+        # through a single pipe, and the callbacks are called every chunk.
+        nlp: Any = spacy_wrapper.get_nlp(self.spacy_model, lemma_only=self.lemma_only)
+        excluded_pos_ids: set[int] = self._get_excluded_pos_ids(am_config, nlp)
+        chunk_size: int = self.get_chunk_size()
+
+        # Very long texts are replaced by empty placeholders in the pipe, and are
+        # morphemized on their own in pieces instead, see long_text_guard.py
+        texts_and_contexts: Iterator[tuple[str, tuple[_Key, str | None]]] = (
+            (
+                ("", (key, text))
+                if long_text_guard.is_too_long(text)
+                else (text, (key, None))
+            )
+            for key, text in keys_and_texts
+        )
+
+        # The batch size and the number of processes depend on the texts, so
+        # we read ahead as many texts as are needed to decide on them. The rest
+        # are only read as spaCy needs them.
+        first_texts: list[tuple[str, tuple[_Key, str | None]]] = list(
+            islice(
+                texts_and_contexts,
+                max(
+                    chunk_size,
+                    spacy_wrapper.get_num_texts_needed_for_n_process(
+                        am_config.spacy_n_process
+                    ),
+                ),
+            )
+        )
+        num_texts: int = (
+            len(keys_and_texts)
+            if isinstance(keys_and_texts, Sized)
+            else len(first_texts)
+        )
+
+        # 'as_tuples' makes spaCy pass the keys along with the docs,
+        # which keeps them paired up when multiple processes are used
+        docs_and_contexts: Iterator[tuple[Any, tuple[_Key, str | None]]] = nlp.pipe(
+            chain(first_texts, texts_and_contexts),
+            as_tuples=True,
+            batch_size=spacy_wrapper.get_batch_size(
+                am_config.spacy_batch_size, [text for text, _ in first_texts]
+            ),
+            n_process=spacy_wrapper.get_n_process(am_config.spacy_n_process, num_texts),
+        )
+
+        num_processed = 0
+        for doc, (key, long_text) in docs_and_contexts:
+            if long_text is None:
+                yield key, self._get_morphs_from_doc(am_config, doc, excluded_pos_ids)
+            else:
+                yield key, long_text_guard.morphemize_long_text(
+                    long_text,
+                    partial(self._get_merged_morphs, am_config, nlp, excluded_pos_ids),
+                )
 
-                morphs.append(
-                    Morpheme(
-                        lemma=w.lemma_,
-                        inflection=w.text,
-                    )
+            num_processed += 1
+            if num_processed % chunk_size == 0:
+                if on_progress is not None:
+                    on_progress(num_processed)
+                if should_cancel is not None and should_cancel():
+                    raise CancelledOperationException
+
+        if num_processed % chunk_size != 0 and on_progress is not None:
+            on_progress(num_processed)
+
+    def _get_merged_morphs(
+        self,
+        am_config: AnkiMorphsConfig,
+        nlp: Any,
+        excluded_pos_ids: set[int],
+        texts: list[str],
+    ) -> list[Morpheme]:
+        return [
+            morph
+            for doc in nlp.pipe(texts)
+            for morph in self._get_morphs_from_doc(am_config, doc, excluded_pos_ids)
+        ]
+
+    def _get_excluded_pos_ids(self, am_config: AnkiMorphsConfig, nlp: Any) -> set[int]:
+        excluded_pos: set[str] = set(self.excluded_pos)
+
+        if am_config.preprocess_ignore_names_morphemizer:
+            excluded_pos.add("PROPN")
+
+        if am_config.preprocess_ignore_numbers:
+            excluded_pos.add("NUM")
+
+        # the part of speech tags are spaCy symbols, so the string
+        # store gives us their ids instead of hashes, e.g. "PUNCT" -> 97
+        return {nlp.vocab.strings[pos] for pos in excluded_pos}
+
+    def _get_morphs_from_doc(
+        self, am_config: AnkiMorphsConfig, doc: Any, excluded_pos_ids: set[int]
+    ) -> list[Morpheme]:
+        # Reading 'w.pos_', 'w.lemma_' and 'w.text' creates a Token object and
+        # looks up three strings for every single token. Instead, we get the ids
+        # of all the tokens at once, filter on the integer part of speech ids,
+        # and only look up the strings of the tokens that we keep.
+        strings: Any = doc.vocab.strings  # spacy.strings.StringStore
+        morphs: list[Morpheme] = []
+
+        # lemma only morphemizers don't have part of speech tags,
+        # so numbers are recognized by their spelling instead
+        ignore_like_num: bool = self.lemma_only and am_config.preprocess_ignore_numbers
+
+        token_ids: list[list[int]] = doc.to_array(_TOKEN_ATTRIBUTES).tolist()
+
+        for pos_id, lemma_id, text_id, like_num in token_ids:
+            if pos_id in excluded_pos_ids:
+                continue
+
+            if ignore_like_num and like_num:
+                continue
+
+            text: str = strings[text_id]
+
+            # spaCy can miscategorize text, so we include this as a failsafe.
+            if punctuation_and_symbols.match(text):
+                continue
+
+            morphs.append(
+                get_interned_morph(
+                    lemma=strings[lemma_id],
+                    inflection=text,
                 )
+            )
 
-            if am_config.preprocess_ignore_names_textfile:
-                morphs = text_preprocessing.remove_names_textfile(morphs)
+        if am_config.preprocess_ignore_names_textfile:
+            morphs = text_preprocessing.remove_names_textfile(morphs)
 
-            yield morphs
+        return morphs
 
     def get_morphemes(self, sentences: list[str]) -> Iterator[list[Morpheme]]:
         """
@@ -64,7 +197,14 @@ class SpacyMorphemizer(Morphemizer):
         yield []
 
     def init_successful(self) -> bool:
-        return spacy_wrapper.successful_import
+        # importing spaCy takes seconds, so it's left to get_nlp, which
+        # is usually called by the warm-up or recalc background threads
+        return spacy_wrapper.is_spacy_installed()
+
+    def warm_up(self) -> None:
+        spacy_wrapper.get_nlp(self.spacy_model, lemma_only=self.lemma_only)
 
     def get_description(self) -> str:
+        if self.lemma_only:
+            return f"spaCy: {self.spacy_model} (lemma only)"
         return f"spaCy: {self.spacy_model}"
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-import functools
+import importlib.util
+import multiprocessing
 import os.path
 import shutil
 import subprocess
 import sys
+from importlib.metadata import entry_points
 from pathlib import Path
 from types import ModuleType
 from typing import Any
@@ -13,6 +15,8 @@ from anki.utils import is_win
 from aqt import mw
 from aqt.package import venv_binary
 
+from .. import cache_registry
+
 # pylint: disable=invalid-name
 
 updated_python_path: bool = False
@@ -87,18 +91,73 @@ LANGUAGE_PIPE_CONFIGS: dict[str, set[str]] = {
 }
 
 
-def load_spacy_modules() -> None:
-    # We load the spacy modules in this complicated way to maintain at least
-    # some form of static type checking, and to minimize error checking
-    # and exception handling
-
+################################################################
+#                          BATCHING
+################################################################
+# nlp.pipe processes the texts in batches of 1000 by default,
+# which is fine for short sentences, but long texts make the
+# batches use a lot of memory. When the batch size is automatic
+# we instead aim for roughly the same number of characters per
+# batch.
+################################################################
+_TARGET_CHARACTERS_PER_BATCH = 50_000
+_MIN_BATCH_SIZE = 16
+_MAX_BATCH_SIZE = 5000
+
+# Starting a process and loading the model in it takes a couple of
+# seconds, so extra processes are only used for large amounts of text.
+_MIN_TEXTS_PER_PROCESS = 5000
+
+
+def get_batch_size(configured_batch_size: int, texts: list[str]) -> int:
+    # a configured batch size of 0 means automatic
+    if configured_batch_size > 0:
+        return configured_batch_size
+
+    if not texts:
+        return _MIN_BATCH_SIZE
+
+    average_length: float = max(1.0, sum(map(len, texts)) / len(texts))
+    batch_size = int(_TARGET_CHARACTERS_PER_BATCH / average_length)
+    return min(max(batch_size, _MIN_BATCH_SIZE), _MAX_BATCH_SIZE)
+
+
+def get_n_process(configured_n_process: int, num_texts: int) -> int:
+    # spaCy uses multiprocessing, which has to start new python interpreters
+    # that re-import '__main__' unless processes are forked. In Anki '__main__'
+    # is Anki itself, so we only use multiple processes when they are forked,
+    # i.e. on Linux.
+    if multiprocessing.get_start_method() != "fork":
+        return 1
+
+    return max(1, min(configured_n_process, num_texts // _MIN_TEXTS_PER_PROCESS))
+
+
+def get_num_texts_needed_for_n_process(configured_n_process: int) -> int:
+    # the number of texts after which more texts would not change get_n_process
+    if configured_n_process <= 1 or multiprocessing.get_start_method() != "fork":
+        return 0
+    return configured_n_process * _MIN_TEXTS_PER_PROCESS
+
+
+# Every component that could be in a model, i.e. everything
+# except the tokenizer. Names that are not in a model are ignored.
+_ALL_PIPES: list[str] = [
+    "tok2vec",
+    "transformer",
+    "tagger",
+    "morphologizer",
+    "parser",
+    "lemmatizer",
+    "trainable_lemmatizer",
+    "senter",
+    "attribute_ruler",
+    "ner",
+]
+
+
+def _add_spacy_venv_to_python_path() -> None:
     global updated_python_path
-    global successful_import
-    global _spacy
-    global _SpacyLanguage
-    global _SpacyTokenizer
-    global _SpacyDoc
-    global _spacy_utils
 
     # dev environments should already have spaCy, so this can be skipped
     if not updated_python_path and not testing_environment:
@@ -120,6 +179,30 @@ def load_spacy_modules() -> None:
         sys.path.append(spacy_site_packages_path)
         updated_python_path = True
 
+
+def is_spacy_installed() -> bool:
+    # find_spec only looks for the package, importing spaCy takes seconds
+    _add_spacy_venv_to_python_path()
+    return importlib.util.find_spec("spacy") is not None
+
+
+def load_spacy_modules() -> None:
+    # We load the spacy modules in this complicated way to maintain at least
+    # some form of static type checking, and to minimize error checking
+    # and exception handling
+
+    global successful_import
+    global _spacy
+    global _SpacyLanguage
+    global _SpacyTokenizer
+    global _SpacyDoc
+    global _spacy_utils
+
+    if successful_import:
+        return
+
+    _add_spacy_venv_to_python_path()
+
     try:
         # pylint:disable=import-outside-toplevel
 
@@ -145,11 +228,29 @@ def load_spacy_modules() -> None:
 
 
 def get_installed_models() -> list[str]:
-    if not successful_import:
+    # spaCy models register themselves as 'spacy_models' entry points, which is
+    # also how spacy.util.get_installed_models finds them. Reading the package
+    # metadata directly means we don't have to import spaCy.
+    if not is_spacy_installed():
         return []
 
-    assert _spacy_utils is not None
-    return [f"{model_name}" for model_name in _spacy_utils.get_installed_models()]
+    return [entry_point.name for entry_point in entry_points(group="spacy_models")]
+
+
+def supports_lemma_only(spacy_model_name: str) -> bool:
+    # The lemma only mode skips all the neural components, so the lemmas have to come
+    # from a lookup table in the (optional) 'spacy-lookups-data' package instead.
+    # Chinese does not have lemmas, so it only needs the tokenizer.
+    lang: str = spacy_model_name.split("_")[0]  # e.g. en_core_web_sm -> en
+    if lang == "zh":
+        return True
+
+    # The tables are registered as 'spacy_lookups' entry points, loading them
+    # only imports the small 'spacy_lookups_data' package, not the tables.
+    for entry_point in entry_points(group="spacy_lookups", name=lang):
+        tables: dict[str, Any] = entry_point.load()
+        return "lemma_lookup" in tables
+    return False
 
 
 def _get_am_spacy_venv_python() -> str:
@@ -202,9 +303,18 @@ def create_spacy_venv() -> None:
         check=True,
     )
 
-    # six is necessary for some models
+    # six is necessary for some models, and 'lookups' installs the lemma lookup
+    # tables (spacy-lookups-data) used by the lemma only morphemizers
     subprocess.run(
-        [spacy_venv_python, "-m", "pip", "install", "--upgrade", "spacy", "six"],
+        [
+            spacy_venv_python,
+            "-m",
+            "pip",
+            "install",
+            "--upgrade",
+            "spacy[lookups]",
+            "six",
+        ],
         check=True,
     )
 
@@ -247,11 +357,29 @@ def uninstall_model(model_name: str) -> None:
     )
 
 
-# the cache needs to have a max size to maintain garbage collection
-@functools.lru_cache(maxsize=131072)
-def get_nlp(spacy_model_name: str):  # type: ignore[no-untyped-def] # pylint:disable=too-many-branches, too-many-statements
+def _get_nlp_size_in_bytes(nlp: Any) -> int:
+    # The memory used by a model is impractical to measure directly,
+    # so we use its size on disk as an approximation instead.
+    model_path: Path | None = getattr(nlp, "path", None)
+    if model_path is None:
+        return 0
+    return sum(
+        _file.stat().st_size for _file in Path(model_path).rglob("*") if _file.is_file()
+    )
+
+
+@cache_registry.bounded_cache(
+    name="spacy models",
+    max_bytes=2 * 1024 * 1024 * 1024,
+    clear_on={cache_registry.ClearOn.PROFILE_CHANGE},
+    get_size=_get_nlp_size_in_bytes,
+)
+def get_nlp(spacy_model_name: str, lemma_only: bool = False):  # type: ignore[no-untyped-def] # pylint:disable=too-many-branches, too-many-statements
     # -> Optional[spacy.Language]
 
+    # spaCy is only imported when a model is actually used
+    load_spacy_modules()
+
     if not successful_import:
         return None
 
@@ -280,15 +408,24 @@ def get_nlp(spacy_model_name: str):  # type: ignore[no-untyped-def] # pylint:dis
     #     "ner",
     # }
 
-    nlp = _spacy.load(spacy_model_name)
+    if lemma_only:
+        # Only the tokenizer of the model is loaded, and the lemmas are looked up
+        # in a table instead, see 'supports_lemma_only'. This is a lot faster, but
+        # the lemmas are worse since the context of the words is not considered,
+        # and there are no part of speech tags.
+        nlp = _spacy.load(spacy_model_name, exclude=_ALL_PIPES)
+        if nlp.lang != "zh":
+            nlp.add_pipe("lemmatizer", config={"mode": "lookup"}).initialize()
+    else:
+        nlp = _spacy.load(spacy_model_name)
 
-    # Get the enabled pipes based on language, default to an empty set if not defined
-    enabled_pipes = LANGUAGE_PIPE_CONFIGS.get(nlp.lang, set())
+        # Get the enabled pipes based on language, default to an empty set if not defined
+        enabled_pipes = LANGUAGE_PIPE_CONFIGS.get(nlp.lang, set())
 
-    # Disable all other pipes that are not explicitly enabled
-    for pipe in nlp.component_names:
-        if pipe not in enabled_pipes:
-            nlp.disable_pipe(pipe)
+        # Disable all other pipes that are not explicitly enabled
+        for pipe in nlp.component_names:
+            if pipe not in enabled_pipes:
+                nlp.disable_pipe(pipe)
 
     ################################################################
     #                        CUSTOM PIPES
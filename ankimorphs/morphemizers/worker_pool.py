@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Generic, Protocol, TypeVar
+
+
+class Worker(Protocol):
+    def is_alive(self) -> bool: ...
+
+    def terminate(self) -> None: ...
+
+
+_W = TypeVar("_W", bound=Worker)
+
+
+class WorkerPool(Generic[_W]):
+    """
+    Workers are checked out for the duration of an interaction and returned afterward.
+    New workers are spawned lazily up to the max size, and dead workers are replaced
+    the next time they are checked out.
+    """
+
+    __slots__ = (
+        "max_size",
+        "_create_worker",
+        "_idle_workers",
+        "_num_checked_out",
+        "_condition",
+    )
+
+    def __init__(self, max_size: int, create_worker: Callable[[], _W]) -> None:
+        self.max_size = max_size
+        self._create_worker = create_worker
+        self._idle_workers: list[_W] = []
+        self._num_checked_out = 0
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def checkout(self) -> Iterator[_W]:
+        with self._condition:
+            while not self._idle_workers and self._num_checked_out >= self.max_size:
+                self._condition.wait()
+            self._num_checked_out += 1
+            worker = self._idle_workers.pop() if self._idle_workers else None
+
+        try:
+            if worker is None or not worker.is_alive():
+                if worker is not None:
+                    worker.terminate()
+                worker = self._create_worker()
+            yield worker
+        finally:
+            with self._condition:
+                self._num_checked_out -= 1
+                if worker is not None and worker.is_alive():
+                    self._idle_workers.append(worker)
+                self._condition.notify()
+
+    def terminate_idle_workers(self) -> None:
+        with self._condition:
+            idle_workers = self._idle_workers
+            self._idle_workers = []
+        for worker in idle_workers:
+            worker.terminate()
@@ -1,9 +1,10 @@
-import functools
 import os
 
 from aqt import mw
 
-from . import ankimorphs_globals
+from . import ankimorphs_globals, cache_registry
+
+_NAMES_CACHE_NAME = "names file"
 
 
 def add_name_to_file(selected_text: str) -> None:
@@ -20,10 +21,14 @@ def add_name_to_file(selected_text: str) -> None:
             file.write("\n" + name)
 
     # clear the cache so the new name(s) are included
-    get_names_from_file.cache_clear()
+    cache_registry.get_cache(_NAMES_CACHE_NAME).clear()
 
 
-@functools.cache
+@cache_registry.bounded_cache(
+    name=_NAMES_CACHE_NAME,
+    max_bytes=16 * 1024 * 1024,
+    clear_on={cache_registry.ClearOn.PROFILE_CHANGE},
+)
 def get_names_from_file() -> set[str]:
     assert mw is not None
 
@@ -25,6 +25,19 @@ def background_update_progress_potentially_cancel(
         )
 
 
+def background_update_progress_value(label: str, value: int, max_value: int) -> None:
+    assert mw is not None
+
+    mw.taskman.run_on_main(
+        partial(
+            mw.progress.update,
+            label=label,
+            value=value,
+            max=max_value,
+        )
+    )
+
+
 def background_update_progress(label: str) -> None:
     assert mw is not None
 
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from ..ankimorphs_db import AnkiMorphsDB
 from ..exceptions import InvalidBinsException
+from ..morph_status_snapshot import MorphStatusSnapshot, get_morph_status_snapshot
 
 
 class Bins:
@@ -94,14 +95,7 @@ def get_progress_reports(
     only_lemma_priorities: bool,
 ) -> list[ProgressReport]:
     reports = []
-
-    # This function could be cleaner if the learning status dictionaries were
-    # keyed like the morph_priority dictionaries.
-    morph_learning_statuses: dict[str, str]
-    if only_lemma_priorities:
-        morph_learning_statuses = am_db.get_morph_lemmas_learning_statuses()
-    else:
-        morph_learning_statuses = am_db.get_morph_inflections_learning_statuses()
+    morph_status_snapshot = get_morph_status_snapshot(am_db)
 
     for min_priority, max_priority in bins.indexes:
 
@@ -112,15 +106,9 @@ def get_progress_reports(
 
         for morph in morph_priorities_subset:
 
-            learning_status_key = morph[0] + morph[1]
-            if only_lemma_priorities:
-                learning_status_key = morph[0]  # expect morph=(lemma,lemma)
-
-            morph_status = "missing"
-            if (
-                learning_status_key in morph_learning_statuses
-            ):  # if the morph is in the database
-                morph_status = morph_learning_statuses[learning_status_key]
+            morph_status = _get_morph_status(
+                morph_status_snapshot, morph, only_lemma_priorities
+            )
             _update_progress_report(report, morph, morph_status)
 
         reports.append(report)
@@ -150,23 +138,13 @@ def get_priority_ordered_morph_statuses(
         )
     )
 
-    morph_learning_statuses: dict[str, str]
-    if only_lemma_priorities:
-        morph_learning_statuses = am_db.get_morph_lemmas_learning_statuses()
-    else:
-        morph_learning_statuses = am_db.get_morph_inflections_learning_statuses()
+    morph_status_snapshot = get_morph_status_snapshot(am_db)
 
     for morph in sorted_morph_priorities:
         priority = sorted_morph_priorities[morph]
-        learning_status_key = morph[0] + morph[1]
-        if only_lemma_priorities:
-            learning_status_key = morph[0]  # expect morph=(lemma,lemma)
-
-        morph_status = "missing"
-        if (
-            learning_status_key in morph_learning_statuses
-        ):  # if the morph is in the database
-            morph_status = morph_learning_statuses[learning_status_key]
+        morph_status = _get_morph_status(
+            morph_status_snapshot, morph, only_lemma_priorities
+        )
 
         if only_lemma_priorities:
             morph_statuses.append((priority, morph[0], "-", morph_status))
@@ -176,6 +154,23 @@ def get_priority_ordered_morph_statuses(
     return morph_statuses
 
 
+def _get_morph_status(
+    morph_status_snapshot: MorphStatusSnapshot,
+    morph: tuple[str, str],
+    only_lemma_priorities: bool,
+) -> str:
+    morph_status: str | None
+    if only_lemma_priorities:
+        # expect morph=(lemma,lemma)
+        morph_status = morph_status_snapshot.get_lemma_status(morph[0])
+    else:
+        morph_status = morph_status_snapshot.get_inflection_status(morph[0], morph[1])
+
+    if morph_status is None:  # the morph is not in the database
+        return "missing"
+    return morph_status
+
+
 def _get_morph_priorities_subset(
     morph_priorities: dict[tuple[str, str], int], min_priority: int, max_priority: int
 ) -> dict[tuple[str, str], int]:
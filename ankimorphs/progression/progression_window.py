@@ -243,7 +243,6 @@ class ProgressionWindow(QMainWindow):  # pylint:disable=too-many-instance-attrib
         )
 
         if mw.progress.want_cancel():
-            am_db.con.close()
             raise CancelledOperationException
 
         mw.taskman.run_on_main(
@@ -256,8 +255,6 @@ class ProgressionWindow(QMainWindow):  # pylint:disable=too-many-instance-attrib
             am_db, bins, morph_priorities, self._is_lemma_priority_selected()
         )
 
-        am_db.con.close()
-
         if mw.progress.want_cancel():
             raise CancelledOperationException
 
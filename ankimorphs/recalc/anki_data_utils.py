@@ -5,18 +5,25 @@ the convenience/safety of accessing properties of an object.
 
 from __future__ import annotations
 
-from collections.abc import Sequence
+import os
+from collections import deque
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
 from typing import Any
 
 import anki.utils
 from anki.cards import CardId
 from anki.models import ModelManager, NotetypeDict, NotetypeId
-from anki.tags import TagManager
 from aqt import mw
 
 from ..ankimorphs_config import AnkiMorphsConfig, AnkiMorphsConfigFilter
 from ..morpheme import Morpheme
 
+# the number of rows a worker turns into card data at a time
+EXTRACTION_PAGE_SIZE = 1000
+NUM_EXTRACTION_WORKERS = max(1, min(4, (os.cpu_count() or 1) - 1))
+
 
 class AnkiDBRowData:
     __slots__ = (
@@ -60,52 +67,137 @@ class AnkiCardData:  # pylint:disable=too-many-instance-attributes
         "expression",
         "automatically_known_tag",
         "manually_known_tag",
-        "ready_tag",
-        "not_ready_tag",
         "tags",
         "note_id",
         "note_type_id",
         "morphs",
     )
 
-    def __init__(  # pylint:disable=too-many-arguments
+    def __init__(
         self,
-        am_config: AnkiMorphsConfig,
-        tag_manager: TagManager,
-        note_type_id: NotetypeId,
-        expression_field_index: int,
+        extractor: AnkiCardDataExtractor,
         anki_row_data: AnkiDBRowData,
     ) -> None:
         fields_list = anki.utils.split_fields(anki_row_data.note_fields)
-        expression_field = fields_list[expression_field_index]
+        expression_field = fields_list[extractor.expression_field_index]
         expression = anki.utils.strip_html(
             # this prevents morphs accidentally merging
             expression_field.replace("<br>", "\n")
         )
 
-        tags_list = tag_manager.split(anki_row_data.note_tags)
-
-        automatically_known_tag = am_config.tag_known_automatically in tags_list
-        manually_known_tag = am_config.tag_known_manually in tags_list
-        ready_tag = am_config.tag_ready in tags_list
-        not_ready_tag = am_config.tag_not_ready in tags_list
+        # same as TagManager.split, but as a set
+        tags_set = set(anki_row_data.note_tags.replace("\u3000", " ").split(" "))
+        tags_set.discard("")
 
         self.interval = anki_row_data.card_interval
         self.stability = anki_row_data.card_stability
         self.type = anki_row_data.card_type
         self.expression = expression
-        self.automatically_known_tag = automatically_known_tag
-        self.manually_known_tag = manually_known_tag
-        self.ready_tag = ready_tag
-        self.not_ready_tag = not_ready_tag
+        self.automatically_known_tag = extractor.tag_known_automatically in tags_set
+        self.manually_known_tag = extractor.tag_known_manually in tags_set
         self.tags = anki_row_data.note_tags
         self.note_id = anki_row_data.note_id
-        self.note_type_id = note_type_id
+        self.note_type_id = extractor.note_type_id
 
         # this is set later in the caching process
         self.morphs: set[Morpheme] | None = None
 
 
+class AnkiCardDataExtractor:  # pylint:disable=too-many-instance-attributes
+    """
+    Queries the cards of a note filter, and turns the rows into AnkiCardData
+    in pages on a pool of threads, so the next pages are extracted while the
+    morphemizer is busy with the previous ones.
+    """
+
+    __slots__ = (
+        "note_type_id",
+        "expression_field_index",
+        "tag_known_automatically",
+        "tag_known_manually",
+        "anki_db_rows",
+    )
+
+    def __init__(
+        self,
+        am_config: AnkiMorphsConfig,
+        config_filter: AnkiMorphsConfigFilter,
+    ) -> None:
+        assert mw is not None
+        assert mw.col is not None
+
+        model_manager: ModelManager = mw.col.models
+
+        # we can assume everything exists and works at this point since we checked for that earlier
+        note_type_id: NotetypeId | None = model_manager.id_for_name(
+            config_filter.note_type
+        )
+        assert note_type_id is not None
+        note_type_dict: NotetypeDict | None = model_manager.get(note_type_id)
+        assert note_type_dict is not None
+        existing_field_names: list[str] = model_manager.field_names(note_type_dict)
+
+        self.note_type_id: NotetypeId = note_type_id
+        self.expression_field_index: int = existing_field_names.index(
+            config_filter.field
+        )
+
+        # the config is read once here instead of for every card
+        self.tag_known_automatically: str = am_config.tag_known_automatically
+        self.tag_known_manually: str = am_config.tag_known_manually
+
+        self.anki_db_rows: list[Sequence[Any]] = _get_anki_data(
+            am_config, note_type_id, config_filter.tags
+        )
+
+    def __len__(self) -> int:
+        return len(self.anki_db_rows)
+
+    def extract(self) -> Iterator[tuple[int, AnkiCardData]]:
+        # yields the card ids and card data in the same order as the rows
+        pages: Iterator[Sequence[Sequence[Any]]] = (
+            self.anki_db_rows[start : start + EXTRACTION_PAGE_SIZE]
+            for start in range(0, len(self.anki_db_rows), EXTRACTION_PAGE_SIZE)
+        )
+
+        if len(self.anki_db_rows) <= EXTRACTION_PAGE_SIZE:
+            for page in pages:
+                yield from self._extract_page(page)
+            return
+
+        # Only a few pages are extracted ahead of the consumer (the morphemizer),
+        # otherwise the card data of all the pages would be built up front,
+        # no matter how fast it is consumed.
+        max_pages_in_flight: int = NUM_EXTRACTION_WORKERS * 2
+        executor = ThreadPoolExecutor(
+            max_workers=NUM_EXTRACTION_WORKERS, thread_name_prefix="extraction"
+        )
+        try:
+            pages_in_flight: deque[Future[list[tuple[int, AnkiCardData]]]] = deque(
+                executor.submit(self._extract_page, page)
+                for page in islice(pages, max_pages_in_flight)
+            )
+            while pages_in_flight:
+                page_card_data = pages_in_flight.popleft().result()
+                next_page: Sequence[Sequence[Any]] | None = next(pages, None)
+                if next_page is not None:
+                    pages_in_flight.append(
+                        executor.submit(self._extract_page, next_page)
+                    )
+                yield from page_card_data
+        finally:
+            # the consumer can stop early, e.g. when recalc is cancelled
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _extract_page(
+        self, anki_db_rows: Sequence[Sequence[Any]]
+    ) -> list[tuple[int, AnkiCardData]]:
+        return [
+            (anki_row_data.card_id, AnkiCardData(self, anki_row_data))
+            for anki_row_data in map(AnkiDBRowData, anki_db_rows)
+        ]
+
+
 class AnkiMorphsCardData:
     """
     This is used when extracting data from the AnkiMorphsDB
@@ -136,42 +228,9 @@ class AnkiMorphsCardData:
         self.tags: str = data_row[4]
 
 
-def create_card_data_dict(
-    am_config: AnkiMorphsConfig,
-    config_filter: AnkiMorphsConfigFilter,
-) -> dict[int, AnkiCardData]:
-    assert mw is not None
-    assert mw.col is not None
-
-    model_manager: ModelManager = mw.col.models
-    tag_manager = TagManager(mw.col)
-    tags: dict[str, str] = config_filter.tags
-    card_data_dict: dict[int, AnkiCardData] = {}
-
-    # we can assume everything exists and works at this point since we checked for that earlier
-    note_type_id: NotetypeId | None = mw.col.models.id_for_name(config_filter.note_type)
-    assert note_type_id is not None
-    note_type_dict: NotetypeDict | None = mw.col.models.get(note_type_id)
-    assert note_type_dict is not None
-    existing_field_names: list[str] = model_manager.field_names(note_type_dict)
-    field_index: int = existing_field_names.index(config_filter.field)
-
-    for anki_row_data in _get_anki_data(am_config, note_type_id, tags).values():
-        card_data = AnkiCardData(
-            am_config=am_config,
-            tag_manager=tag_manager,
-            note_type_id=note_type_id,
-            expression_field_index=field_index,
-            anki_row_data=anki_row_data,
-        )
-        card_data_dict[anki_row_data.card_id] = card_data
-
-    return card_data_dict
-
-
 def _get_anki_data(
     am_config: AnkiMorphsConfig, model_id: NotetypeId, tags_object: dict[str, str]
-) -> dict[int, AnkiDBRowData]:
+) -> list[Sequence[Any]]:
     ################################################################
     #                        SQL QUERY
     ################################################################
@@ -212,7 +271,7 @@ def _get_anki_data(
             [f" AND notes.tags LIKE '% {_tag} %'" for _tag in included_tags]
         )
 
-    result: list[Sequence[Any]] = mw.col.db.all(
+    return mw.col.db.all(
         """
         SELECT cards.id, cards.ivl, COALESCE(json_extract(cards.data, '$.s'), 0.0), cards.type, cards.queue, notes.id, notes.flds, notes.tags
         FROM cards
@@ -221,10 +280,3 @@ def _get_anki_data(
         """
         + f"WHERE notes.mid = {model_id}{ignore_suspended_cards}{tags_search_string}",
     )
-
-    anki_db_row_data_dict: dict[int, AnkiDBRowData] = {}
-
-    for anki_data in map(AnkiDBRowData, result):
-        anki_db_row_data_dict[anki_data.card_id] = anki_data
-
-    return anki_db_row_data_dict
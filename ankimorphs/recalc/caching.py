@@ -2,18 +2,20 @@ from __future__ import annotations
 
 import csv
 import math
+from collections.abc import Iterator
+from functools import partial
 from pathlib import Path
 from typing import Any
 
 from aqt import mw
 
 from .. import ankimorphs_globals as am_globals
-from .. import progress_utils
+from .. import morph_status_snapshot, progress_utils
 from ..ankimorphs_config import AnkiMorphsConfig, AnkiMorphsConfigFilter
 from ..ankimorphs_db import AnkiMorphsDB
 from ..exceptions import CancelledOperationException, KnownMorphsFileMalformedException
 from ..morphemizers import morphemizer_utils
-from ..text_preprocessing import get_processed_text
+from ..text_preprocessing import TextPreprocessor, get_text_preprocessor
 from . import anki_data_utils
 from .anki_data_utils import AnkiCardData
 
@@ -32,58 +34,72 @@ def cache_anki_data(  # pylint:disable=too-many-locals, too-many-branches, too-m
 
     assert mw is not None
 
-    # Rebuilding the entire ankimorphs db every time is faster and much simpler than
-    # updating it since we can bulk queries to the anki db.
-    am_db = AnkiMorphsDB()
-    am_db.drop_all_tables()
-    am_db.create_all_tables()
-
     # These lists contain data that will be inserted into ankimorphs.db
     card_table_data: list[dict[str, Any]] = []
     morph_table_data: list[dict[str, Any]] = []
     card_morph_map_table_data: list[dict[str, Any]] = []
 
-    # We only want to cache the morphs on the note-filters that have 'read' enabled
-    for config_filter in read_enabled_config_filters:
-        cards_data_dict: dict[int, AnkiCardData] = (
-            anki_data_utils.create_card_data_dict(
-                am_config,
-                config_filter,
+    text_preprocessor: TextPreprocessor = get_text_preprocessor(am_config)
+
+    # The card data of each note filter, in the same order as the filters
+    cards_data_dicts: list[dict[int, AnkiCardData]] = [
+        {} for _ in read_enabled_config_filters
+    ]
+
+    # We only want to cache the morphs on the note-filters that have 'read' enabled.
+    # The filters that use the same morphemizer are morphemized together, so small
+    # note types don't each pay for their own warm-up and partially filled batches.
+    for morphemizer_description, filter_indices in _group_filters_by_morphemizer(
+        read_enabled_config_filters
+    ).items():
+        card_data_extractors: dict[int, anki_data_utils.AnkiCardDataExtractor] = {
+            filter_index: anki_data_utils.AnkiCardDataExtractor(
+                am_config, read_enabled_config_filters[filter_index]
             )
+            for filter_index in filter_indices
+        }
+        card_amount = sum(map(len, card_data_extractors.values()))
+        note_types: str = ", ".join(
+            read_enabled_config_filters[filter_index].note_type
+            for filter_index in filter_indices
         )
-        card_amount = len(cards_data_dict)
 
-        # Batching the text makes spacy much faster, so we flatten the data into the all_text list.
-        # To get back to the card_id for every entry in the all_text list, we create a separate list with the keys.
-        # These two lists have to be synchronized, i.e., the indexes align, that way they can be used for lookup later.
-        all_text: list[str] = []
-        all_keys: list[int] = []
-
-        for key, _card_data in cards_data_dict.items():
-            # Some spaCy models label all capitalized words as proper nouns,
-            # which is pretty bad. To prevent this, we lower case everything.
-            # This in turn makes some models not label proper nouns correctly,
-            # but this is preferable because we also have the 'Mark as Name'
-            # feature that can be used in that case.
-            expression = get_processed_text(am_config, _card_data.expression.lower())
-            all_text.append(expression)
-            all_keys.append(key)
+        # Batching the text makes spacy much faster, so the texts are streamed
+        # through the morphemizer in chunks instead of one at a time. The cards
+        # are extracted in pages while the morphemizer works on the previous
+        # ones, and the filter indices and card ids are passed along with the
+        # texts so the morphs can be matched back up with their card.
+        #
+        # Some spaCy models label all capitalized words as proper nouns,
+        # which is pretty bad. To prevent this, we lower case everything.
+        # This in turn makes some models not label proper nouns correctly,
+        # but this is preferable because we also have the 'Mark as Name'
+        # feature that can be used in that case.
+        keys_and_texts: Iterator[tuple[tuple[int, int], str]] = _get_keys_and_texts(
+            card_data_extractors, cards_data_dicts, text_preprocessor
+        )
 
         morphemizer = morphemizer_utils.get_morphemizer_by_description(
-            config_filter.morphemizer_description
+            morphemizer_description
         )
         assert morphemizer is not None
 
-        for index, processed_morphs in enumerate(
-            morphemizer.get_processed_morphs(am_config, all_text)
+        for key, processed_morphs in morphemizer.get_processed_morphs_in_chunks(
+            am_config,
+            keys_and_texts,
+            on_progress=partial(_update_extraction_progress, note_types, card_amount),
+            should_cancel=mw.progress.want_cancel,
         ):
-            progress_utils.background_update_progress_potentially_cancel(
-                label=f"Extracting morphs from<br>{config_filter.note_type} cards<br>card: {index} of {card_amount}",
-                counter=index,
-                max_value=card_amount,
-            )
-            key = all_keys[index]
-            cards_data_dict[key].morphs = set(processed_morphs)
+            filter_index, card_id = key
+            cards_data_dicts[filter_index][card_id].morphs = set(processed_morphs)
+
+    # The cards are added in the order of the filters, since only the
+    # first filter that matches a card is used, see the 'INSERT OR IGNORE'
+    # in AnkiMorphsDB.insert_many_into_card_table
+    for config_filter, cards_data_dict in zip(
+        read_enabled_config_filters, cards_data_dicts
+    ):
+        card_amount = len(cards_data_dict)
 
         for counter, card_id in enumerate(cards_data_dict):
             progress_utils.background_update_progress_potentially_cancel(
@@ -132,11 +148,53 @@ def cache_anki_data(  # pylint:disable=too-many-locals, too-many-branches, too-m
     _update_learning_intervals(am_config, morph_table_data)
 
     progress_utils.background_update_progress(label="Saving to ankimorphs.db")
-    am_db.insert_many_into_morph_table(morph_table_data)
-    am_db.insert_many_into_card_table(card_table_data)
-    am_db.insert_many_into_card_morph_map_table(card_morph_map_table_data)
-    # am_db.print_table("Morphs")
-    am_db.con.close()
+    # Rebuilding the entire ankimorphs db every time is faster and much simpler than
+    # updating it since we can bulk queries to the anki db. The old tables stay
+    # readable until the rebuilt ones are swapped in, see AnkiMorphsDB.rebuild
+    with AnkiMorphsDB().rebuild() as am_db:
+        am_db.insert_many_into_morph_table(morph_table_data)
+        am_db.insert_many_into_card_table(card_table_data)
+        am_db.insert_many_into_card_morph_map_table(card_morph_map_table_data)
+        # am_db.print_table("Morphs")
+
+    morph_status_snapshot.rebuild_snapshot()
+
+
+def _group_filters_by_morphemizer(
+    config_filters: list[AnkiMorphsConfigFilter],
+) -> dict[str, list[int]]:
+    # morphemizer description -> indices of the filters that use it
+    filter_indices_by_morphemizer: dict[str, list[int]] = {}
+    for filter_index, config_filter in enumerate(config_filters):
+        filter_indices_by_morphemizer.setdefault(
+            config_filter.morphemizer_description, []
+        ).append(filter_index)
+    return filter_indices_by_morphemizer
+
+
+def _get_keys_and_texts(
+    card_data_extractors: dict[int, anki_data_utils.AnkiCardDataExtractor],
+    cards_data_dicts: list[dict[int, AnkiCardData]],
+    text_preprocessor: TextPreprocessor,
+) -> Iterator[tuple[tuple[int, int], str]]:
+    # the card data is collected as it comes out of the extraction stage
+    for filter_index, card_data_extractor in card_data_extractors.items():
+        cards_data_dict: dict[int, AnkiCardData] = cards_data_dicts[filter_index]
+        for card_id, card_data in card_data_extractor.extract():
+            cards_data_dict[card_id] = card_data
+            yield (filter_index, card_id), text_preprocessor.process(
+                card_data.expression.lower()
+            )
+
+
+def _update_extraction_progress(
+    note_type: str, card_amount: int, num_processed: int
+) -> None:
+    progress_utils.background_update_progress_value(
+        label=f"Extracting morphs from<br>{note_type} cards<br>card: {num_processed} of {card_amount}",
+        value=num_processed,
+        max_value=card_amount,
+    )
 
 
 def _get_card_memory_strength(
@@ -14,6 +14,7 @@ from aqt.utils import tooltip
 from .. import (
     ankimorphs_config,
     ankimorphs_globals,
+    cache_registry,
     message_box_utils,
     progress_utils,
     tags_and_queue_utils,
@@ -32,11 +33,12 @@ from ..exceptions import (
 )
 from ..morph_priority_utils import get_morph_priority
 from ..morpheme import Morpheme
-from ..morphemizers import morphemizer_utils
+from ..morphemizers import long_text_guard, morphemizer_utils
 from . import caching, extra_field_utils
 from .anki_data_utils import AnkiMorphsCardData
 from .card_morphs_metrics import CardMorphsMetrics
 from .card_score import _MAX_SCORE, CardScore
+from .stable_due import get_stable_dues
 
 
 def recalc() -> None:
@@ -84,7 +86,7 @@ def recalc() -> None:
         op=lambda _: _recalc_background_op(
             read_enabled_config_filters, modify_enabled_config_filters
         ),
-        success=lambda _: _on_success(_start_time),
+        success=lambda changed_cards: _on_success(_start_time, changed_cards),
     )
     operation.failure(_on_failure)
     operation.with_progress().run_in_background()
@@ -130,7 +132,9 @@ def _check_selected_settings_for_errors(
         morphemizer_found = morphemizer_utils.get_morphemizer_by_description(
             config_filter.morphemizer_description
         )
-        if morphemizer_found is None:
+        # the backends are only initialized when they are first used,
+        # so this is where we find out if they actually work
+        if morphemizer_found is None or not morphemizer_found.init_successful():
             return MorphemizerNotFoundException(config_filter.morphemizer_description)
 
         if (
@@ -151,16 +155,18 @@ def _check_selected_settings_for_errors(
 def _recalc_background_op(
     read_enabled_config_filters: list[AnkiMorphsConfigFilter],
     modify_enabled_config_filters: list[AnkiMorphsConfigFilter],
-) -> None:
+) -> int:
     am_config = AnkiMorphsConfig()
+    long_text_guard.reset_slowest_texts()
     caching.cache_anki_data(am_config, read_enabled_config_filters)
-    _update_cards_and_notes(am_config, modify_enabled_config_filters)
+    return _update_cards_and_notes(am_config, modify_enabled_config_filters)
 
 
 def _update_cards_and_notes(  # pylint:disable=too-many-locals, too-many-statements, too-many-branches
     am_config: AnkiMorphsConfig,
     modify_enabled_config_filters: list[AnkiMorphsConfigFilter],
-) -> None:
+) -> int:
+    # returns the number of cards that were changed
     assert mw is not None
     assert mw.col.db is not None
     assert mw.progress is not None
@@ -171,10 +177,10 @@ def _update_cards_and_notes(  # pylint:disable=too-many-locals, too-many-stateme
     handled_cards: dict[CardId, None] = {}  # we only care about the key lookup
     modified_cards: dict[CardId, Card] = {}
     modified_notes: list[Note] = []
+    new_cards_original_due_and_queue: dict[CardId, tuple[int, int]] = {}
 
     # clear relevant caches between recalcs
-    am_db.get_morph_priorities_from_collection.cache_clear()
-    Morpheme.get_learning_status.cache_clear()
+    cache_registry.clear_caches(cache_registry.ClearOn.RECALC)
 
     for config_filter in modify_enabled_config_filters:
         note_type_dict: NotetypeDict = (
@@ -227,6 +233,10 @@ def _update_cards_and_notes(  # pylint:disable=too-many-locals, too-many-stateme
             )
 
             if card.type == CARD_TYPE_NEW:
+                new_cards_original_due_and_queue[card_id] = (
+                    original_due,
+                    original_queue,
+                )
                 score_values = CardScore(am_config, cards_morph_metrics)
                 card.due = score_values.due
 
@@ -316,8 +326,6 @@ def _update_cards_and_notes(  # pylint:disable=too-many-locals, too-many-stateme
 
             handled_cards[card_id] = None  # this marks the card as handled
 
-    am_db.con.close()
-
     if am_config.recalc_offset_new_cards:
         modified_cards = _add_offsets_to_new_cards(
             am_config=am_config,
@@ -326,10 +334,18 @@ def _update_cards_and_notes(  # pylint:disable=too-many-locals, too-many-stateme
             handled_cards=handled_cards,
         )
 
+    if am_config.recalc_stable_due_order:
+        modified_cards = _apply_stable_due_order(
+            already_modified_cards=modified_cards,
+            new_cards_original_due_and_queue=new_cards_original_due_and_queue,
+        )
+
     progress_utils.background_update_progress(label="Inserting into Anki collection")
     mw.col.update_cards(list(modified_cards.values()))
     mw.col.update_notes(modified_notes)
 
+    return len(modified_cards)
+
 
 def _add_offsets_to_new_cards(
     am_config: AnkiMorphsConfig,
@@ -443,7 +459,51 @@ def _apply_offsets(
     return modified_offset_cards
 
 
-def _on_success(_start_time: float) -> None:
+def _apply_stable_due_order(
+    already_modified_cards: dict[CardId, Card],
+    new_cards_original_due_and_queue: dict[CardId, tuple[int, int]],
+) -> dict[CardId, Card]:
+    # The scores (and offsets) are only used to determine the relative order
+    # of the new cards, so the cards that are already in the right order keep
+    # their due, which prevents having to sync every new card after each recalc.
+    assert mw is not None
+
+    progress_utils.background_update_progress(label="Stabilizing due order")
+
+    original_dues: dict[CardId, int] = {}
+    target_dues: dict[CardId, int] = {}
+
+    for card_id, (original_due, _) in new_cards_original_due_and_queue.items():
+        original_dues[card_id] = original_due
+        if card_id in already_modified_cards:
+            target_dues[card_id] = already_modified_cards[card_id].due
+        else:
+            target_dues[card_id] = original_due
+
+    stable_dues: dict[CardId, int] = get_stable_dues(
+        target_dues=target_dues, original_dues=original_dues
+    )
+
+    for card_id, stable_due in stable_dues.items():
+        original_due, original_queue = new_cards_original_due_and_queue[card_id]
+
+        if card_id in already_modified_cards:
+            card = already_modified_cards[card_id]
+        elif stable_due != original_due:
+            card = mw.col.get_card(card_id)
+            already_modified_cards[card_id] = card
+        else:
+            continue
+
+        card.due = stable_due
+
+        if card.due == original_due and card.queue == original_queue:
+            del already_modified_cards[card_id]
+
+    return already_modified_cards
+
+
+def _on_success(_start_time: float, changed_cards: int) -> None:
     # This function runs on the main thread.
     assert mw is not None
     assert mw.progress is not None
@@ -451,9 +511,14 @@ def _on_success(_start_time: float) -> None:
     mw.toolbar.draw()  # updates stats
     mw.progress.finish()
 
-    tooltip("Finished Recalc", parent=mw)
+    tooltip(f"Finished Recalc<br>Changed cards: {changed_cards}", parent=mw)
     end_time: float = time.time()
     print(f"Recalc duration: {round(end_time - _start_time, 3)} seconds")
+    print(f"Recalc changed cards: {changed_cards}")
+
+    # fields this long are usually pasted by accident, so the user might want to fix them
+    for line in long_text_guard.get_slowest_texts_report():
+        print(line)
 
 
 def _on_failure(  # pylint:disable=too-many-branches
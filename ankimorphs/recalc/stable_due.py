@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+
+from anki.cards import CardId
+
+from .card_score import _MAX_SCORE
+
+####################################################################################
+#                                 STABLE DUE ORDER
+####################################################################################
+# Writing the scores directly into the 'due' of the cards means that tiny changes
+# to the priorities or intervals shift the due of almost every new card, and every
+# one of those cards then has to be synced.
+#
+# The scores are only really used to order the new cards, so instead we find the
+# longest sequence of cards that are already in the correct relative order and
+# let those keep their current due. The remaining cards are then slotted in
+# between them, as close to their score as possible.
+####################################################################################
+
+
+def get_stable_dues(
+    target_dues: dict[CardId, int],
+    original_dues: dict[CardId, int],
+) -> dict[CardId, int]:
+    # cards that should be moved to the end of the queue are not ordered
+    # amongst themselves, so they simply get the max due
+    stable_dues: dict[CardId, int] = {
+        card_id: _MAX_SCORE
+        for card_id, target_due in target_dues.items()
+        if target_due >= _MAX_SCORE
+    }
+
+    # original due and card id are used as tiebreakers to keep the
+    # existing order of cards that have the same score
+    ordered_cards: list[CardId] = sorted(
+        (card_id for card_id in target_dues if card_id not in stable_dues),
+        key=lambda _card_id: (
+            target_dues[_card_id],
+            original_dues[_card_id],
+            _card_id,
+        ),
+    )
+
+    kept_indices: set[int] = _get_longest_ordered_subsequence(
+        [original_dues[card_id] for card_id in ordered_cards]
+    )
+
+    cards_to_slot_in: list[CardId] = []
+    lower_due = 0
+
+    for index, card_id in enumerate(ordered_cards):
+        if index not in kept_indices:
+            cards_to_slot_in.append(card_id)
+            continue
+
+        upper_due = original_dues[card_id]
+        required_room = len(cards_to_slot_in) + 1 if cards_to_slot_in else 0
+
+        if upper_due - lower_due < required_room:
+            # there is not enough room between the neighbours,
+            # so this card has to be moved as well
+            cards_to_slot_in.append(card_id)
+            continue
+
+        stable_dues.update(
+            _slot_in_cards(cards_to_slot_in, lower_due, upper_due, target_dues)
+        )
+        cards_to_slot_in = []
+        stable_dues[card_id] = upper_due
+        lower_due = upper_due
+
+    stable_dues.update(
+        _slot_in_cards(cards_to_slot_in, lower_due, _MAX_SCORE, target_dues)
+    )
+
+    return stable_dues
+
+
+def _get_longest_ordered_subsequence(dues: list[int]) -> set[int]:
+    # Patience sorting, O(n log n). Equal dues are allowed next to each other
+    # since cards with the same score also get the same due.
+    tail_dues: list[int] = []
+    tail_indices: list[int] = []
+    previous_indices: list[int] = [-1] * len(dues)
+
+    for index, due in enumerate(dues):
+        if due >= _MAX_SCORE:
+            # these cards have previously been moved to the end of the queue
+            continue
+
+        length = bisect_right(tail_dues, due)
+
+        if length == len(tail_dues):
+            tail_dues.append(due)
+            tail_indices.append(index)
+        else:
+            tail_dues[length] = due
+            tail_indices[length] = index
+
+        if length > 0:
+            previous_indices[index] = tail_indices[length - 1]
+
+    subsequence_indices: set[int] = set()
+    index = tail_indices[-1] if tail_indices else -1
+
+    while index != -1:
+        subsequence_indices.add(index)
+        index = previous_indices[index]
+
+    return subsequence_indices
+
+
+def _slot_in_cards(
+    card_ids: list[CardId],
+    lower_due: int,
+    upper_due: int,
+    target_dues: dict[CardId, int],
+) -> dict[CardId, int]:
+    # Gives the cards strictly increasing dues between the (exclusive) bounds,
+    # staying as close to the target dues as possible while leaving enough room
+    # for the remaining cards.
+    slotted_dues: dict[CardId, int] = {}
+    previous_due = lower_due
+
+    for position, card_id in enumerate(card_ids):
+        highest_allowed_due = upper_due - (len(card_ids) - position)
+        due = min(max(target_dues[card_id], previous_due + 1), highest_allowed_due)
+        slotted_dues[card_id] = due
+        previous_due = due
+
+    return slotted_dues
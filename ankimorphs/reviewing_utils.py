@@ -136,8 +136,6 @@ def _get_next_card_background(
             mw.col.add_custom_undo_entry(ANKIMORPHS_CUSTOM_UNDO_STRING)
             undo_status = mw.col.undo_status()
 
-    am_db.con.close()
-
 
 def _get_valid_undo_status() -> UndoStatus:
     ################################################################
@@ -31,6 +31,7 @@ class CardHandlingTab(SettingsTab):
             RawConfigKeys.SKIP_UNKNOWN_MORPH_SEEN_TODAY_CARDS: self.ui.skipAlreadySeenCheckBox,
             RawConfigKeys.SKIP_SHOW_NUM_OF_SKIPPED_CARDS: self.ui.skipNotificationsCheckBox,
             RawConfigKeys.RECALC_OFFSET_NEW_CARDS: self.ui.shiftNewCardsCheckBox,
+            RawConfigKeys.RECALC_STABLE_DUE_ORDER: self.ui.stableDueOrderCheckBox,
         }
 
         self._raw_config_key_to_spin_box: dict[str, QSpinBox | QDoubleSpinBox] = {
@@ -11,8 +11,9 @@ from aqt.utils import tooltip
 from .. import (
     ankimorphs_config,
     ankimorphs_globals,
+    cache_registry,
     message_box_utils,
-    text_preprocessing,
+    morph_status_snapshot,
 )
 from ..ankimorphs_config import AnkiMorphsConfig
 from ..extra_settings import extra_settings_keys
@@ -219,7 +220,8 @@ class SettingsDialog(QDialog):  # pylint:disable=too-many-instance-attributes
     def _save(self, close_window: bool = False, tooltip_mw: bool = False) -> None:
         show_tooltip = bool(self._tabs_have_unsaved_changes())
         self._update_config(show_tooltip=show_tooltip, tooltip_mw=tooltip_mw)
-        text_preprocessing.update_translation_table()
+        cache_registry.clear_caches(cache_registry.ClearOn.SETTINGS_CHANGE)
+        morph_status_snapshot.rebuild_snapshot_in_background()
         if close_window:
             self.close()
 
@@ -38,10 +38,13 @@ class GeneralTab(SettingsTab):
             RawConfigKeys.HIDE_RECALC_TOOLBAR: self.ui.hideRecalcCheckBox,
             RawConfigKeys.HIDE_LEMMA_TOOLBAR: self.ui.hideLemmaCheckBox,
             RawConfigKeys.HIDE_INFLECTION_TOOLBAR: self.ui.hideInflectionCheckBox,
+            RawConfigKeys.WARM_UP_MORPHEMIZERS: self.ui.warmUpMorphemizersCheckBox,
         }
 
         self._raw_config_key_to_spin_box: dict[str, QSpinBox | QDoubleSpinBox] = {
             RawConfigKeys.INTERVAL_FOR_KNOWN_MORPHS: self.ui.recalcIntervalSpinBox,
+            RawConfigKeys.SPACY_BATCH_SIZE: self.ui.spacyBatchSizeSpinBox,
+            RawConfigKeys.SPACY_N_PROCESS: self.ui.spacyProcessesSpinBox,
         }
 
         self.previous_priority_selection: QRadioButton | None = None
@@ -1,58 +1,129 @@
 from __future__ import annotations
 
 import re
-from typing import Any
+import sys
 
-from . import name_file_utils
+from . import cache_registry, name_file_utils
 from .ankimorphs_config import AnkiMorphsConfig
 from .morpheme import Morpheme
 
-square_brackets_regex = re.compile(r"\[[^]]*]")
-round_brackets_regex = re.compile(r"（[^）]*）")
-slim_round_brackets_regexp = re.compile(r"\([^)]*\)")
+_SQUARE_BRACKETS_PATTERN = r"\[[^]]*]"
+_ROUND_BRACKETS_PATTERN = r"（[^）]*）"
+_SLIM_ROUND_BRACKETS_PATTERN = r"\([^)]*\)"
 
-global_translation_table: dict[int, Any] = {}
+# computed the first time numbers are ignored, see _get_decimal_characters
+_decimal_characters: str | None = None
 
 
-def update_translation_table() -> None:
+class TextPreprocessor:
     """
-    The translation table is a dict of which characters to we want
-    to remove from the text when preprocessing.
-
-    Note: this function is executed on startup and when settings are saved
+    The preprocess settings compiled into regexes and a single translation table,
+    so the characters are removed in one pass no matter how many are ignored.
+    Use 'get_text_preprocessor' to get one.
     """
-    global global_translation_table
-    global_translation_table = str.maketrans(
-        "", "", AnkiMorphsConfig().preprocess_custom_characters_to_ignore
-    )
 
+    __slots__ = (
+        "_brackets_regexes",
+        "_translation_table",
+    )
 
-def get_processed_text(
-    am_config: AnkiMorphsConfig,
-    text: str,
-    translation_table: dict[int, int | None] | None = None,
-) -> str:
+    def __init__(  # pylint:disable=too-many-arguments
+        self,
+        ignore_bracket_contents: bool,
+        ignore_round_bracket_contents: bool,
+        ignore_slim_round_bracket_contents: bool,
+        ignore_numbers: bool,
+        custom_characters_to_ignore: str,
+    ) -> None:
+        # The brackets are removed one kind at a time. A single alternation
+        # regex would give different results when the brackets are interleaved,
+        # e.g. "(a[b)c]" has to become "(a", not "c]".
+        brackets_patterns: list[str] = []
+        if ignore_bracket_contents:
+            brackets_patterns.append(_SQUARE_BRACKETS_PATTERN)
+        if ignore_round_bracket_contents:
+            brackets_patterns.append(_ROUND_BRACKETS_PATTERN)
+        if ignore_slim_round_bracket_contents:
+            brackets_patterns.append(_SLIM_ROUND_BRACKETS_PATTERN)
+
+        self._brackets_regexes: tuple[re.Pattern[str], ...] = tuple(
+            re.compile(pattern) for pattern in brackets_patterns
+        )
+
+        # The digits are removed by the translation table instead of '\d', which
+        # matches the same characters. str.translate() removes characters in
+        # a single pass, which is much more efficient than str.replace()
+        characters_to_ignore: str = custom_characters_to_ignore
+        if ignore_numbers:
+            characters_to_ignore += _get_decimal_characters()
+
+        self._translation_table: dict[int, int | None] = str.maketrans(
+            "", "", characters_to_ignore
+        )
+
+    def process(self, text: str) -> str:
+        for brackets_regex in self._brackets_regexes:
+            text = brackets_regex.sub("", text)
+
+        if self._translation_table:
+            text = text.translate(self._translation_table)
+
+        return text
+
+
+def get_text_preprocessor(am_config: AnkiMorphsConfig) -> TextPreprocessor:
+    # AnkiMorphsConfig objects are snapshots of the settings, so the
+    # preprocessor is only compiled again when the settings change.
+    return _get_cached_text_preprocessor(
+        am_config.preprocess_ignore_bracket_contents,
+        am_config.preprocess_ignore_round_bracket_contents,
+        am_config.preprocess_ignore_slim_round_bracket_contents,
+        am_config.preprocess_ignore_numbers,
+        (
+            am_config.preprocess_custom_characters_to_ignore
+            if am_config.preprocess_ignore_custom_characters
+            else ""
+        ),
+    )
 
-    if am_config.preprocess_ignore_bracket_contents:
-        text = square_brackets_regex.sub("", text)
 
-    if am_config.preprocess_ignore_round_bracket_contents:
-        text = round_brackets_regex.sub("", text)
+@cache_registry.bounded_cache(
+    name="text preprocessors",
+    max_bytes=4 * 1024 * 1024,
+    clear_on={cache_registry.ClearOn.SETTINGS_CHANGE},
+)
+def _get_cached_text_preprocessor(
+    ignore_bracket_contents: bool,
+    ignore_round_bracket_contents: bool,
+    ignore_slim_round_bracket_contents: bool,
+    ignore_numbers: bool,
+    custom_characters_to_ignore: str,
+) -> TextPreprocessor:
+    return TextPreprocessor(
+        ignore_bracket_contents=ignore_bracket_contents,
+        ignore_round_bracket_contents=ignore_round_bracket_contents,
+        ignore_slim_round_bracket_contents=ignore_slim_round_bracket_contents,
+        ignore_numbers=ignore_numbers,
+        custom_characters_to_ignore=custom_characters_to_ignore,
+    )
 
-    if am_config.preprocess_ignore_slim_round_bracket_contents:
-        text = slim_round_brackets_regexp.sub("", text)
 
-    if am_config.preprocess_ignore_numbers:
-        text = re.sub(r"\d", "", text)
+def _get_decimal_characters() -> str:
+    # all the characters matched by '\d', i.e. the unicode decimal digits
+    global _decimal_characters
+    if _decimal_characters is None:
+        _decimal_characters = "".join(
+            character
+            for character in map(chr, range(sys.maxunicode + 1))
+            if character.isdecimal()
+        )
+    return _decimal_characters
 
-    if am_config.preprocess_ignore_custom_characters:
-        if translation_table is None:
-            translation_table = global_translation_table
-        # str.translate() removes characters in a single pass, which is
-        # much more efficient than str.replace()
-        text = text.translate(translation_table)
 
-    return text
+def get_processed_text(am_config: AnkiMorphsConfig, text: str) -> str:
+    # prefer getting the preprocessor once with 'get_text_preprocessor'
+    # when processing many texts
+    return get_text_preprocessor(am_config).process(text)
 
 
 def remove_names_textfile(morphs: list[Morpheme]) -> list[Morpheme]:
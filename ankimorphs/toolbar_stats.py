@@ -45,7 +45,6 @@ class MorphToolbarStats:
                 """,
                 (learning_interval,),
             ).fetchone()[0]
-            am_db.con.close()
         except sqlite3.OperationalError:
             # database schema has changed
             return
@@ -95,6 +95,14 @@ class Ui_SettingsDialog(object):
         self.recalcBeforeSyncCheckBox.setObjectName("recalcBeforeSyncCheckBox")
         self.verticalLayout_18.addWidget(self.recalcBeforeSyncCheckBox)
         self.verticalLayout_21.addWidget(self.groupBox_2)
+        self.groupBox_15 = QtWidgets.QGroupBox(parent=self.general_tab)
+        self.groupBox_15.setObjectName("groupBox_15")
+        self.verticalLayout_52 = QtWidgets.QVBoxLayout(self.groupBox_15)
+        self.verticalLayout_52.setObjectName("verticalLayout_52")
+        self.warmUpMorphemizersCheckBox = QtWidgets.QCheckBox(parent=self.groupBox_15)
+        self.warmUpMorphemizersCheckBox.setObjectName("warmUpMorphemizersCheckBox")
+        self.verticalLayout_52.addWidget(self.warmUpMorphemizersCheckBox)
+        self.verticalLayout_21.addWidget(self.groupBox_15)
         self.groupBox_10 = QtWidgets.QGroupBox(parent=self.general_tab)
         self.groupBox_10.setObjectName("groupBox_10")
         self.verticalLayout_14 = QtWidgets.QVBoxLayout(self.groupBox_10)
@@ -137,16 +145,38 @@ class Ui_SettingsDialog(object):
         self.horizontalLayout_18.addItem(spacerItem3)
         self.verticalLayout_14.addLayout(self.horizontalLayout_18)
         self.verticalLayout_21.addWidget(self.groupBox_10)
-        spacerItem4 = QtWidgets.QSpacerItem(20, 170, QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Expanding)
-        self.verticalLayout_21.addItem(spacerItem4)
+        self.groupBox_14 = QtWidgets.QGroupBox(parent=self.general_tab)
+        self.groupBox_14.setObjectName("groupBox_14")
+        self.horizontalLayout_32 = QtWidgets.QHBoxLayout(self.groupBox_14)
+        self.horizontalLayout_32.setObjectName("horizontalLayout_32")
+        self.label_52 = QtWidgets.QLabel(parent=self.groupBox_14)
+        self.label_52.setObjectName("label_52")
+        self.horizontalLayout_32.addWidget(self.label_52)
+        self.spacyBatchSizeSpinBox = QtWidgets.QSpinBox(parent=self.groupBox_14)
+        self.spacyBatchSizeSpinBox.setMaximum(100000)
+        self.spacyBatchSizeSpinBox.setObjectName("spacyBatchSizeSpinBox")
+        self.horizontalLayout_32.addWidget(self.spacyBatchSizeSpinBox)
+        self.label_53 = QtWidgets.QLabel(parent=self.groupBox_14)
+        self.label_53.setObjectName("label_53")
+        self.horizontalLayout_32.addWidget(self.label_53)
+        self.spacyProcessesSpinBox = QtWidgets.QSpinBox(parent=self.groupBox_14)
+        self.spacyProcessesSpinBox.setMinimum(1)
+        self.spacyProcessesSpinBox.setMaximum(32)
+        self.spacyProcessesSpinBox.setObjectName("spacyProcessesSpinBox")
+        self.horizontalLayout_32.addWidget(self.spacyProcessesSpinBox)
+        spacerItem4 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_32.addItem(spacerItem4)
+        self.verticalLayout_21.addWidget(self.groupBox_14)
+        spacerItem5 = QtWidgets.QSpacerItem(20, 170, QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Expanding)
+        self.verticalLayout_21.addItem(spacerItem5)
         self.horizontalLayout_25 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_25.setContentsMargins(-1, 10, -1, -1)
         self.horizontalLayout_25.setObjectName("horizontalLayout_25")
         self.restoreGeneralPushButton = QtWidgets.QPushButton(parent=self.general_tab)
         self.restoreGeneralPushButton.setObjectName("restoreGeneralPushButton")
         self.horizontalLayout_25.addWidget(self.restoreGeneralPushButton)
-        spacerItem5 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
-        self.horizontalLayout_25.addItem(spacerItem5)
+        spacerItem6 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_25.addItem(spacerItem6)
         self.verticalLayout_21.addLayout(self.horizontalLayout_25)
         self.tabWidget.addTab(self.general_tab, "")
         self.note_filters_tab = QtWidgets.QWidget()
@@ -182,8 +212,8 @@ class Ui_SettingsDialog(object):
         self.deleteRowPushButton = QtWidgets.QPushButton(parent=self.note_filters_tab)
         self.deleteRowPushButton.setObjectName("deleteRowPushButton")
         self.horizontalLayout_2.addWidget(self.deleteRowPushButton)
-        spacerItem6 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
-        self.horizontalLayout_2.addItem(spacerItem6)
+        spacerItem7 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_2.addItem(spacerItem7)
         self.addNewRowPushButton = QtWidgets.QPushButton(parent=self.note_filters_tab)
         self.addNewRowPushButton.setObjectName("addNewRowPushButton")
         self.horizontalLayout_2.addWidget(self.addNewRowPushButton)
@@ -194,8 +224,8 @@ class Ui_SettingsDialog(object):
         self.restoreNoteFiltersPushButton = QtWidgets.QPushButton(parent=self.note_filters_tab)
         self.restoreNoteFiltersPushButton.setObjectName("restoreNoteFiltersPushButton")
         self.horizontalLayout_26.addWidget(self.restoreNoteFiltersPushButton)
-        spacerItem7 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
-        self.horizontalLayout_26.addItem(spacerItem7)
+        spacerItem8 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_26.addItem(spacerItem8)
         self.verticalLayout_3.addLayout(self.horizontalLayout_26)
         self.tabWidget.addTab(self.note_filters_tab, "")
         self.extra_fields_tab = QtWidgets.QWidget()
@@ -228,8 +258,8 @@ class Ui_SettingsDialog(object):
         self.unknownsFieldShowsInflectionsRadioButton = QtWidgets.QRadioButton(parent=self.groupBox_5)
         self.unknownsFieldShowsInflectionsRadioButton.setObjectName("unknownsFieldShowsInflectionsRadioButton")
         self.horizontalLayout_3.addWidget(self.unknownsFieldShowsInflectionsRadioButton)
-        spacerItem8 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
-        self.horizontalLayout_3.addItem(spacerItem8)
+        spacerItem9 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_3.addItem(spacerItem9)
         self.verticalLayout_5.addLayout(self.horizontalLayout_3)
         self.verticalLayout_6.addWidget(self.groupBox_5)
         self.extraFieldsTreeWidget = QtWidgets.QTreeWidget(parent=self.extra_fields_tab)
@@ -242,8 +272,8 @@ class Ui_SettingsDialog(object):
         self.restoreExtraFieldsPushButton = QtWidgets.QPushButton(parent=self.extra_fields_tab)
         self.restoreExtraFieldsPushButton.setObjectName("restoreExtraFieldsPushButton")
         self.horizontalLayout_9.addWidget(self.restoreExtraFieldsPushButton)
-        spacerItem9 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
-        self.horizontalLayout_9.addItem(spacerItem9)
+        spacerItem10 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_9.addItem(spacerItem10)
         self.verticalLayout_6.addLayout(self.horizontalLayout_9)
         self.tabWidget.addTab(self.extra_fields_tab, "")
         self.tags_tab = QtWidgets.QWidget()
@@ -309,20 +339,20 @@ class Ui_SettingsDialog(object):
         self.tagSuspendedAutomaticallyLineEdit.setObjectName("tagSuspendedAutomaticallyLineEdit")
         self.verticalLayout_7.addWidget(self.tagSuspendedAutomaticallyLineEdit)
         self.horizontalLayout_4.addLayout(self.verticalLayout_7)
-        spacerItem10 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
-        self.horizontalLayout_4.addItem(spacerItem10)
+        spacerItem11 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_4.addItem(spacerItem11)
         self.verticalLayout_10.addLayout(self.horizontalLayout_4)
         self.verticalLayout_12.addWidget(self.groupBox_6)
-        spacerItem11 = QtWidgets.QSpacerItem(20, 114, QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Expanding)
-        self.verticalLayout_12.addItem(spacerItem11)
+        spacerItem12 = QtWidgets.QSpacerItem(20, 114, QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Expanding)
+        self.verticalLayout_12.addItem(spacerItem12)
         self.horizontalLayout_7 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_7.setContentsMargins(-1, 10, -1, -1)
         self.horizontalLayout_7.setObjectName("horizontalLayout_7")
         self.restoreTagsPushButton = QtWidgets.QPushButton(parent=self.tags_tab)
         self.restoreTagsPushButton.setObjectName("restoreTagsPushButton")
         self.horizontalLayout_7.addWidget(self.restoreTagsPushButton)
-        spacerItem12 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
-        self.horizontalLayout_7.addItem(spacerItem12)
+        spacerItem13 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_7.addItem(spacerItem13)
         self.verticalLayout_12.addLayout(self.horizontalLayout_7)
         self.tabWidget.addTab(self.tags_tab, "")
         self.preprocess_tab = QtWidgets.QWidget()
@@ -367,20 +397,20 @@ class Ui_SettingsDialog(object):
         self.preprocessCustomCharactersLineEdit = QtWidgets.QLineEdit(parent=self.groupBox_7)
         self.preprocessCustomCharactersLineEdit.setObjectName("preprocessCustomCharactersLineEdit")
         self.horizontalLayout_28.addWidget(self.preprocessCustomCharactersLineEdit)
-        spacerItem13 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
-        self.horizontalLayout_28.addItem(spacerItem13)
+        spacerItem14 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_28.addItem(spacerItem14)
         self.verticalLayout_13.addLayout(self.horizontalLayout_28)
         self.verticalLayout_9.addWidget(self.groupBox_7)
-        spacerItem14 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Expanding)
-        self.verticalLayout_9.addItem(spacerItem14)
+        spacerItem15 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Expanding)
+        self.verticalLayout_9.addItem(spacerItem15)
         self.horizontalLayout_8 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_8.setContentsMargins(-1, 10, -1, -1)
         self.horizontalLayout_8.setObjectName("horizontalLayout_8")
         self.restorePreprocessPushButton = QtWidgets.QPushButton(parent=self.preprocess_tab)
         self.restorePreprocessPushButton.setObjectName("restorePreprocessPushButton")
         self.horizontalLayout_8.addWidget(self.restorePreprocessPushButton)
-        spacerItem15 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
-        self.horizontalLayout_8.addItem(spacerItem15)
+        spacerItem16 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_8.addItem(spacerItem16)
         self.verticalLayout_9.addLayout(self.horizontalLayout_8)
         self.tabWidget.addTab(self.preprocess_tab, "")
         self.card_handling_tab = QtWidgets.QWidget()
@@ -441,8 +471,8 @@ class Ui_SettingsDialog(object):
         self.suspendNewCardsComboBox = QtWidgets.QComboBox(parent=self.groupBox_13)
         self.suspendNewCardsComboBox.setObjectName("suspendNewCardsComboBox")
         self.horizontalLayout_30.addWidget(self.suspendNewCardsComboBox)
-        spacerItem16 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
-        self.horizontalLayout_30.addItem(spacerItem16)
+        spacerItem17 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_30.addItem(spacerItem17)
         self.verticalLayout_20.addLayout(self.horizontalLayout_30)
         self.horizontalLayout_29 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_29.setObjectName("horizontalLayout_29")
@@ -452,8 +482,8 @@ class Ui_SettingsDialog(object):
         self.MoveNewCardsComboBox = QtWidgets.QComboBox(parent=self.groupBox_13)
         self.MoveNewCardsComboBox.setObjectName("MoveNewCardsComboBox")
         self.horizontalLayout_29.addWidget(self.MoveNewCardsComboBox)
-        spacerItem17 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
-        self.horizontalLayout_29.addItem(spacerItem17)
+        spacerItem18 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_29.addItem(spacerItem18)
         self.verticalLayout_20.addLayout(self.horizontalLayout_29)
         self.horizontalLayout_13 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_13.setObjectName("horizontalLayout_13")
@@ -474,20 +504,23 @@ class Ui_SettingsDialog(object):
         self.label_21 = QtWidgets.QLabel(parent=self.groupBox_13)
         self.label_21.setObjectName("label_21")
         self.horizontalLayout_13.addWidget(self.label_21)
-        spacerItem18 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
-        self.horizontalLayout_13.addItem(spacerItem18)
+        spacerItem19 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_13.addItem(spacerItem19)
         self.verticalLayout_20.addLayout(self.horizontalLayout_13)
+        self.stableDueOrderCheckBox = QtWidgets.QCheckBox(parent=self.groupBox_13)
+        self.stableDueOrderCheckBox.setObjectName("stableDueOrderCheckBox")
+        self.verticalLayout_20.addWidget(self.stableDueOrderCheckBox)
         self.verticalLayout_51.addWidget(self.groupBox_13)
-        spacerItem19 = QtWidgets.QSpacerItem(20, 99, QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Expanding)
-        self.verticalLayout_51.addItem(spacerItem19)
+        spacerItem20 = QtWidgets.QSpacerItem(20, 99, QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Expanding)
+        self.verticalLayout_51.addItem(spacerItem20)
         self.horizontalLayout_11 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_11.setContentsMargins(-1, 10, -1, -1)
         self.horizontalLayout_11.setObjectName("horizontalLayout_11")
         self.restoreCardHandlingPushButton = QtWidgets.QPushButton(parent=self.card_handling_tab)
         self.restoreCardHandlingPushButton.setObjectName("restoreCardHandlingPushButton")
         self.horizontalLayout_11.addWidget(self.restoreCardHandlingPushButton)
-        spacerItem20 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
-        self.horizontalLayout_11.addItem(spacerItem20)
+        spacerItem21 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_11.addItem(spacerItem21)
         self.verticalLayout_51.addLayout(self.horizontalLayout_11)
         self.tabWidget.addTab(self.card_handling_tab, "")
         self.algorithm_tab = QtWidgets.QWidget()
@@ -573,8 +606,8 @@ class Ui_SettingsDialog(object):
         self.targetDifferenceLearningMorphsSpinBox.setObjectName("targetDifferenceLearningMorphsSpinBox")
         self.verticalLayout_33.addWidget(self.targetDifferenceLearningMorphsSpinBox)
         self.horizontalLayout_16.addLayout(self.verticalLayout_33)
-        spacerItem21 = QtWidgets.QSpacerItem(516, 17, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
-        self.horizontalLayout_16.addItem(spacerItem21)
+        spacerItem22 = QtWidgets.QSpacerItem(516, 17, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_16.addItem(spacerItem22)
         self.verticalLayout_46.addWidget(self.groupBox_8)
         self.groupBox_9 = QtWidgets.QGroupBox(parent=self.algorithm_tab)
         self.groupBox_9.setObjectName("groupBox_9")
@@ -654,8 +687,8 @@ class Ui_SettingsDialog(object):
         self.lowerTargetAllMorphsCoefficientC.setObjectName("lowerTargetAllMorphsCoefficientC")
         self.verticalLayout_39.addWidget(self.lowerTargetAllMorphsCoefficientC)
         self.horizontalLayout_14.addLayout(self.verticalLayout_39)
-        spacerItem22 = QtWidgets.QSpacerItem(577, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
-        self.horizontalLayout_14.addItem(spacerItem22)
+        spacerItem23 = QtWidgets.QSpacerItem(577, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_14.addItem(spacerItem23)
         self.verticalLayout_45.addLayout(self.horizontalLayout_14)
         self.horizontalLayout_15 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_15.setContentsMargins(-1, 10, -1, -1)
@@ -732,20 +765,20 @@ class Ui_SettingsDialog(object):
         self.lowerTargetLearningMorphsCoefficientC.setObjectName("lowerTargetLearningMorphsCoefficientC")
         self.verticalLayout_44.addWidget(self.lowerTargetLearningMorphsCoefficientC)
         self.horizontalLayout_15.addLayout(self.verticalLayout_44)
-        spacerItem23 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
-        self.horizontalLayout_15.addItem(spacerItem23)
+        spacerItem24 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_15.addItem(spacerItem24)
         self.verticalLayout_45.addLayout(self.horizontalLayout_15)
         self.verticalLayout_46.addWidget(self.groupBox_9)
-        spacerItem24 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Expanding)
-        self.verticalLayout_46.addItem(spacerItem24)
+        spacerItem25 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Expanding)
+        self.verticalLayout_46.addItem(spacerItem25)
         self.horizontalLayout_17 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_17.setContentsMargins(-1, 10, -1, -1)
         self.horizontalLayout_17.setObjectName("horizontalLayout_17")
         self.restoreAlgorithmPushButton = QtWidgets.QPushButton(parent=self.algorithm_tab)
         self.restoreAlgorithmPushButton.setObjectName("restoreAlgorithmPushButton")
         self.horizontalLayout_17.addWidget(self.restoreAlgorithmPushButton)
-        spacerItem25 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
-        self.horizontalLayout_17.addItem(spacerItem25)
+        spacerItem26 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_17.addItem(spacerItem26)
         self.verticalLayout_46.addLayout(self.horizontalLayout_17)
         self.tabWidget.addTab(self.algorithm_tab, "")
         self.shortcuts_tab = QtWidgets.QWidget()
@@ -817,8 +850,8 @@ class Ui_SettingsDialog(object):
         self.shortcutKnownMorphsExporterDisablePushButton.setObjectName("shortcutKnownMorphsExporterDisablePushButton")
         self.verticalLayout_4.addWidget(self.shortcutKnownMorphsExporterDisablePushButton)
         self.horizontalLayout_21.addLayout(self.verticalLayout_4)
-        spacerItem26 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
-        self.horizontalLayout_21.addItem(spacerItem26)
+        spacerItem27 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_21.addItem(spacerItem27)
         self.verticalLayout_48.addLayout(self.horizontalLayout_21)
         self.verticalLayout_49.addWidget(self.groupBox_12)
         self.groupBox_11 = QtWidgets.QGroupBox(parent=self.shortcuts_tab)
@@ -863,8 +896,8 @@ class Ui_SettingsDialog(object):
         self.shortcutViewMorphsDisablePushButton.setObjectName("shortcutViewMorphsDisablePushButton")
         self.verticalLayout_35.addWidget(self.shortcutViewMorphsDisablePushButton)
         self.horizontalLayout_5.addLayout(self.verticalLayout_35)
-        spacerItem27 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
-        self.horizontalLayout_5.addItem(spacerItem27)
+        spacerItem28 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_5.addItem(spacerItem28)
         self.verticalLayout_47.addLayout(self.horizontalLayout_5)
         self.horizontalLayout_12 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_12.setObjectName("horizontalLayout_12")
@@ -904,20 +937,20 @@ class Ui_SettingsDialog(object):
         self.shortcutBrowseReadyLemmaDisablePushButton.setObjectName("shortcutBrowseReadyLemmaDisablePushButton")
         self.verticalLayout_22.addWidget(self.shortcutBrowseReadyLemmaDisablePushButton)
         self.horizontalLayout_12.addLayout(self.verticalLayout_22)
-        spacerItem28 = QtWidgets.QSpacerItem(20, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
-        self.horizontalLayout_12.addItem(spacerItem28)
+        spacerItem29 = QtWidgets.QSpacerItem(20, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_12.addItem(spacerItem29)
         self.verticalLayout_47.addLayout(self.horizontalLayout_12)
         self.verticalLayout_49.addWidget(self.groupBox_11)
-        spacerItem29 = QtWidgets.QSpacerItem(20, 89, QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Expanding)
-        self.verticalLayout_49.addItem(spacerItem29)
+        spacerItem30 = QtWidgets.QSpacerItem(20, 89, QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Expanding)
+        self.verticalLayout_49.addItem(spacerItem30)
         self.horizontalLayout_10 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_10.setContentsMargins(-1, 10, -1, -1)
         self.horizontalLayout_10.setObjectName("horizontalLayout_10")
         self.restoreShortcutsPushButton = QtWidgets.QPushButton(parent=self.shortcuts_tab)
         self.restoreShortcutsPushButton.setObjectName("restoreShortcutsPushButton")
         self.horizontalLayout_10.addWidget(self.restoreShortcutsPushButton)
-        spacerItem30 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
-        self.horizontalLayout_10.addItem(spacerItem30)
+        spacerItem31 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_10.addItem(spacerItem31)
         self.verticalLayout_49.addLayout(self.horizontalLayout_10)
         self.tabWidget.addTab(self.shortcuts_tab, "")
         self.verticalLayout.addWidget(self.tabWidget)
@@ -926,13 +959,13 @@ class Ui_SettingsDialog(object):
         self.restoreAllDefaultsPushButton = QtWidgets.QPushButton(parent=SettingsDialog)
         self.restoreAllDefaultsPushButton.setObjectName("restoreAllDefaultsPushButton")
         self.horizontalLayout.addWidget(self.restoreAllDefaultsPushButton)
-        spacerItem31 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
-        self.horizontalLayout.addItem(spacerItem31)
+        spacerItem32 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout.addItem(spacerItem32)
         self.ankimorphs_version_label = QtWidgets.QLabel(parent=SettingsDialog)
         self.ankimorphs_version_label.setObjectName("ankimorphs_version_label")
         self.horizontalLayout.addWidget(self.ankimorphs_version_label)
-        spacerItem32 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
-        self.horizontalLayout.addItem(spacerItem32)
+        spacerItem33 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout.addItem(spacerItem33)
         self.applyPushButton = QtWidgets.QPushButton(parent=SettingsDialog)
         self.applyPushButton.setMinimumSize(QtCore.QSize(80, 0))
         self.applyPushButton.setObjectName("applyPushButton")
@@ -971,6 +1004,9 @@ class Ui_SettingsDialog(object):
         self.recalcReadKnownMorphsFolderCheckBox.setText(_translate("SettingsDialog", "Read files in \'known-morphs\' folder and register morphs as known"))
         self.groupBox_2.setTitle(_translate("SettingsDialog", "On Sync"))
         self.recalcBeforeSyncCheckBox.setText(_translate("SettingsDialog", "Automatically Recalc before Anki sync"))
+        self.groupBox_15.setTitle(_translate("SettingsDialog", "On Startup"))
+        self.warmUpMorphemizersCheckBox.setToolTip(_translate("SettingsDialog", "Loads the morphemizers used by the note filters in the background, so the first Recalc and the first highlighted card don\'t have to wait for them."))
+        self.warmUpMorphemizersCheckBox.setText(_translate("SettingsDialog", "Load morphemizers in the background when the profile opens"))
         self.groupBox_10.setTitle(_translate("SettingsDialog", "Toolbar"))
         self.label_45.setText(_translate("SettingsDialog", "Hide toolbar items:"))
         self.hideRecalcCheckBox.setText(_translate("SettingsDialog", "Recalc"))
@@ -979,6 +1015,12 @@ class Ui_SettingsDialog(object):
         self.label_37.setText(_translate("SettingsDialog", "Toolbar counters (‘L’ and ‘I’) show:"))
         self.toolbarStatsUseSeenRadioButton.setText(_translate("SettingsDialog", "Seen morphs (reviewed at least once)"))
         self.toolbarStatsUseKnownRadioButton.setText(_translate("SettingsDialog", "Known morphs"))
+        self.groupBox_14.setTitle(_translate("SettingsDialog", "spaCy"))
+        self.label_52.setText(_translate("SettingsDialog", "Batch size:"))
+        self.spacyBatchSizeSpinBox.setToolTip(_translate("SettingsDialog", "The number of texts spaCy processes at a time. 0 means it\'s chosen automatically based on the average length of the texts."))
+        self.spacyBatchSizeSpinBox.setSpecialValueText(_translate("SettingsDialog", "Automatic"))
+        self.label_53.setText(_translate("SettingsDialog", "Processes:"))
+        self.spacyProcessesSpinBox.setToolTip(_translate("SettingsDialog", "The number of processes spaCy uses during Recalc. Only has an effect on Linux."))
         self.restoreGeneralPushButton.setText(_translate("SettingsDialog", "Restore Default General Settings"))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.general_tab), _translate("SettingsDialog", "General"))
         item = self.note_filters_table.horizontalHeaderItem(0)
@@ -1039,6 +1081,7 @@ class Ui_SettingsDialog(object):
         self.shiftNewCardsCheckBox.setText(_translate("SettingsDialog", "Shift new cards that are not the first to have the unknown morph, by"))
         self.label_20.setText(_translate("SettingsDialog", "due, for the first"))
         self.label_21.setText(_translate("SettingsDialog", "morphs"))
+        self.stableDueOrderCheckBox.setText(_translate("SettingsDialog", "Only reposition new cards whose relative order changed"))
         self.restoreCardHandlingPushButton.setText(_translate("SettingsDialog", "Restore Default Card Handling Settings"))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.card_handling_tab), _translate("SettingsDialog", "Card Handling"))
         self.groupBox_8.setTitle(_translate("SettingsDialog", "Weights"))
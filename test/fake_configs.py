@@ -170,6 +170,18 @@ config_big_japanese_collection_filter[FilterKeys.MORPHEMIZER_DESCRIPTION] = "Ank
 # fmt: on
 
 
+################################################################
+#          config_two_filters_with_same_morphemizer
+################################################################
+# Matches `big_japanese_collection.anki2`, and has two identical
+# filters, so every card matches both of them.
+################################################################
+config_two_filters_with_same_morphemizer = copy.deepcopy(config_big_japanese_collection)
+config_two_filters_with_same_morphemizer[ConfigKeys.FILTERS].append(
+    copy.deepcopy(config_big_japanese_collection_filter)
+)
+
+
 ################################################################
 #          config_use_stability_for_known_threshold
 ################################################################
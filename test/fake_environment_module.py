@@ -32,8 +32,11 @@ from ankimorphs import (
     ankimorphs_config,
     ankimorphs_db,
     ankimorphs_globals,
+    cache_registry,
+    db_connections,
     known_morphs_exporter,
     morph_priority_utils,
+    morph_status_snapshot,
     name_file_utils,
     progress_utils,
     reviewing_utils,
@@ -173,7 +176,6 @@ def fake_environment_fixture(  # pylint:disable=too-many-locals
 
     finally:
         post_test_teardown(
-            mock_db=mock_db,
             mock_mw=mock_mw,
             patches=mw_patches + am_db_patches + misc_patches,
         )
@@ -230,6 +232,7 @@ def create_am_db_patches() -> list[Any]:
         mock.patch.object(progression_window, "AnkiMorphsDB", FakeDB),
         mock.patch.object(progression_utils, "AnkiMorphsDB", FakeDB),
         mock.patch.object(known_morphs_exporter, "AnkiMorphsDB", FakeDB),
+        mock.patch.object(morph_status_snapshot, "AnkiMorphsDB", FakeDB),
     ]
 
 
@@ -246,16 +249,21 @@ def create_misc_patches(_priority_files_dir: str, _known_morphs_dir: str) -> lis
 
 
 def post_test_teardown(
-    mock_db: FakeDB,
     mock_mw: AnkiQt,
     patches: list[Any],
 ) -> None:
-    mock_db.con.close()
+    # closes the connection of the mock db too
+    db_connections.close_all_connections()
+    # the next test can use a different db
+    morph_status_snapshot.clear_snapshot()
     mock_mw.col.close()
 
     for patch in patches:
         patch.stop()
 
+    # every fake environment is essentially a separate profile
+    cache_registry.clear_caches(cache_registry.ClearOn.PROFILE_CHANGE)
+
     # Windows can sometimes have lingering references so we force cleanup here
     gc.collect()
 
@@ -0,0 +1,702 @@
+from __future__ import annotations
+
+import random
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from test.test_globals import PATH_TESTS_DATA_DBS
+from typing import Any
+from unittest import mock
+
+import pytest
+from anki.cards import CardId
+
+from ankimorphs import ankimorphs_db, db_connections, morph_status_snapshot
+from ankimorphs.ankimorphs_db import SCHEMA_VERSION, AnkiMorphsDB
+from ankimorphs.ankimorphs_globals import (
+    STATUS_KNOWN,
+    STATUS_LEARNING,
+    STATUS_UNKNOWN,
+)
+from ankimorphs.exceptions import CancelledOperationException
+from ankimorphs.morph_status_snapshot import MorphStatusSnapshot
+from ankimorphs.morpheme import Morpheme
+
+
+@pytest.fixture
+def _fake_mw_fixture() -> Iterator[None]:
+    # AnkiMorphsDB asserts that mw exists, even when a db_path is given
+    with mock.patch.object(ankimorphs_db, "mw", mock.Mock()):
+        yield
+    db_connections.close_all_connections()
+
+
+def _get_synthetic_table_data(
+    num_cards: int, num_morphs: int, morphs_per_card: int
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
+    rng = random.Random(0)
+    # about a quarter of the morphs are unknown, i.e. have an interval of 0
+    lemmas: list[str] = [f"lemma{index}" for index in range(num_morphs)]
+
+    card_table_data: list[dict[str, Any]] = [
+        {
+            "card_id": card_id,
+            "note_id": card_id,
+            "note_type_id": 1,
+            "card_type": 0,
+            "tags": "",
+        }
+        for card_id in range(num_cards)
+    ]
+    morph_table_data: list[dict[str, Any]] = [
+        {
+            "lemma": lemma,
+            "inflection": lemma,
+            "highest_lemma_learning_interval": rng.randint(0, 3),
+            "highest_inflection_learning_interval": rng.randint(0, 3),
+        }
+        for lemma in lemmas
+    ]
+    card_morph_map_table_data: list[dict[str, Any]] = [
+        {"card_id": card_id, "morph_lemma": lemma, "morph_inflection": lemma}
+        for card_id in range(num_cards)
+        for lemma in rng.sample(lemmas, morphs_per_card)
+    ]
+    return card_table_data, morph_table_data, card_morph_map_table_data
+
+
+def _rebuild(
+    am_db: AnkiMorphsDB, table_data: tuple[list[Any], list[Any], list[Any]]
+) -> None:
+    # the same steps as caching.cache_anki_data
+    card_table_data, morph_table_data, card_morph_map_table_data = table_data
+    with am_db.rebuild() as rebuild_db:
+        rebuild_db.insert_many_into_morph_table(morph_table_data)
+        rebuild_db.insert_many_into_card_table(card_table_data)
+        rebuild_db.insert_many_into_card_morph_map_table(card_morph_map_table_data)
+
+
+def _time_rebuild_and_reads(
+    db_path: Path, table_data: tuple[list[Any], list[Any], list[Any]]
+) -> tuple[float, float]:
+    card_table_data, *_ = table_data
+    am_db = AnkiMorphsDB(db_path=db_path)
+
+    # the first rebuild populates the db, so the
+    # second one also has to drop the old tables
+    rebuild_duration: float = 0.0
+    for _ in range(2):
+        start = time.perf_counter()
+        _rebuild(am_db, table_data)
+        rebuild_duration = time.perf_counter() - start
+
+    # what the highlighting and the seen morphs do for every card
+    start = time.perf_counter()
+    for card_data in card_table_data:
+        card_morphs: list[Morpheme] = [
+            Morpheme(lemma=lemma, inflection=inflection)
+            for lemma, inflection in am_db.get_readable_card_morphs(
+                card_data["card_id"]
+            )
+        ]
+        am_db.get_highest_inflection_learning_intervals(card_morphs)
+        am_db.get_highest_lemma_learning_intervals(card_morphs)
+    reads_duration = time.perf_counter() - start
+
+    return rebuild_duration, reads_duration
+
+
+def test_tuning_profile_benchmark(  # pylint:disable=unused-argument
+    _fake_mw_fixture: None, tmp_path: Path
+) -> None:
+    table_data = _get_synthetic_table_data(
+        num_cards=5000, num_morphs=10000, morphs_per_card=10
+    )
+
+    with mock.patch.object(db_connections, "_apply_tuning_profile", lambda _: None):
+        default_durations = _time_rebuild_and_reads(
+            Path(tmp_path, "default.db"), table_data
+        )
+    tuned_durations = _time_rebuild_and_reads(Path(tmp_path, "tuned.db"), table_data)
+
+    # The difference depends a lot on how expensive fsync is on
+    # the disk, so the numbers are printed instead of compared.
+    print(
+        f"rebuild: {default_durations[0]:.3f}s -> {tuned_durations[0]:.3f}s, "
+        f"reads: {default_durations[1]:.3f}s -> {tuned_durations[1]:.3f}s"
+    )
+
+    con = AnkiMorphsDB(db_path=Path(tmp_path, "tuned.db")).con
+    assert con.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert con.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert con.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+    assert con.execute("PRAGMA cache_size").fetchone()[0] == -64 * 1024
+
+
+def test_tuning_profile_without_wal(  # pylint:disable=unused-argument
+    _fake_mw_fixture: None,
+) -> None:
+    # in-memory dbs can't use WAL, just like some network filesystems
+    con = AnkiMorphsDB(db_path=Path(":memory:")).con
+    assert con.execute("PRAGMA journal_mode").fetchone()[0] == "memory"
+    assert con.execute("PRAGMA synchronous").fetchone()[0] == 2  # FULL
+    assert con.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+
+
+def test_nested_instances_share_the_transaction(  # pylint:disable=unused-argument
+    _fake_mw_fixture: None, tmp_path: Path
+) -> None:
+    db_path = Path(tmp_path, "nested.db")
+    am_db = AnkiMorphsDB(db_path=db_path)
+    am_db.con.execute("CREATE TABLE Test (value INTEGER)")
+
+    with am_db:
+        am_db.con.execute("INSERT INTO Test VALUES (1)")
+
+        # the instances on the same thread share the connection, but the
+        # nested ones don't commit or roll back the work of the outer one
+        with AnkiMorphsDB(db_path=db_path) as nested_db:
+            nested_db.con.execute("INSERT INTO Test VALUES (2)")
+        assert am_db.con.in_transaction
+
+        with pytest.raises(ValueError):
+            with AnkiMorphsDB(db_path=db_path):
+                raise ValueError
+        assert am_db.con.in_transaction
+
+    assert not am_db.con.in_transaction
+    with sqlite3.connect(db_path) as other_con:
+        assert other_con.execute("SELECT value FROM Test").fetchall() == [(1,), (2,)]
+    other_con.close()
+
+
+def test_short_lived_threads_close_their_connections(  # pylint:disable=unused-argument
+    _fake_mw_fixture: None, tmp_path: Path
+) -> None:
+    db_path = Path(tmp_path, "thread.db")
+
+    def _use_db_on_thread() -> sqlite3.Connection:
+        try:
+            return AnkiMorphsDB(db_path=db_path).con
+        finally:
+            db_connections.close_thread_connections()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        thread_con: sqlite3.Connection = executor.submit(_use_db_on_thread).result()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        thread_con.execute("SELECT 1")
+
+    # the connections of the other threads stay open
+    assert AnkiMorphsDB(db_path=db_path).con.execute("SELECT 1").fetchone() == (1,)
+
+
+def test_rebuild_is_swapped_in_atomically(  # pylint:disable=unused-argument
+    _fake_mw_fixture: None, tmp_path: Path
+) -> None:
+    db_path = Path(tmp_path, "swap.db")
+    am_db = AnkiMorphsDB(db_path=db_path)
+
+    _rebuild(
+        am_db,
+        _get_synthetic_table_data(num_cards=100, num_morphs=200, morphs_per_card=5),
+    )
+    am_db.update_seen_morphs_today_single_card(1)
+    seen_morphs: set[str] = am_db.get_all_morphs_seen_today()
+    assert len(seen_morphs) == 5
+
+    def count_cards() -> int:
+        # the readers are on other threads, so they have their own connections
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            card_count: int = executor.submit(
+                lambda: AnkiMorphsDB(db_path=db_path)
+                .con.execute("SELECT COUNT(*) FROM Cards")
+                .fetchone()[0]
+            ).result()
+        return card_count
+
+    new_card_table_data, *_ = _get_synthetic_table_data(
+        num_cards=300, num_morphs=200, morphs_per_card=5
+    )
+
+    with am_db.rebuild() as rebuild_db:
+        rebuild_db.insert_many_into_card_table(new_card_table_data)
+        assert count_cards() == 100
+
+    assert count_cards() == 300
+    assert am_db.get_all_morphs_seen_today() == seen_morphs
+    assert am_db.get_schema_version() == SCHEMA_VERSION
+
+    # a cancelled rebuild leaves the db as it was
+    with pytest.raises(CancelledOperationException):
+        with am_db.rebuild() as rebuild_db:
+            rebuild_db.insert_many_into_card_table(new_card_table_data[:10])
+            raise CancelledOperationException
+
+    assert count_cards() == 300
+    assert not [path for path in tmp_path.iterdir() if "rebuild" in path.name]
+
+
+def test_cards_seen_during_the_swap_are_kept(  # pylint:disable=unused-argument
+    _fake_mw_fixture: None, tmp_path: Path
+) -> None:
+    am_db = AnkiMorphsDB(db_path=Path(tmp_path, "seen.db"))
+    table_data = _get_synthetic_table_data(
+        num_cards=10, num_morphs=200, morphs_per_card=5
+    )
+    _rebuild(am_db, table_data)
+    am_db.update_seen_morphs_today_single_card(1)
+
+    copied_seen_morphs: bool = False
+
+    def answer_card_during_swap(statement: str) -> None:
+        # the seen morphs are copied into the rebuilt db right before the
+        # swap, so the card is answered after the copy is committed
+        nonlocal copied_seen_morphs
+        if statement.startswith("INSERT OR IGNORE INTO Seen_Morphs"):
+            copied_seen_morphs = True
+        elif statement == "COMMIT" and copied_seen_morphs:
+            am_db.update_seen_morphs_today_single_card(2)
+
+    card_table_data, morph_table_data, card_morph_map_table_data = table_data
+    with am_db.rebuild() as rebuild_db:
+        rebuild_db.insert_many_into_morph_table(morph_table_data)
+        rebuild_db.insert_many_into_card_table(card_table_data)
+        rebuild_db.insert_many_into_card_morph_map_table(card_morph_map_table_data)
+        rebuild_db.con.set_trace_callback(answer_card_during_swap)
+
+    assert copied_seen_morphs
+
+    def get_morphs_of_cards(card_ids: list[int]) -> set[str]:
+        return {
+            lemma + inflection
+            for card_id in card_ids
+            for lemma, inflection in am_db.get_readable_card_morphs(card_id)
+        }
+
+    assert am_db.get_all_morphs_seen_today() == get_morphs_of_cards([1, 2])
+
+    # the cards answered after the swap are added directly again
+    am_db.update_seen_morphs_today_single_card(3)
+    assert am_db.get_all_morphs_seen_today() == get_morphs_of_cards([1, 2, 3])
+
+
+def _get_index_names(am_db: AnkiMorphsDB) -> set[str]:
+    return {
+        row[0]
+        for row in am_db.con.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"
+        )
+    }
+
+
+def test_migrate_existing_db(  # pylint:disable=unused-argument
+    _fake_mw_fixture: None, tmp_path: Path
+) -> None:
+    # the dbs in the test data are from before the versioning was added
+    db_path = Path(tmp_path, "migrated.db")
+    shutil.copyfile(Path(PATH_TESTS_DATA_DBS, "card_handling_collection.db"), db_path)
+    am_db = AnkiMorphsDB(db_path=db_path)
+    card_morphs = am_db.get_readable_card_morphs(1736763230922)
+
+    assert am_db.get_schema_version() == 0
+    assert len(card_morphs) > 0
+
+    for _ in range(2):
+        am_db.migrate()
+        assert am_db.get_schema_version() == SCHEMA_VERSION
+        assert _get_index_names(am_db) == {"Card_Morph_Map_By_Morph"}
+        assert am_db.get_readable_card_morphs(1736763230922) == card_morphs
+
+
+def test_migrate_db_from_newer_version(  # pylint:disable=unused-argument
+    _fake_mw_fixture: None, tmp_path: Path
+) -> None:
+    # the add-on was downgraded, the cache is reset since the schema is unknown
+    db_path = Path(tmp_path, "newer.db")
+    shutil.copyfile(Path(PATH_TESTS_DATA_DBS, "card_handling_collection.db"), db_path)
+    am_db = AnkiMorphsDB(db_path=db_path)
+    with am_db.con:
+        am_db.con.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+
+    am_db.migrate()
+
+    assert am_db.get_schema_version() == SCHEMA_VERSION
+    assert _get_index_names(am_db) == {"Card_Morph_Map_By_Morph"}
+    assert not am_db.get_readable_card_morphs(1736763230922)
+
+
+def test_migrate_new_db(  # pylint:disable=unused-argument
+    _fake_mw_fixture: None, tmp_path: Path
+) -> None:
+    am_db = AnkiMorphsDB(db_path=Path(tmp_path, "new.db"))
+    am_db.migrate()
+
+    assert am_db.get_schema_version() == SCHEMA_VERSION
+    assert _get_index_names(am_db) == {"Card_Morph_Map_By_Morph"}
+    assert am_db.get_all_morphs_seen_today() == set()
+
+
+def test_cards_with_same_morphs(  # pylint:disable=unused-argument
+    _fake_mw_fixture: None, tmp_path: Path
+) -> None:
+    # lemma, inflection, highest inflection learning interval, card ids
+    morphs_and_cards: list[tuple[str, str, int, list[int]]] = [
+        ("don't", "don't", 5, [1, 2]),
+        ("go", "went", 0, [1, 4]),
+        ("go", "goes", 3, [3]),
+        ("l'eau", "l'eau", 0, [5]),
+        ("' OR ''='", "' OR ''='", 0, [6]),
+    ]
+    card_ids = sorted({card_id for *_, ids in morphs_and_cards for card_id in ids})
+
+    am_db = AnkiMorphsDB(db_path=Path(tmp_path, "same_morphs.db"))
+    _rebuild(
+        am_db,
+        (
+            [
+                {
+                    "card_id": card_id,
+                    "note_id": card_id,
+                    "note_type_id": 1,
+                    "card_type": 0,
+                    "tags": "",
+                }
+                for card_id in card_ids
+            ],
+            [
+                {
+                    "lemma": lemma,
+                    "inflection": inflection,
+                    "highest_lemma_learning_interval": interval,
+                    "highest_inflection_learning_interval": interval,
+                }
+                for lemma, inflection, interval, _ in morphs_and_cards
+            ],
+            [
+                {
+                    "card_id": card_id,
+                    "morph_lemma": lemma,
+                    "morph_inflection": inflection,
+                }
+                for lemma, inflection, _, ids in morphs_and_cards
+                for card_id in ids
+            ],
+        ),
+    )
+
+    assert am_db.get_ids_of_cards_with_same_morphs(CardId(1)) == {1, 2, 4}
+    assert am_db.get_ids_of_cards_with_same_morphs(CardId(1), search_unknowns=True) == {
+        1,
+        4,
+    }
+    assert am_db.get_ids_of_cards_with_same_morphs(
+        CardId(1), search_unknowns=True, search_lemma_only=True
+    ) == {1, 3, 4}
+    assert (
+        am_db.get_ids_of_cards_with_same_morphs(CardId(2), search_unknowns=True) is None
+    )
+    assert am_db.get_ids_of_cards_with_same_morphs(CardId(5)) == {5}
+    assert am_db.get_ids_of_cards_with_same_morphs(CardId(6)) == {6}
+
+
+def _get_morph_table_data(
+    morphs_data: list[tuple[str, str, int, int]],
+) -> list[dict[str, Any]]:
+    # (lemma, inflection, highest lemma interval, highest inflection interval)
+    return [
+        {
+            "lemma": lemma,
+            "inflection": inflection,
+            "highest_lemma_learning_interval": lemma_interval,
+            "highest_inflection_learning_interval": inflection_interval,
+        }
+        for lemma, inflection, lemma_interval, inflection_interval in morphs_data
+    ]
+
+
+def test_learning_intervals(  # pylint:disable=unused-argument
+    _fake_mw_fixture: None, tmp_path: Path
+) -> None:
+    am_db = AnkiMorphsDB(db_path=Path(tmp_path, "intervals.db"))
+    _rebuild(
+        am_db,
+        (
+            [],
+            _get_morph_table_data(
+                [
+                    ("go", "went", 7, 0),
+                    ("go", "goes", 7, 7),
+                    ("don't", "don't", 3, 3),
+                ]
+            ),
+            [],
+        ),
+    )
+
+    morphs: list[Morpheme] = [
+        Morpheme(lemma="go", inflection="went"),
+        Morpheme(lemma="go", inflection="goes"),
+        Morpheme(lemma="go", inflection="gone"),  # not in the db
+        Morpheme(lemma="don't", inflection="don't"),
+        Morpheme(lemma="l'eau", inflection="l'eau"),  # not in the db
+    ]
+
+    assert am_db.get_highest_inflection_learning_intervals(morphs) == {
+        ("go", "went"): 0,
+        ("go", "goes"): 7,
+        ("don't", "don't"): 3,
+    }
+    assert am_db.get_highest_lemma_learning_intervals(morphs) == {
+        "go": 7,
+        "don't": 3,
+    }
+    assert not am_db.get_highest_lemma_learning_intervals([])
+
+
+def test_morph_status_snapshot(  # pylint:disable=unused-argument
+    _fake_mw_fixture: None, tmp_path: Path
+) -> None:
+    am_db = AnkiMorphsDB(db_path=Path(tmp_path, "statuses.db"))
+    _rebuild(
+        am_db,
+        (
+            [],
+            _get_morph_table_data(
+                [
+                    ("go", "went", 7, 0),
+                    ("go", "goes", 7, 7),
+                    ("don't", "don't", 3, 3),
+                ]
+            ),
+            [],
+        ),
+    )
+    morph_status_snapshot.clear_snapshot()
+
+    am_config = mock.Mock(interval_for_known_morphs=7)
+    with mock.patch.object(
+        morph_status_snapshot, "AnkiMorphsConfig", return_value=am_config
+    ):
+        snapshot = morph_status_snapshot.get_morph_status_snapshot(am_db)
+
+        assert snapshot.get_inflection_interval("go", "went") == 0
+        assert snapshot.get_inflection_interval("go", "goes") == 7
+        assert snapshot.get_inflection_interval("go", "gone") is None
+        assert snapshot.get_lemma_interval("go") == 7
+        assert snapshot.get_lemma_interval("l'eau") is None
+
+        assert snapshot.get_inflection_status("go", "went") == STATUS_UNKNOWN
+        assert snapshot.get_inflection_status("go", "goes") == STATUS_KNOWN
+        assert snapshot.get_inflection_status("don't", "don't") == STATUS_LEARNING
+        assert snapshot.get_inflection_status("go", "gone") is None
+        assert snapshot.get_lemma_status("go") == STATUS_KNOWN
+        assert snapshot.get_lemma_status("don't") == STATUS_LEARNING
+        assert snapshot.get_lemma_status("l'eau") is None
+
+        # the snapshot is reused until it is rebuilt, even if the db
+        # changes in the meantime
+        _rebuild(
+            am_db,
+            ([], _get_morph_table_data([("go", "went", 30, 30)]), []),
+        )
+        assert morph_status_snapshot.get_morph_status_snapshot(am_db) is snapshot
+        assert snapshot.get_inflection_interval("go", "goes") == 7
+
+        # the readers keep getting the previous snapshot while the new one
+        # is being built (the config is read after the Morphs table)
+        snapshots_during_rebuild: list[MorphStatusSnapshot] = []
+
+        def _get_config_during_rebuild() -> mock.Mock:
+            snapshots_during_rebuild.append(
+                morph_status_snapshot.get_morph_status_snapshot(am_db)
+            )
+            return am_config
+
+        with mock.patch.object(
+            morph_status_snapshot,
+            "AnkiMorphsConfig",
+            side_effect=_get_config_during_rebuild,
+        ):
+            morph_status_snapshot.rebuild_snapshot(am_db)
+
+        assert snapshots_during_rebuild == [snapshot]
+        rebuilt_snapshot = morph_status_snapshot.get_morph_status_snapshot(am_db)
+
+    assert rebuilt_snapshot is not snapshot
+    assert rebuilt_snapshot.version > snapshot.version
+    assert rebuilt_snapshot.get_inflection_status("go", "went") == STATUS_KNOWN
+    assert rebuilt_snapshot.get_inflection_interval("go", "goes") is None
+
+    # the next profile builds its own snapshot
+    morph_status_snapshot.clear_snapshot()
+    with mock.patch.object(
+        morph_status_snapshot, "AnkiMorphsConfig", return_value=am_config
+    ):
+        assert morph_status_snapshot.get_morph_status_snapshot(am_db) is not (
+            rebuilt_snapshot
+        )
+
+
+def test_morph_status_snapshot_background_rebuild(  # pylint:disable=unused-argument
+    _fake_mw_fixture: None, tmp_path: Path
+) -> None:
+    db_path = Path(tmp_path, "statuses.db")
+    _rebuild(
+        AnkiMorphsDB(db_path=db_path),
+        ([], _get_morph_table_data([("go", "went", 7, 0)]), []),
+    )
+    morph_status_snapshot.clear_snapshot()
+
+    thread_connections: list[sqlite3.Connection] = []
+
+    def _get_am_db() -> AnkiMorphsDB:
+        am_db = AnkiMorphsDB(db_path=db_path)
+        thread_connections.append(am_db.con)
+        return am_db
+
+    with mock.patch.object(morph_status_snapshot, "AnkiMorphsDB", _get_am_db):
+        with mock.patch.object(
+            morph_status_snapshot,
+            "AnkiMorphsConfig",
+            return_value=mock.Mock(interval_for_known_morphs=7),
+        ):
+            morph_status_snapshot.rebuild_snapshot_in_background()
+            for thread in threading.enumerate():
+                if thread.name == "ankimorphs_morph_status_snapshot":
+                    thread.join()
+
+        snapshot = morph_status_snapshot.get_morph_status_snapshot()
+
+    assert snapshot.get_lemma_status("go") == STATUS_KNOWN
+    # the thread has exited, so its connection has to be closed
+    assert len(thread_connections) == 1
+    with pytest.raises(sqlite3.ProgrammingError):
+        thread_connections[0].execute("SELECT 1")
+
+
+def _get_query_plans(
+    am_db: AnkiMorphsDB, run_queries: Callable[[], object]
+) -> dict[str, list[str]]:
+    # the trace callback gets the statements with the parameters filled in,
+    # so the query plans of the actual queries can be checked
+    statements: list[str] = []
+    am_db.con.set_trace_callback(statements.append)
+    try:
+        run_queries()
+    finally:
+        am_db.con.set_trace_callback(None)
+
+    return {
+        statement: [
+            row[3] for row in am_db.con.execute(f"EXPLAIN QUERY PLAN {statement}")
+        ]
+        for statement in statements
+        if statement.lstrip().upper().startswith(("SELECT", "INSERT", "WITH"))
+    }
+
+
+@pytest.mark.parametrize(
+    "run_queries",
+    [
+        pytest.param(
+            lambda am_db: am_db.get_ids_of_cards_with_same_morphs(CardId(1)),
+            id="same_morphs",
+        ),
+        pytest.param(
+            lambda am_db: am_db.get_ids_of_cards_with_same_morphs(
+                CardId(1), search_unknowns=True
+            ),
+            id="same_unknown_morphs",
+        ),
+        pytest.param(
+            lambda am_db: am_db.get_ids_of_cards_with_same_morphs(
+                CardId(1), search_lemma_only=True
+            ),
+            id="same_lemmas",
+        ),
+        pytest.param(
+            lambda am_db: am_db.update_seen_morphs_today_single_card(1),
+            id="seen_morphs",
+        ),
+        pytest.param(
+            lambda am_db: am_db.get_readable_card_morphs(1),
+            id="readable_card_morphs",
+        ),
+        pytest.param(
+            lambda am_db: am_db.get_highest_inflection_learning_intervals(
+                [Morpheme(lemma="lemma1", inflection="lemma1")]
+            ),
+            id="inflection_learning_intervals",
+        ),
+        pytest.param(
+            lambda am_db: am_db.get_highest_lemma_learning_intervals(
+                [Morpheme(lemma="lemma1", inflection="lemma1")]
+            ),
+            id="lemma_learning_intervals",
+        ),
+    ],
+)
+def test_hot_queries_use_indexes(  # pylint:disable=unused-argument
+    _fake_mw_fixture: None,
+    tmp_path: Path,
+    run_queries: Callable[[AnkiMorphsDB], object],
+) -> None:
+    am_db = AnkiMorphsDB(db_path=Path(tmp_path, "indexed.db"))
+    _rebuild(
+        am_db,
+        _get_synthetic_table_data(num_cards=500, num_morphs=1000, morphs_per_card=10),
+    )
+
+    query_plans = _get_query_plans(am_db, partial(run_queries, am_db))
+    assert len(query_plans) > 0
+
+    for statement, query_plan in query_plans.items():
+        for step in query_plan:
+            # "SCAN" goes through the whole table (or a whole index),
+            # but scanning e.g. a temp table with the searched morphs is fine
+            assert not re.match(
+                r"SCAN (Card_Morph_Map|Morphs)\b", step
+            ), f"{step}\n{statement}"
+            # automatic indexes are built with a full scan for every query
+            assert "AUTOMATIC" not in step, f"{step}\n{statement}"
+
+
+@pytest.mark.parametrize(
+    "run_queries",
+    [
+        pytest.param(
+            lambda am_db: am_db.get_known_lemmas_with_count(1),
+            id="known_lemmas",
+        ),
+        pytest.param(
+            lambda am_db: am_db.get_known_lemmas_and_inflections_with_count(1),
+            id="known_inflections",
+        ),
+    ],
+)
+def test_exporter_queries_are_sorted_by_index(  # pylint:disable=unused-argument
+    _fake_mw_fixture: None,
+    tmp_path: Path,
+    run_queries: Callable[[AnkiMorphsDB], object],
+) -> None:
+    # The exporter goes through all the morphs, but the index
+    # already has them in order, so they don't have to be sorted.
+    am_db = AnkiMorphsDB(db_path=Path(tmp_path, "indexed.db"))
+    _rebuild(
+        am_db,
+        _get_synthetic_table_data(num_cards=500, num_morphs=1000, morphs_per_card=10),
+    )
+
+    query_plans = _get_query_plans(am_db, partial(run_queries, am_db))
+    assert len(query_plans) > 0
+
+    for statement, query_plan in query_plans.items():
+        for step in query_plan:
+            assert "TEMP B-TREE" not in step, f"{step}\n{statement}"
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ankimorphs import cache_registry
+from ankimorphs.cache_registry import BoundedCache, ClearOn
+from ankimorphs.morpheme import Morpheme
+
+
+def test_eviction_respects_byte_budget() -> None:
+    cache = BoundedCache(
+        name="test eviction",
+        max_bytes=30,
+        clear_on=set(),
+        get_size=lambda _: 10,
+    )
+
+    for key in range(3):
+        cache.put(key, str(key))
+
+    cache.get(0)  # makes 1 the least recently used entry
+    cache.put(3, "3")
+
+    assert cache.get(1) is None
+    assert cache.get(0) == "0"
+    assert cache.get(3) == "3"
+
+    stats = cache.get_stats()
+    assert stats.entries == 3
+    assert stats.size_in_bytes == 30
+    assert stats.evictions == 1
+    assert stats.hits == 3
+    assert stats.misses == 1
+
+
+def test_oversized_entry_is_kept() -> None:
+    cache = BoundedCache(
+        name="test oversized",
+        max_bytes=10,
+        clear_on=set(),
+        get_size=lambda _: 100,
+    )
+    cache.put("key", "value")
+    assert cache.get("key") == "value"
+
+
+def test_caches_are_cleared_on_events() -> None:
+    calls: list[str] = []
+
+    @cache_registry.bounded_cache(
+        name="test events",
+        max_bytes=1024 * 1024,
+        clear_on={ClearOn.RECALC},
+    )
+    def _double(text: str) -> str:
+        calls.append(text)
+        return text * 2
+
+    assert _double("a") == "aa"
+    assert _double("a") == "aa"
+    assert calls == ["a"]
+
+    cache_registry.clear_caches(ClearOn.SETTINGS_CHANGE)
+    assert _double("a") == "aa"
+    assert calls == ["a"]
+
+    cache_registry.clear_caches(ClearOn.RECALC)
+    assert _double("a") == "aa"
+    assert calls == ["a", "a"]
+
+
+def test_concurrent_misses_load_once() -> None:
+    calls: list[str] = []
+    loading_started = threading.Event()
+    finish_loading = threading.Event()
+
+    @cache_registry.bounded_cache(
+        name="test concurrent misses",
+        max_bytes=1024 * 1024,
+        clear_on=set(),
+    )
+    def _load_model(name: str) -> str:
+        calls.append(name)
+        loading_started.set()
+        finish_loading.wait(timeout=10)
+        return f"model {name}"
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(_load_model, "ja")
+        assert loading_started.wait(timeout=10)
+        # the second call misses while the first one is still loading
+        second = executor.submit(_load_model, "ja")
+        finish_loading.set()
+
+        assert first.result() == "model ja"
+        assert second.result() == "model ja"
+
+    assert calls == ["ja"]
+
+
+def test_approximate_size_includes_contents() -> None:
+    morphs = [Morpheme(lemma="break", inflection="broken")]
+    assert cache_registry.get_approximate_size(
+        morphs
+    ) > cache_registry.get_approximate_size([])
@@ -1,13 +1,25 @@
+import importlib
 import os
 import sys
+import time
 from collections.abc import Iterator
+from pathlib import Path
 from test.test_globals import PATH_TESTS_DATA
+from typing import Any
 from unittest import mock
 
 import pytest
 
 from ankimorphs.morpheme import Morpheme
-from ankimorphs.morphemizers import spacy_wrapper
+from ankimorphs.morphemizers import (
+    jieba_wrapper,
+    mecab_wrapper,
+    morphemizer_utils,
+    spacy_wrapper,
+)
+from ankimorphs.morphemizers.jieba_morphemizer import JiebaMorphemizer
+from ankimorphs.morphemizers.mecab_morphemizer import MecabMorphemizer
+from ankimorphs.morphemizers.morphemizer import Morphemizer
 from ankimorphs.morphemizers.morphemizer_utils import get_morphemizer_by_description
 
 
@@ -54,6 +66,171 @@ def test_mecab_morpheme_generation(  # pylint:disable=unused-argument
         assert morph in correct_morphs
 
 
+@pytest.mark.external_morphemizers
+def test_mecab_batch_throughput(  # pylint:disable=unused-argument
+    _fake_environment_fixture: None,
+) -> None:
+    morphemizer = get_morphemizer_by_description("AnkiMorphs: Japanese")
+    assert morphemizer is not None
+
+    # unique sentences to prevent cache hits
+    sentences = [f"本当に重要な任務の時しか動かない{index}" for index in range(2000)]
+
+    mecab_wrapper._morphemes_cache.clear()
+    start_time = time.perf_counter()
+    single_morphs = [mecab_wrapper.get_morphemes_mecab(text) for text in sentences]
+    single_duration = time.perf_counter() - start_time
+
+    mecab_wrapper._morphemes_cache.clear()
+    start_time = time.perf_counter()
+    batch_morphs = list(morphemizer.get_morphemes(sentences))
+    batch_duration = time.perf_counter() - start_time
+
+    print(f"mecab single: {single_duration:.3f}s, batch: {batch_duration:.3f}s")
+
+    assert len(batch_morphs) == len(single_morphs)
+    for batch, single in zip(batch_morphs, single_morphs):
+        assert [(m.lemma, m.inflection) for m in batch] == [
+            (m.lemma, m.inflection) for m in single
+        ]
+
+
+@pytest.mark.external_morphemizers
+def test_mecab_batch_with_long_expressions(  # pylint:disable=unused-argument
+    _fake_environment_fixture: None,
+) -> None:
+    morphemizer = get_morphemizer_by_description("AnkiMorphs: Japanese")
+    assert morphemizer is not None
+    assert morphemizer.init_successful()
+
+    sentence = "本当に重要な任務の時しか動かない"
+    correct_morphs: list[Morpheme] = next(morphemizer.get_morphemes([sentence]))
+    assert len(correct_morphs) == 9
+
+    # Longer than the default input buffer of mecab, which would split the line and
+    # shift the outputs of the rest of the batch. The last one is even longer
+    # than the enlarged buffer.
+    expressions = [
+        sentence + "。" * 10_000,
+        "動かない" * 100_000,
+        sentence,
+    ]
+    assert len(expressions[0].encode("utf-8")) > 8192
+
+    mecab_wrapper._morphemes_cache.clear()
+    batch_morphs = mecab_wrapper.get_morphemes_mecab_batch(expressions)
+    assert batch_morphs[0] == correct_morphs
+    assert {(morph.lemma, morph.inflection) for morph in batch_morphs[1]} == {
+        ("動く", "動か"),
+        ("ない", "ない"),
+    }
+    assert batch_morphs[2] == correct_morphs
+
+    # the next batch on the same workers is not affected either
+    mecab_wrapper._morphemes_cache.clear()
+    assert mecab_wrapper.get_morphemes_mecab_batch([sentence]) == [correct_morphs]
+
+
+@pytest.mark.external_morphemizers
+def test_mecab_dead_workers_are_restarted(  # pylint:disable=unused-argument
+    _fake_environment_fixture: None,
+) -> None:
+    morphemizer = get_morphemizer_by_description("AnkiMorphs: Japanese")
+    assert morphemizer is not None
+
+    sentences = ["本当に重要な任務の時しか動かない", "動かない"]
+    correct_morphs = list(morphemizer.get_morphemes(sentences))
+    assert len(correct_morphs[0]) == 9
+
+    for pool in [mecab_wrapper._highlighting_pool, mecab_wrapper._batch_pool]:
+        with pool.checkout() as worker:
+            worker.terminate()
+            assert not worker.is_alive()
+
+    mecab_wrapper._morphemes_cache.clear()
+    assert list(morphemizer.get_morphemes(sentences)) == correct_morphs
+    assert morphemizer.get_morphemes_for_highlighting(sentences[0]) == correct_morphs[0]
+
+
+@pytest.mark.external_morphemizers
+def test_mecab_highlighting_has_its_own_worker(  # pylint:disable=unused-argument
+    _fake_environment_fixture: None,
+) -> None:
+    morphemizer = get_morphemizer_by_description("AnkiMorphs: Japanese")
+    assert morphemizer is not None
+    mecab_wrapper._morphemes_cache.clear()
+
+    with mock.patch.object(
+        mecab_wrapper, "_interact", wraps=mecab_wrapper._interact
+    ) as interact_mock:
+        # e.g. the last chunk of a recalc, it still goes to the batch workers
+        assert (
+            len(next(morphemizer.get_morphemes(["本当に重要な任務の時しか動かない"])))
+            == 9
+        )
+        interact_mock.assert_not_called()
+
+        assert len(morphemizer.get_morphemes_for_highlighting("動かない")) == 2
+        interact_mock.assert_called_once()
+
+
+@pytest.mark.external_morphemizers
+def test_mecab_and_jieba_warm_up(  # pylint:disable=unused-argument
+    _fake_environment_fixture: None,
+) -> None:
+    mecab_wrapper.terminate_workers()
+    assert not mecab_wrapper._highlighting_pool._idle_workers
+
+    # unknown morphemizers are skipped
+    morphemizer_utils.warm_up_morphemizers(
+        {"AnkiMorphs: Japanese", "AnkiMorphs: Chinese", "not a morphemizer"}
+    )
+
+    # the first highlighted card can use the worker right away
+    assert len(mecab_wrapper._highlighting_pool._idle_workers) == 1
+    assert mecab_wrapper._highlighting_pool._idle_workers[0].is_alive()
+
+
+def test_morphemizers_that_fail_to_set_up() -> None:
+    # The morphemizers are listed as soon as their add-on is found, so the setup
+    # can still fail later, e.g. if the add-on is installed but can't be imported.
+    patches: list[Any] = [
+        mock.patch.object(mecab_wrapper, "_setup_done", False),
+        mock.patch.object(mecab_wrapper, "successful_import", False),
+        mock.patch.object(mecab_wrapper, "_mecab_encoding", None),
+        mock.patch.object(
+            mecab_wrapper,
+            "_get_mecab_addon_package",
+            return_value="ankimorphs_broken_mecab",
+        ),
+        mock.patch.object(jieba_wrapper, "_import_done", False),
+        mock.patch.object(jieba_wrapper, "successful_import", False),
+        mock.patch.object(jieba_wrapper, "posseg", None),
+        mock.patch.object(
+            jieba_wrapper,
+            "_get_jieba_addon_package",
+            return_value="ankimorphs_broken_jieba",
+        ),
+    ]
+    for patch in patches:
+        patch.start()
+
+    try:
+        morphemizers: list[Morphemizer] = [MecabMorphemizer(), JiebaMorphemizer()]
+        for morphemizer in morphemizers:
+            # the first error is swallowed by the warm-up
+            with pytest.raises(ModuleNotFoundError):
+                morphemizer.warm_up()
+
+            assert not morphemizer.init_successful()
+            # every card that is highlighted afterwards gets no morphs
+            assert not morphemizer.get_morphemes_for_highlighting("本当に")
+            assert list(morphemizer.get_morphemes(["本当に", "中文"])) == [[], []]
+    finally:
+        for patch in patches:
+            patch.stop()
+
+
 @pytest.mark.external_morphemizers
 def test_jieba_morpheme_generation(  # pylint:disable=unused-argument
     _fake_environment_fixture: None,
@@ -91,3 +268,103 @@ def test_jieba_morpheme_generation(  # pylint:disable=unused-argument
 
     for morph in extracted_morphs:
         assert morph in correct_morphs
+
+
+@pytest.mark.external_morphemizers
+def test_jieba_batch_throughput(  # pylint:disable=unused-argument
+    _fake_environment_fixture: None,
+) -> None:
+    morphemizer = get_morphemizer_by_description("AnkiMorphs: Chinese")
+    assert morphemizer is not None
+    assert morphemizer.init_successful()  # jieba is imported lazily
+
+    # unique sentences to prevent cache hits
+    sentences = [f"请您说得慢些好吗？一，二，三，跳！{index}" for index in range(5000)]
+
+    jieba_wrapper._morphemes_cache.clear()
+    start_time = time.perf_counter()
+    single_morphs = [jieba_wrapper.get_morphemes_jieba(text) for text in sentences]
+    single_duration = time.perf_counter() - start_time
+
+    jieba_wrapper._morphemes_cache.clear()
+    start_time = time.perf_counter()
+    batch_morphs = list(morphemizer.get_morphemes(sentences))
+    batch_duration = time.perf_counter() - start_time
+
+    # starting the workers includes loading the jieba dictionary,
+    # so the speedup depends on the number of cores
+    print(
+        f"jieba single: {single_duration:.3f}s, batch: {batch_duration:.3f}s, "
+        f"workers: {jieba_wrapper.NUM_WORKERS}"
+    )
+
+    assert batch_morphs == single_morphs
+
+
+@pytest.mark.external_morphemizers
+def test_jieba_dictionary_cache(  # pylint:disable=unused-argument
+    _fake_environment_fixture: None, tmp_path: Path
+) -> None:
+    jieba = importlib.import_module("ankimorphs_chinese_jieba.jieba")
+
+    dictionary_path = Path(tmp_path, "dict.txt")
+    dictionary_path.write_text(
+        "请 100 v\n您 200 r\n说得 10 v\n慢些 5 d\n好 300 a\n吗 50 y\n",
+        encoding="utf-8",
+    )
+    stale_cache_path = Path(tmp_path, "ankimorphs_jieba_0123456789abcdef.cache")
+    stale_cache_path.touch()
+
+    tokenizer = jieba.Tokenizer(dictionary=str(dictionary_path))
+    cache_path = jieba_wrapper._use_dictionary_cache(tokenizer, tmp_path)
+    assert not stale_cache_path.exists()
+
+    tokenizer.initialize()
+    assert cache_path.exists()
+
+    # the next session loads the prefix dictionary from the cache
+    cached_tokenizer = jieba.Tokenizer(dictionary=str(dictionary_path))
+    assert jieba_wrapper._use_dictionary_cache(cached_tokenizer, tmp_path) == cache_path
+    with mock.patch.object(cached_tokenizer, "gen_pfdict") as gen_pfdict_mock:
+        cached_tokenizer.initialize()
+        gen_pfdict_mock.assert_not_called()
+    assert cached_tokenizer.FREQ == tokenizer.FREQ
+
+    # a different dictionary gets a different cache
+    dictionary_path.write_text("请 100 v\n", encoding="utf-8")
+    new_tokenizer = jieba.Tokenizer(dictionary=str(dictionary_path))
+    assert jieba_wrapper._use_dictionary_cache(new_tokenizer, tmp_path) != cache_path
+    assert not cache_path.exists()
+
+
+def test_cjk_filter_throughput() -> None:
+    def _text_contains_only_cjk_ranges_reference(text: str) -> bool:
+        # the range scan that the regex replaced
+        return all(
+            any(start <= ord(char) <= end for start, end in cjk_ranges) for char in text
+        )
+
+    cjk_ranges = jieba_wrapper.cjk_ideograph_unicode_ranges
+
+    # The subtitles mix kanji, kana, digits, latin and punctuation. Every line
+    # and every character of the lines is checked, since most of the words
+    # segmented by jieba are one or two characters long.
+    lines: list[str] = []
+    for subtitle_file in sorted(Path(PATH_TESTS_DATA, "ja_subs").iterdir()):
+        lines += subtitle_file.read_text(encoding="utf-8").splitlines()
+    words: list[str] = lines + [char for line in lines for char in line]
+    words += ["〇", "", "𠀀𪛖"]  # edge cases of the ranges
+
+    start_time = time.perf_counter()
+    reference_results = [_text_contains_only_cjk_ranges_reference(w) for w in words]
+    reference_duration = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    results = [jieba_wrapper.text_contains_only_cjk_ranges(w) for w in words]
+    duration = time.perf_counter() - start_time
+
+    print(f"cjk filter range scan: {reference_duration:.3f}s, regex: {duration:.3f}s")
+
+    assert results == reference_results
+    assert any(results)
+    assert not all(results)
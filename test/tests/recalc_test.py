@@ -17,6 +17,7 @@ from test.fake_configs import (
     config_offset_lemma_enabled,
     config_suspend_morphs_known,
     config_suspend_morphs_known_or_fresh,
+    config_two_filters_with_same_morphemizer,
     config_use_interval_for_known_threshold,
     config_use_stability_for_known_threshold,
     config_wrong_field_name,
@@ -29,13 +30,15 @@ from test.fake_environment_module import (  # pylint:disable=unused-import
     FakeEnvironmentParams,
     fake_environment_fixture,
 )
+from typing import Any
+from unittest import mock
 
 import pytest
 
 from ankimorphs import ankimorphs_config
 from ankimorphs import ankimorphs_globals as am_globals
-from ankimorphs import text_preprocessing
-from ankimorphs.ankimorphs_config import RawConfigFilterKeys
+from ankimorphs.ankimorphs_config import AnkiMorphsConfig, RawConfigFilterKeys
+from ankimorphs.ankimorphs_db import AnkiMorphsDB
 from ankimorphs.exceptions import (
     AnkiFieldNotFound,
     AnkiNoteTypeNotFound,
@@ -44,7 +47,8 @@ from ankimorphs.exceptions import (
     MorphemizerNotFoundException,
     PriorityFileNotFoundException,
 )
-from ankimorphs.recalc import recalc_main
+from ankimorphs.morphemizers import morphemizer_utils
+from ankimorphs.recalc import anki_data_utils, caching, recalc_main
 
 # these have to be placed here to avoid cyclical imports
 from anki.cards import Card, CardId  # isort:skip  pylint:disable=wrong-import-order
@@ -53,6 +57,8 @@ from anki.models import (  # isort:skip pylint:disable=wrong-import-order
     NotetypeDict,
 )
 from anki.notes import Note  # isort:skip  pylint:disable=wrong-import-order
+from anki.tags import TagManager  # isort:skip  pylint:disable=wrong-import-order
+import anki.utils  # isort:skip  pylint:disable=wrong-import-order
 
 
 test_cases_with_success = [
@@ -278,8 +284,6 @@ def test_recalc(  # pylint:disable=too-many-locals
     if fake_environment_fixture is None:
         pytest.xfail()
 
-    text_preprocessing.update_translation_table()  # updates custom characters to ignore
-
     initial_collection = fake_environment_fixture.mock_mw.col
     result_collection = fake_environment_fixture.result_collection
 
@@ -507,3 +511,136 @@ def test_recalc_with_invalid_known_morphs_file(  # pylint:disable=unused-argumen
             read_enabled_config_filters=read_enabled_config_filters,
             modify_enabled_config_filters=modify_enabled_config_filters,
         )
+
+
+@pytest.mark.parametrize(
+    "fake_environment_fixture",
+    [
+        FakeEnvironmentParams(
+            initial_col="big_japanese_collection",
+            result_col="big_japanese_collection",
+            config=config_big_japanese_collection,
+        ),
+    ],
+    indirect=True,
+)
+def test_card_data_extraction_in_pages(
+    fake_environment_fixture: FakeEnvironment | None,
+) -> None:
+    if fake_environment_fixture is None:
+        pytest.xfail()
+
+    am_config = AnkiMorphsConfig()
+    config_filter = ankimorphs_config.get_read_enabled_filters()[0]
+    extractor = anki_data_utils.AnkiCardDataExtractor(am_config, config_filter)
+    assert len(extractor) > 7
+
+    with mock.patch.object(anki_data_utils, "EXTRACTION_PAGE_SIZE", 7):
+        with mock.patch.object(anki_data_utils, "NUM_EXTRACTION_WORKERS", 3):
+            extracted_card_data = list(extractor.extract())
+
+    # the pages are put back together in the same order as the rows,
+    # and every card is extracted the same way it would be on its own
+    tag_manager = TagManager(fake_environment_fixture.mock_mw.col)
+    assert len(extracted_card_data) == len(extractor.anki_db_rows)
+
+    for (card_id, card_data), anki_db_row in zip(
+        extracted_card_data, extractor.anki_db_rows
+    ):
+        assert card_id == anki_db_row[0]
+
+        expression_field = anki.utils.split_fields(anki_db_row[6])[
+            extractor.expression_field_index
+        ]
+        assert card_data.expression == anki.utils.strip_html(
+            expression_field.replace("<br>", "\n")
+        )
+
+        tags: list[str] = tag_manager.split(anki_db_row[7])
+        assert card_data.manually_known_tag == (am_config.tag_known_manually in tags)
+        assert card_data.automatically_known_tag == (
+            am_config.tag_known_automatically in tags
+        )
+
+
+def test_card_data_extraction_is_bounded() -> None:
+    # the extractor is built without a collection, only the paging is tested
+    extractor = anki_data_utils.AnkiCardDataExtractor.__new__(
+        anki_data_utils.AnkiCardDataExtractor
+    )
+    extractor.anki_db_rows = [[card_id] for card_id in range(100)]
+    extracted_pages: list[Sequence[Sequence[Any]]] = []
+
+    def _extract_page(
+        _self: anki_data_utils.AnkiCardDataExtractor,
+        anki_db_rows: Sequence[Sequence[Any]],
+    ) -> list[tuple[int, Any]]:
+        extracted_pages.append(anki_db_rows)
+        return [(row[0], row) for row in anki_db_rows]
+
+    with mock.patch.object(
+        anki_data_utils.AnkiCardDataExtractor, "_extract_page", _extract_page
+    ):
+        with mock.patch.object(anki_data_utils, "EXTRACTION_PAGE_SIZE", 5):
+            with mock.patch.object(anki_data_utils, "NUM_EXTRACTION_WORKERS", 2):
+                card_data_iterator = extractor.extract()
+                assert next(card_data_iterator)[0] == 0
+
+                # only the pages in flight are extracted ahead of the consumer,
+                # plus the one that replaced the consumed page
+                assert len(extracted_pages) <= 2 * 2 + 1
+
+                card_ids = [0] + [card_id for card_id, _ in card_data_iterator]
+
+    assert card_ids == list(range(100))
+    assert len(extracted_pages) == 100 // 5
+
+
+@pytest.mark.external_morphemizers
+@pytest.mark.parametrize(
+    "fake_environment_fixture",
+    [
+        FakeEnvironmentParams(
+            initial_col="big_japanese_collection",
+            result_col="big_japanese_collection",
+            config=config_two_filters_with_same_morphemizer,
+        ),
+    ],
+    indirect=True,
+)
+def test_filters_with_same_morphemizer_share_a_stream(
+    fake_environment_fixture: FakeEnvironment | None,
+) -> None:
+    if fake_environment_fixture is None:
+        pytest.xfail()
+
+    read_enabled_config_filters = ankimorphs_config.get_read_enabled_filters()
+    assert len(read_enabled_config_filters) == 2
+
+    morphemizer = morphemizer_utils.get_morphemizer_by_description(
+        read_enabled_config_filters[0].morphemizer_description
+    )
+    assert morphemizer is not None
+
+    def _get_card_morph_map() -> list[tuple[int, str, str]]:
+        am_db = AnkiMorphsDB()
+        card_morph_map: list[tuple[int, str, str]] = am_db.con.execute(
+            "SELECT * FROM Card_Morph_Map ORDER BY card_id, morph_lemma, morph_inflection"
+        ).fetchall()
+        return card_morph_map
+
+    caching.cache_anki_data(AnkiMorphsConfig(), read_enabled_config_filters[:1])
+    single_filter_card_morph_map = _get_card_morph_map()
+
+    with mock.patch.object(
+        morphemizer,
+        "get_processed_morphs_in_chunks",
+        wraps=morphemizer.get_processed_morphs_in_chunks,
+    ) as get_processed_morphs_in_chunks:
+        caching.cache_anki_data(AnkiMorphsConfig(), read_enabled_config_filters)
+
+    # both filters are morphemized in a single stream, and the morphs
+    # are routed back to the cards of both filters
+    assert get_processed_morphs_in_chunks.call_count == 1
+    assert len(single_filter_card_morph_map) > 0
+    assert _get_card_morph_map() == single_filter_card_morph_map
@@ -1,3 +1,4 @@
+import time
 from functools import partial
 from test.fake_configs import (
     config_disabled_skip_no_unknown_morphs,
@@ -17,8 +18,9 @@ import pytest
 from anki.consts import CardQueue
 from aqt.reviewer import Reviewer
 
-from ankimorphs import reviewing_utils
+from ankimorphs import db_connections, reviewing_utils
 from ankimorphs.ankimorphs_config import AnkiMorphsConfig
+from ankimorphs.morpheme import Morpheme
 from ankimorphs.reviewing_utils import SkippedCards
 
 
@@ -190,3 +192,50 @@ def test_morph_status_skip(  # pylint:disable=unused-argument
 
         # Press 'good'
         mock_mw.col.sched.answerCard(mock_mw.reviewer.card, ease=3)
+
+
+def _time_review_queries(repetitions: int, reconnect: bool) -> float:
+    # the queries done by the highlighting and the seen morphs
+    # every time a card is shown or answered
+    morph = Morpheme(lemma="hello", inflection="hello")
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        if reconnect:
+            db_connections.close_all_connections()
+        with FakeDB() as am_db:
+            am_db.update_seen_morphs_today_single_card(1736763230922)
+            am_db.get_highest_inflection_learning_intervals([morph])
+            am_db.get_highest_lemma_learning_intervals([morph])
+    return (time.perf_counter() - start) / repetitions
+
+
+@pytest.mark.parametrize(
+    "fake_environment_fixture",
+    [
+        FakeEnvironmentParams(
+            initial_col="card_handling_collection",
+            config=config_dont_skip_fresh_morphs,
+            am_db="card_handling_collection.db",
+        )
+    ],
+    indirect=True,
+)
+def test_review_query_latency(  # pylint:disable=unused-argument
+    fake_environment_fixture: FakeEnvironment,
+) -> None:
+    with FakeDB() as am_db:
+        am_db.create_seen_morph_table()
+
+    # all the instances on the same thread share the connection
+    assert FakeDB().con is FakeDB().con
+
+    repetitions = 200
+    reconnecting_duration = _time_review_queries(repetitions, reconnect=True)
+    persistent_duration = _time_review_queries(repetitions, reconnect=False)
+
+    print(
+        f"review queries per card: {persistent_duration * 1000:.3f}ms "
+        f"(reconnecting every time: {reconnecting_duration * 1000:.3f}ms)"
+    )
+
+    assert persistent_duration < reconnecting_duration
@@ -1,12 +1,17 @@
+import copy
 from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from unittest import mock
 
 import pytest
 
 import ankimorphs.morphemizers.morphemizer
-from ankimorphs.morpheme import Morpheme
-from ankimorphs.morphemizers import spacy_wrapper
+from ankimorphs.ankimorphs_config import AnkiMorphsConfig
+from ankimorphs.exceptions import CancelledOperationException
+from ankimorphs.morpheme import Morpheme, MorphOccurrence, get_interned_morph
+from ankimorphs.morphemizers import long_text_guard, spacy_wrapper
 from ankimorphs.morphemizers.morphemizer_utils import get_morphemizer_by_description
+from ankimorphs.morphemizers.simple_space_morphemizer import SimpleSpaceMorphemizer
 
 
 @pytest.fixture(scope="function")
@@ -73,3 +78,150 @@ def test_simple_space_splitters(
     for morph in extracted_morphs:
         # print(f"morph: {morph.inflection}")
         assert morph in correct_morphs
+
+
+def test_identical_morphs_are_interned(_fake_environment_fixture: None) -> None:
+    morphemizer = get_morphemizer_by_description("AnkiMorphs: Simple Space Splitter")
+    assert morphemizer is not None
+
+    first_sentence_morphs, second_sentence_morphs = morphemizer.get_morphemes(
+        ["the cat sat", "The dog sat"]
+    )
+
+    # identical morphs should share the same instance
+    assert first_sentence_morphs[0] is second_sentence_morphs[0]
+    assert first_sentence_morphs[2] is second_sentence_morphs[2]
+    assert first_sentence_morphs[1] is not second_sentence_morphs[1]
+
+
+def test_interned_morphs_with_intervals_are_separate() -> None:
+    morph = get_interned_morph(lemma="cat", inflection="cats")
+    known_morph = get_interned_morph(
+        lemma="cat", inflection="cats", highest_inflection_learning_interval=30
+    )
+
+    # the intervals are never set on the shared morph
+    assert known_morph is not morph
+    assert known_morph == morph
+    assert morph.highest_inflection_learning_interval is None
+    assert known_morph is get_interned_morph(
+        lemma="cat", inflection="cats", highest_inflection_learning_interval=30
+    )
+
+    # interning the same morph on many threads gives one instance
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        morphs = list(
+            executor.map(
+                lambda _: get_interned_morph(lemma="dog", inflection="dogs"),
+                range(1000),
+            )
+        )
+    assert all(other is morphs[0] for other in morphs)
+
+
+def test_interned_morphs_cannot_be_modified() -> None:
+    morph = get_interned_morph(lemma="bird", inflection="birds")
+
+    with pytest.raises(AttributeError):
+        morph.highest_inflection_learning_interval = 30
+    with pytest.raises(AttributeError):
+        del morph.part_of_speech
+    assert morph.highest_inflection_learning_interval is None
+
+    # copies of the interned morphs are the interned morphs themselves
+    assert copy.deepcopy(morph) is morph
+    assert copy.deepcopy(MorphOccurrence(morph)).morph is morph
+
+    # morphs that are not interned can still be modified
+    other_morph = Morpheme(lemma="bird", inflection="birds")
+    other_morph.highest_inflection_learning_interval = 30
+    other_morph_copy = copy.deepcopy(other_morph)
+    assert other_morph_copy is not other_morph
+    assert other_morph_copy.highest_inflection_learning_interval == 30
+
+
+def test_processed_morphs_in_chunks(_fake_environment_fixture: None) -> None:
+    morphemizer = SimpleSpaceMorphemizer()
+    am_config = mock.Mock(spec=AnkiMorphsConfig)
+    am_config.preprocess_ignore_names_morphemizer = False
+    am_config.preprocess_ignore_names_textfile = False
+
+    num_texts_read: int = 0
+
+    def _get_keys_and_texts() -> Iterator[tuple[int, str]]:
+        nonlocal num_texts_read
+        for key in range(25):
+            num_texts_read += 1
+            yield key, f"word{key} word"
+
+    progress: list[int] = []
+
+    with mock.patch.object(morphemizer, "get_chunk_size", return_value=10):
+        keys_and_morphs = morphemizer.get_processed_morphs_in_chunks(
+            am_config, _get_keys_and_texts(), on_progress=progress.append
+        )
+
+        # the texts are only read one chunk at a time
+        first_key, first_morphs = next(keys_and_morphs)
+        assert num_texts_read == 10
+        assert first_key == 0
+        assert first_morphs == [Morpheme("word0", "word0"), Morpheme("word", "word")]
+
+        remaining_keys = [key for key, _ in keys_and_morphs]
+        assert remaining_keys == list(range(1, 25))
+        assert progress == [10, 20, 25]
+
+        # cancelling stops before the next chunk
+        should_cancel = mock.Mock(side_effect=[False, True])
+        with pytest.raises(CancelledOperationException):
+            for _ in morphemizer.get_processed_morphs_in_chunks(
+                am_config, _get_keys_and_texts(), should_cancel=should_cancel
+            ):
+                pass
+        assert should_cancel.call_count == 2
+
+
+def test_long_text_guard(_fake_environment_fixture: None) -> None:
+    # sentences first, then clauses, then whitespace, then hard cuts
+    text = "aaaa bbbb, cccc. dddd eeee ffff gggg, hhhh. iiiiiiiiiiiiii"
+    assert long_text_guard.split_long_text(text, max_length=20) == [
+        "aaaa bbbb, cccc.",
+        " dddd eeee ffff ",
+        "gggg, hhhh.",
+        " iiiiiiiiiiiiii",
+    ]
+    assert long_text_guard.split_long_text("j" * 25, max_length=10) == [
+        "j" * 10,
+        "j" * 10,
+        "j" * 5,
+    ]
+
+    morphemizer = SimpleSpaceMorphemizer()
+    am_config = mock.Mock(spec=AnkiMorphsConfig)
+    am_config.preprocess_ignore_names_morphemizer = False
+    am_config.preprocess_ignore_names_textfile = False
+
+    long_sentence = " ".join(f"word{index}." for index in range(1000))
+    assert long_text_guard.is_too_long(long_sentence)
+
+    long_text_guard.reset_slowest_texts()
+    short_morphs, long_morphs = morphemizer.get_processed_morphs(
+        am_config, ["short sentence", long_sentence]
+    )
+
+    # the morphs of the pieces are merged in order
+    assert short_morphs == [
+        Morpheme("short", "short"),
+        Morpheme("sentence", "sentence"),
+    ]
+    assert long_morphs == list(morphemizer.get_morphemes([long_sentence]))[0]
+
+    report: list[str] = long_text_guard.get_slowest_texts_report()
+    assert report[0] == "Long texts split before morphemizing: 1"
+    assert f"{len(long_sentence)} characters" in report[1]
+
+    # the highlighting goes through the same steps
+    assert (
+        morphemizer.get_processed_morphs_for_highlighting(am_config, long_sentence)
+        == long_morphs
+    )
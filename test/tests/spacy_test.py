@@ -1,6 +1,11 @@
 import json
 import os
+import re
+import timeit
 from collections.abc import Iterator
+from pathlib import Path
+from test.test_globals import PATH_TESTS_DATA
+from typing import Any
 from unittest import mock
 
 import aqt
@@ -563,7 +568,7 @@ def fake_environment_fixture() -> Iterator[None]:
         ),
     ],
 )
-def test_spacy(  # pylint:disable=unused-argument
+def test_spacy(  # pylint:disable=unused-argument, too-many-locals
     fake_environment_fixture: None,
     spacy_model_name: str,
     sentence: str,
@@ -611,4 +616,147 @@ def test_spacy(  # pylint:disable=unused-argument
     #     print("")
 
     assert processed_morphs == expected_am_morphs
+
+    keyed_morphs = morphemizer.get_processed_morphs_by_key(
+        am_config, [(1, sentence.lower())]
+    )
+    assert list(keyed_morphs) == [(1, expected_am_morphs)]
+
+    progress: list[int] = []
+    chunked_morphs = morphemizer.get_processed_morphs_in_chunks(
+        am_config, iter([(1, sentence.lower())]), on_progress=progress.append
+    )
+    assert list(chunked_morphs) == [(1, expected_am_morphs)]
+    assert progress == [1]
     # assert False
+
+
+@pytest.mark.parametrize(
+    "configured_batch_size, texts, expected_batch_size",
+    [
+        (250, ["short"] * 10, 250),  # configured batch sizes are used as is
+        (0, ["a" * 50] * 10, 1000),
+        (0, ["a" * 5000] * 10, 16),  # long texts, small batches
+        (0, ["a"] * 10, 5000),  # short texts, large batches
+        (0, [], 16),
+    ],
+)
+def test_spacy_batch_size(
+    configured_batch_size: int, texts: list[str], expected_batch_size: int
+) -> None:
+    assert (
+        spacy_wrapper.get_batch_size(configured_batch_size, texts)
+        == expected_batch_size
+    )
+
+
+def test_spacy_token_extraction_throughput(  # pylint:disable=unused-argument, too-many-locals
+    fake_environment_fixture: None,
+) -> None:
+    spacy_wrapper.load_spacy_modules()
+
+    spacy_model_name = "en_core_web_sm"
+    morphemizer = SpacyMorphemizer(spacy_model_name)
+    nlp = spacy_wrapper.get_nlp(spacy_model_name)
+
+    am_config = AnkiMorphsConfig()
+    am_config.preprocess_ignore_names_morphemizer = True
+    am_config.preprocess_ignore_numbers = True
+    am_config.preprocess_ignore_names_textfile = False
+
+    text_path = Path(PATH_TESTS_DATA, "txt_files", "romeo_and_juliet.txt")
+    lines = text_path.read_text(encoding="utf-8").lower().splitlines()
+    docs: list[Any] = list(nlp.pipe(line for line in lines if line.strip()))
+
+    punctuation_and_symbols = re.compile(r"^[\W_]+$", re.UNICODE)
+    excluded_pos = morphemizer.excluded_pos | {"PROPN", "NUM"}
+
+    def _get_morphs_from_doc_reference(doc: Any) -> list[Morpheme]:
+        # the token by token loop that to_array replaced
+        return [
+            Morpheme(lemma=w.lemma_, inflection=w.text)
+            for w in doc
+            if w.pos_ not in excluded_pos and not punctuation_and_symbols.match(w.text)
+        ]
+
+    excluded_pos_ids = morphemizer._get_excluded_pos_ids(am_config, nlp)
+
+    def _get_morphs_from_docs() -> list[list[Morpheme]]:
+        return [
+            morphemizer._get_morphs_from_doc(am_config, doc, excluded_pos_ids)
+            for doc in docs
+        ]
+
+    assert _get_morphs_from_docs() == [
+        _get_morphs_from_doc_reference(doc) for doc in docs
+    ]
+
+    # the best of multiple runs is less sensitive to noise
+    reference_duration = min(
+        timeit.repeat(
+            lambda: [_get_morphs_from_doc_reference(doc) for doc in docs],
+            number=1,
+            repeat=5,
+        )
+    )
+    duration = min(timeit.repeat(_get_morphs_from_docs, number=1, repeat=5))
+
+    print(
+        f"spacy token extraction, loop: {reference_duration:.3f}s, to_array: {duration:.3f}s"
+    )
+
+    assert duration < reference_duration
+
+
+def test_spacy_lemma_only_report(  # pylint:disable=unused-argument, too-many-locals
+    fake_environment_fixture: None,
+) -> None:
+    # Compares the lemmas of the lemma only mode with the lemmas of the full
+    # pipeline on the same text, along with the time it takes to process it.
+    spacy_wrapper.load_spacy_modules()
+
+    spacy_model_name = "en_core_web_sm"
+    assert spacy_wrapper.supports_lemma_only(spacy_model_name)
+
+    nlp = spacy_wrapper.get_nlp(spacy_model_name)
+    nlp_lemma_only = spacy_wrapper.get_nlp(spacy_model_name, lemma_only=True)
+
+    text_path = Path(PATH_TESTS_DATA, "txt_files", "romeo_and_juliet.txt")
+    lines = [
+        line
+        for line in text_path.read_text(encoding="utf-8").lower().splitlines()
+        if line.strip()
+    ]
+
+    docs: list[Any] = list(nlp.pipe(lines))
+    docs_lemma_only: list[Any] = list(nlp_lemma_only.pipe(lines))
+
+    # both pipelines use the same tokenizer, so the tokens line up
+    num_tokens = 0
+    num_same_lemmas = 0
+    for doc, doc_lemma_only in zip(docs, docs_lemma_only):
+        assert len(doc) == len(doc_lemma_only)
+        for token, token_lemma_only in zip(doc, doc_lemma_only):
+            if token.is_punct or token.is_space:
+                continue
+            num_tokens += 1
+            if token.lemma_ == token_lemma_only.lemma_:
+                num_same_lemmas += 1
+
+    accuracy = num_same_lemmas / num_tokens
+
+    # the best of multiple runs is less sensitive to noise
+    duration = min(timeit.repeat(lambda: list(nlp.pipe(lines)), number=1, repeat=3))
+    duration_lemma_only = min(
+        timeit.repeat(lambda: list(nlp_lemma_only.pipe(lines)), number=1, repeat=3)
+    )
+
+    print(
+        f"spacy {spacy_model_name}, full: {duration:.3f}s, "
+        f"lemma only: {duration_lemma_only:.3f}s "
+        f"({duration / duration_lemma_only:.1f}x faster), "
+        f"same lemmas: {accuracy:.1%} of {num_tokens} tokens"
+    )
+
+    assert duration_lemma_only < duration
+    assert accuracy > 0.7
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import pytest
+from anki.cards import CardId
+
+from ankimorphs.recalc import stable_due
+from ankimorphs.recalc.card_score import _MAX_SCORE
+
+
+def _to_card_dues(dues: list[int]) -> dict[CardId, int]:
+    return {CardId(index + 1): due for index, due in enumerate(dues)}
+
+
+@pytest.mark.parametrize(
+    "original_dues, target_dues, expected_dues",
+    [
+        # same relative order, nothing should change
+        ([10, 20, 30], [100, 200, 300], [10, 20, 30]),
+        # the last card should be first
+        ([10, 20, 30], [200, 300, 100], [10, 20, 9]),
+        # the last card should be in the middle
+        ([10, 20, 21], [100, 300, 200], [10, 20, 19]),
+        # no room to slot in the cards, so the scores are used instead
+        ([1, 2, 3], [200, 300, 100], [200, 300, 100]),
+        # cards that should be moved to the end get the max due
+        ([10, 20, 30], [100, _MAX_SCORE, 300], [10, _MAX_SCORE, 30]),
+        # cards that are no longer at the end get slotted in
+        ([10, _MAX_SCORE, 30], [100, 200, 300], [10, 29, 30]),
+        # cards with the same score keep their order
+        ([5, 5, 6], [100, 100, 100], [5, 5, 6]),
+    ],
+)
+def test_stable_dues(
+    original_dues: list[int], target_dues: list[int], expected_dues: list[int]
+) -> None:
+    stable_dues = stable_due.get_stable_dues(
+        target_dues=_to_card_dues(target_dues),
+        original_dues=_to_card_dues(original_dues),
+    )
+    assert stable_dues == _to_card_dues(expected_dues)
+
+
+def test_stable_dues_preserve_target_order() -> None:
+    # both are permutations of 0-999
+    original_dues: list[int] = [(index * 7919) % 1000 for index in range(1000)]
+    target_dues: list[int] = [(index * 104729) % 1000 for index in range(1000)]
+
+    stable_dues = stable_due.get_stable_dues(
+        target_dues=_to_card_dues(target_dues),
+        original_dues=_to_card_dues(original_dues),
+    )
+    target_order = sorted(stable_dues, key=lambda card_id: target_dues[card_id - 1])
+    stable_order = sorted(stable_dues, key=lambda card_id: stable_dues[card_id])
+
+    assert target_order == stable_order
@@ -0,0 +1,118 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+from test.test_globals import PATH_FAKE_MORPHEMIZERS
+
+import pytest
+
+# Runs in a fresh interpreter, otherwise the modules imported
+# by the other tests would make the measurements meaningless.
+_STARTUP_SCRIPT = """
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+import aqt
+
+# The profile_did_open hooks that don't need the Qt main window only use
+# the profile folder and the add-on config, so a mock main window is enough.
+with open(Path("ankimorphs", "config.json"), encoding="utf-8") as file:
+    default_config = json.load(file)
+mock_mw = mock.Mock()
+mock_mw.pm.profileFolder.return_value = sys.argv[2]
+mock_mw.addonManager.addonConfigDefaults.return_value = default_config
+mock_mw.addonManager.getConfig.return_value = default_config
+aqt.mw = mock_mw
+
+start = time.perf_counter()
+import ankimorphs
+import_duration = time.perf_counter() - start
+
+from ankimorphs.morphemizers import (
+    jieba_wrapper,
+    mecab_wrapper,
+    morphemizer_utils,
+    spacy_wrapper,
+)
+
+sys.path.append(sys.argv[1])
+spacy_wrapper.testing_environment = True
+
+start = time.perf_counter()
+descriptions = [
+    morphemizer.get_description()
+    for morphemizer in morphemizer_utils.get_all_morphemizers()
+]
+discovery_duration = time.perf_counter() - start
+
+spacy_imported = "spacy" in sys.modules
+mecab_set_up = mecab_wrapper.successful_import
+jieba_imported = jieba_wrapper.successful_import
+
+start = time.perf_counter()
+ankimorphs.load_am_profile_configs()
+ankimorphs.init_db()
+ankimorphs.create_am_directories_and_files()
+ankimorphs.start_morphemizer_warm_up()
+profile_open_duration = time.perf_counter() - start
+
+# the warm-up runs in the background, so it's not part of the profile open,
+# but it has to finish before the interpreter exits
+for thread in threading.enumerate():
+    if thread.name == "ankimorphs_warm_up":
+        thread.join()
+
+print(
+    json.dumps(
+        {
+            "import_duration": import_duration,
+            "discovery_duration": discovery_duration,
+            "profile_open_duration": profile_open_duration,
+            "descriptions": descriptions,
+            "spacy_imported": spacy_imported,
+            "mecab_set_up": mecab_set_up,
+            "jieba_imported": jieba_imported,
+        }
+    )
+)
+"""
+
+
+@pytest.mark.external_morphemizers
+def test_morphemizer_discovery_is_lazy(tmp_path: Path) -> None:
+    # Listing the morphemizers (e.g. when the settings are opened, or the first
+    # card is highlighted) should not import spaCy or start any backends. The
+    # profile open is measured with the hooks that don't need the Qt main window
+    # (loading the settings, migrating the db, and starting the warm-up).
+    repo_root = Path(__file__).parents[2]
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            _STARTUP_SCRIPT,
+            str(PATH_FAKE_MORPHEMIZERS),
+            str(tmp_path),
+        ],
+        cwd=repo_root,
+        capture_output=True,
+        check=True,
+    )
+    measurements = json.loads(result.stdout.decode("utf-8").splitlines()[-1])
+
+    print(
+        f"add-on import: {measurements['import_duration']:.3f}s, "
+        f"morphemizer discovery: {measurements['discovery_duration']:.3f}s, "
+        f"profile open: {measurements['profile_open_duration']:.3f}s"
+    )
+
+    assert Path(tmp_path, "ankimorphs.db").is_file()
+
+    assert "AnkiMorphs: Japanese" in measurements["descriptions"]
+    assert "AnkiMorphs: Chinese" in measurements["descriptions"]
+    assert not measurements["spacy_imported"]
+    assert not measurements["mecab_set_up"]
+    assert not measurements["jieba_imported"]
@@ -874,10 +874,6 @@ def test_highlighting(  # pylint:disable=unused-argument
     ruby_types: list[type[Ruby]],
 ) -> None:
 
-    # needs to be cleared between runs since the learning intervals are
-    # manually created and therefore inconsistent across tests
-    Morpheme.get_learning_status.cache_clear()
-
     am_config = AnkiMorphsConfig()
 
     # for text without rubies it's preferable to cycle through all the
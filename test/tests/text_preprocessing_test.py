@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import re
+import timeit
 from test.fake_configs import config_ignoring_custom_characters
 from test.fake_environment_module import (  # pylint:disable=unused-import
     FakeEnvironment,
     FakeEnvironmentParams,
     fake_environment_fixture,
 )
+from unittest import mock
 
 import pytest
 
@@ -111,6 +114,57 @@ def test_preprocess_custom_characters(  # pylint:disable=unused-argument
     correct_output: str,
 ) -> None:
     am_config = AnkiMorphsConfig()
-    text_preprocessing.update_translation_table()
     processed_text: str = text_preprocessing.get_processed_text(am_config, input_text)
     assert processed_text == correct_output
+
+
+def _get_processed_text_sequentially(text: str, characters_to_ignore: str) -> str:
+    # the way the preprocessing used to be done, one setting at a time
+    text = re.sub(r"\[[^]]*]", "", text)
+    text = re.sub(r"（[^）]*）", "", text)
+    text = re.sub(r"\([^)]*\)", "", text)
+    text = re.sub(r"\d", "", text)
+    return text.translate(str.maketrans("", "", characters_to_ignore))
+
+
+def test_text_preprocessor_benchmark() -> None:
+    am_config = mock.Mock(
+        spec=AnkiMorphsConfig,
+        preprocess_ignore_bracket_contents=True,
+        preprocess_ignore_round_bracket_contents=True,
+        preprocess_ignore_slim_round_bracket_contents=True,
+        preprocess_ignore_numbers=True,
+        preprocess_ignore_custom_characters=True,
+        preprocess_custom_characters_to_ignore=",.?",
+    )
+    texts: list[str] = [
+        "[hello] 私は(わたし)学生です。2024年（令和６年）に, come here?",
+        "This is a plain sentence with 3 numbers: 1, 2 and ٣.",
+        "no brackets or numbers at all",
+        "(a[b)c] （d[e）f]",  # interleaved brackets
+    ]
+
+    text_preprocessor = text_preprocessing.get_text_preprocessor(am_config)
+    assert text_preprocessing.get_text_preprocessor(am_config) is text_preprocessor
+
+    for text in texts:
+        assert text_preprocessor.process(text) == _get_processed_text_sequentially(
+            text, ",.?"
+        )
+    assert text_preprocessor.process("(a[b)c]") == "(a"
+
+    num_calls = 10_000
+    sequential_duration: float = timeit.timeit(
+        lambda: [_get_processed_text_sequentially(text, ",.?") for text in texts],
+        number=num_calls,
+    )
+    compiled_duration: float = timeit.timeit(
+        lambda: [text_preprocessor.process(text) for text in texts],
+        number=num_calls,
+    )
+
+    num_texts = num_calls * len(texts)
+    print(
+        f"sequential: {sequential_duration / num_texts * 1e6:.2f} µs/call, "
+        f"compiled: {compiled_duration / num_texts * 1e6:.2f} µs/call"
+    )